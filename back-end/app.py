@@ -12,6 +12,13 @@ from models.cars import CarModel
 from models.car_maintenances import CarMaintenanceModel
 from models.drivers import DriverModel
 from models.transactions import TransactionModel
+from models.image_deletions import ImageDeletionModel
+from models.overdue_rentals import OverdueRentalModel
+from models.deletion_log import DeletionLogModel
+from models.outbox_events import OutboxEventModel
+from models.transactions_archive import TransactionArchiveModel
+from models.calendar import CalendarModel
+from models.import_reports import ImportReportModel
 
 from sqlalchemy.orm import sessionmaker
 from connector.mysql_connector import connection
@@ -22,6 +29,26 @@ from controllers.driver_controller import drivers_blueprint
 from controllers.cars_controller import cars_blueprint
 from controllers.car_maintenances_controller import car_maintenances_blueprint
 from controllers.transactions_controller import transactions_blueprint
+from controllers.cache_controller import cache_blueprint
+from controllers.search_controller import search_blueprint
+from controllers.media_controller import media_blueprint
+from controllers.quotes_controller import quotes_blueprint
+from controllers.sync_controller import sync_blueprint
+from controllers.events_controller import events_blueprint
+from controllers.analytics_controller import analytics_blueprint
+from commands.image_commands import images_cli
+from commands.car_commands import cars_cli
+from commands.transaction_commands import transactions_cli
+from commands.outbox_commands import outbox_cli
+
+from utils.scheduler import scheduler
+from utils.image_cleanup import image_cleanup
+from utils.booking_holds import hold_sweeper
+from utils.overdue import overdue_projector
+from utils.sync import prune_deletion_log
+from utils.outbox import outbox_relay
+from utils.archive import transaction_archiver
+from utils.car_import import prune_import_reports
 
 from flask_cors import CORS
 
@@ -38,7 +65,8 @@ def create_app():
         supports_credentials=True,
         methods=["*"],
         resources={r"/*": {"origins": "*"}},
-        allow_headers=["Content-Type", "Authorization", "XCSRF-Token"],
+        allow_headers=["Content-Type", "Authorization", "XCSRF-Token", "Idempotency-Key", "Last-Event-ID"],
+        expose_headers=["Idempotency-Key", "Idempotent-Replayed"],
     )
 
     @jwt.token_in_blocklist_loader
@@ -51,6 +79,8 @@ def create_app():
 
     init_login_manager(app)
     register_blueprints(app)
+    register_commands(app)
+    init_background_jobs(app)
 
     return app
 
@@ -62,6 +92,37 @@ def register_blueprints(app):
     app.register_blueprint(cars_blueprint)
     app.register_blueprint(car_maintenances_blueprint)
     app.register_blueprint(transactions_blueprint)
+    app.register_blueprint(cache_blueprint)
+    app.register_blueprint(search_blueprint)
+    app.register_blueprint(media_blueprint)
+    app.register_blueprint(quotes_blueprint)
+    app.register_blueprint(sync_blueprint)
+    app.register_blueprint(events_blueprint)
+    app.register_blueprint(analytics_blueprint)
+
+
+def register_commands(app):
+    app.cli.add_command(images_cli)
+    app.cli.add_command(cars_cli)
+    app.cli.add_command(transactions_cli)
+    app.cli.add_command(outbox_cli)
+
+
+def init_background_jobs(app):
+    scheduler.add_job("image-cleanup", Config.IMAGE_CLEANUP_INTERVAL, image_cleanup.drain)
+    scheduler.add_job("image-reconcile", Config.IMAGE_RECONCILE_INTERVAL, image_cleanup.reconcile)
+    scheduler.add_job("booking-hold-sweep", Config.BOOKING_HOLD_SWEEP_INTERVAL, hold_sweeper.sweep)
+    scheduler.add_job("overdue-refresh", Config.OVERDUE_REFRESH_INTERVAL, overdue_projector.refresh)
+    scheduler.add_job("deletion-log-prune", 24 * 60 * 60, prune_deletion_log)
+    scheduler.add_job("outbox-relay", Config.OUTBOX_RELAY_INTERVAL, outbox_relay.drain)
+    scheduler.add_job("outbox-prune", 24 * 60 * 60, outbox_relay.prune)
+    scheduler.add_job("transactions-archive", Config.ARCHIVE_INTERVAL, transaction_archiver.run)
+    scheduler.add_job("import-report-prune", Config.IMPORT_REPORT_TTL, prune_import_reports)
+
+    # Started by the first request, so CLI commands (migrations, ...) and the reloader's
+    # watcher process never run jobs
+    if Config.BACKGROUND_JOBS:
+        app.before_request(scheduler.start)
 
 
 def init_login_manager(app):
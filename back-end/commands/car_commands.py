@@ -0,0 +1,41 @@
+import click
+from flask.cli import AppGroup
+from sqlalchemy.orm import sessionmaker
+
+from config.config import Config
+from connector.mysql_connector import engine
+from utils.car_import import CarImporter, ImportFormatError, read_rows, error_report, refresh_imported_cars
+
+cars_cli = AppGroup("cars", help="Manage the fleet.")
+
+
+@cars_cli.command("import")
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--dry-run", is_flag=True, help="Only validate the file, don't insert anything.")
+@click.option("--report", type=click.Path(dir_okay=False, writable=True), help="Write the rejected rows to this CSV.")
+@click.option("--chunk-size", type=int, default=Config.IMPORT_CHUNK_SIZE, show_default=True)
+def import_cars(path, dry_run, report, chunk_size):
+    """Import cars from a .csv or .xlsx file."""
+    Session = sessionmaker(bind=engine)
+    s = Session()
+    try:
+        with open(path, "rb") as file:
+            result = CarImporter(s, chunk_size=chunk_size, dry_run=dry_run).run(read_rows(file, path))
+    except ImportFormatError as e:
+        raise click.ClickException(str(e))
+    finally:
+        s.close()
+
+    if result["car_ids"]:
+        refresh_imported_cars(result["car_ids"])
+
+    if report and result["errors"]:
+        with open(report, "wb") as file:
+            file.write(error_report(result["errors"]))
+
+    click.echo(
+        f"{result['total']} row(s), {result['imported']} {'valid' if dry_run else 'imported'}, "
+        f"{result['failed']} rejected"
+    )
+    for error in result["errors"][:20]:
+        click.echo(f"  row {error['row']}: {error['errors']}")
@@ -0,0 +1,30 @@
+import click
+from flask.cli import AppGroup
+
+from utils.image_cleanup import image_cleanup
+
+images_cli = AppGroup("images", help="Maintain the stored images.")
+
+
+@images_cli.command("drain")
+def drain_image_deletions():
+    """Delete the queued images that are due."""
+    result = image_cleanup.drain()
+    click.echo(f"Deleted {result['deleted']}, still referenced {result['still_referenced']}, failed {result['failed']}")
+
+
+@images_cli.command("reconcile")
+@click.option("--dry-run", is_flag=True, help="Only list the orphaned images, don't queue them.")
+def reconcile_images(dry_run):
+    """Queue the stored images that no car, car image or payment proof references."""
+    result = image_cleanup.reconcile(dry_run=dry_run)
+    for url in result["urls"]:
+        click.echo(url)
+    click.echo(f"Scanned {result['scanned']} images, {result['orphans']} orphaned")
+
+
+@images_cli.command("status")
+def image_deletion_status():
+    """Show the size of the deletion queue."""
+    result = image_cleanup.stats()
+    click.echo(f"Queued {result['queued']}, given up {result['dead']}")
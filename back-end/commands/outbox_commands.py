@@ -0,0 +1,20 @@
+import click
+from flask.cli import AppGroup
+
+from utils.outbox import outbox_relay
+
+outbox_cli = AppGroup("outbox", help="Relay & maintain the outbox of state changes.")
+
+
+@outbox_cli.command("relay")
+def relay_outbox():
+    """Publish the unpublished outbox events to the configured sinks."""
+    published = outbox_relay.drain()
+    click.echo(f"Published {published} events")
+
+
+@outbox_cli.command("prune")
+def prune_outbox():
+    """Drop the published events older than OUTBOX_RETENTION_DAYS."""
+    pruned = outbox_relay.prune()
+    click.echo(f"Pruned {pruned} events")
@@ -0,0 +1,50 @@
+import click
+from flask.cli import AppGroup
+
+from config.config import Config
+from connector.mysql_connector import engine
+from utils.archive import TransactionArchiver, archive_cutoff
+from utils.booking_holds import hold_sweeper
+from utils.overdue import overdue_projector
+
+transactions_cli = AppGroup("transactions", help="Maintain the rental transactions.")
+
+
+@transactions_cli.command("expire-holds")
+def expire_booking_holds():
+    """Cancel the unpaid bookings whose hold expired and free their cars."""
+    expired = hold_sweeper.sweep()
+    click.echo(f"Expired {expired} bookings")
+
+
+@transactions_cli.command("refresh-overdue")
+def refresh_overdue_rentals():
+    """Rebuild the overdue rentals list & their running late fees."""
+    result = overdue_projector.refresh()
+    click.echo(f"{result['overdue']} overdue rentals, {result['accrued_late_fees']:.2f} in late fees")
+
+
+@transactions_cli.command("archive")
+@click.option(
+    "--months",
+    type=int,
+    default=Config.ARCHIVE_AFTER_MONTHS,
+    show_default=True,
+    help="Archive the rentals that ended before the month this many months ago.",
+)
+@click.option("--batch-size", type=int, default=Config.ARCHIVE_BATCH_SIZE, show_default=True)
+@click.option("--max-batches", type=int, default=None, help="Stop after this many batches, run again to resume.")
+@click.option("--dry-run", is_flag=True, help="Only count the rentals to archive, don't move anything.")
+def archive_transactions(months, batch_size, max_batches, dry_run):
+    """Move the completed & canceled rentals out of the transactions table."""
+    archiver = TransactionArchiver(engine, batch_size=batch_size)
+    cutoff = archive_cutoff(months)
+    if dry_run:
+        click.echo(f"{archiver.eligible(cutoff)} rentals ended before {cutoff} and can be archived")
+        return
+
+    archived = archiver.archive(
+        months, max_batches=max_batches, on_batch=lambda total: click.echo(f"  {total} archived")
+    )
+    remaining = archiver.eligible(cutoff)
+    click.echo(f"Archived {archived} rentals that ended before {cutoff}, {remaining} left")
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from decimal import Decimal
 import os
 from dotenv import load_dotenv
 
@@ -10,3 +11,99 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = os.getenv("SECRET_KEY", "supersecretkey")
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+
+    # Response cache, set CACHE_REDIS_URL to share the cache between workers
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 60))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", 64 * 1024 * 1024))
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+
+    # Seconds before the in-process search index is rebuilt from the database
+    SEARCH_INDEX_MAX_AGE = int(os.getenv("SEARCH_INDEX_MAX_AGE", 300))
+
+    # Parallel uploads to the image storage, the timeout applies to each file
+    UPLOAD_MAX_WORKERS = int(os.getenv("UPLOAD_MAX_WORKERS", 4))
+    UPLOAD_TIMEOUT = int(os.getenv("UPLOAD_TIMEOUT", 30))
+
+    # Uploaded images are resized & recompressed in a process pool before storage
+    IMAGE_PROCESS_WORKERS = int(os.getenv("IMAGE_PROCESS_WORKERS", 2))
+    IMAGE_FORMAT = os.getenv("IMAGE_FORMAT", "WEBP")
+    IMAGE_QUALITY = int(os.getenv("IMAGE_QUALITY", 80))
+
+    # Image storage backend, "cloudinary" or "local" (content addressed files served under /media)
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "cloudinary")
+    MEDIA_ROOT = os.getenv("MEDIA_ROOT") or os.path.join(os.path.dirname(os.path.dirname(__file__)), "media")
+    MEDIA_URL = os.getenv("MEDIA_URL", "http://localhost:5000/media")
+
+    # Periodic background jobs (image cleanup, ...), disable when a separate process runs them
+    BACKGROUND_JOBS = os.getenv("BACKGROUND_JOBS", "true").lower() == "true"
+
+    # Queued image deletions are drained in batches, failures are retried with exponential backoff
+    IMAGE_CLEANUP_INTERVAL = int(os.getenv("IMAGE_CLEANUP_INTERVAL", 60))
+    IMAGE_CLEANUP_BATCH_SIZE = int(os.getenv("IMAGE_CLEANUP_BATCH_SIZE", 100))
+    IMAGE_CLEANUP_MAX_ATTEMPTS = int(os.getenv("IMAGE_CLEANUP_MAX_ATTEMPTS", 8))
+    # The reconciler only treats blobs older than the grace period as orphans
+    IMAGE_RECONCILE_INTERVAL = int(os.getenv("IMAGE_RECONCILE_INTERVAL", 24 * 60 * 60))
+    IMAGE_RECONCILE_GRACE = int(os.getenv("IMAGE_RECONCILE_GRACE", 60 * 60))
+
+    # Fleet imports insert this many rows per statement & commit, error reports are kept for download this long
+    IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 500))
+    IMPORT_REPORT_TTL = int(os.getenv("IMPORT_REPORT_TTL", 60 * 60))
+
+    # Rental pricing, rates are per day in rupiah. Seasons are a JSON list of
+    # {"start": "MM-DD", "end": "MM-DD", "multiplier": 1.25}, duration discounts
+    # a JSON object of {"minimum days": rate} e.g. {"7": 0.05, "30": 0.15}
+    PRICING_DRIVER_DAILY_RATE = Decimal(os.getenv("PRICING_DRIVER_DAILY_RATE", "100000"))
+    PRICING_LATE_FEE_DAILY_RATE = Decimal(os.getenv("PRICING_LATE_FEE_DAILY_RATE", "200000"))
+    PRICING_WEEKEND_MULTIPLIER = Decimal(os.getenv("PRICING_WEEKEND_MULTIPLIER", "1.0"))
+    PRICING_SEASONS = os.getenv("PRICING_SEASONS", "[]")
+    PRICING_DURATION_DISCOUNTS = os.getenv("PRICING_DURATION_DISCOUNTS", "{}")
+    # Most cars a single GET /quotes may price, and most days it may price them for
+    QUOTE_MAX_CARS = int(os.getenv("QUOTE_MAX_CARS", 100))
+    QUOTE_MAX_DAYS = int(os.getenv("QUOTE_MAX_DAYS", 366))
+
+    # Unpaid bookings hold their car & driver this many minutes, expired holds are swept in batches
+    BOOKING_HOLD_MINUTES = int(os.getenv("BOOKING_HOLD_MINUTES", 60))
+    BOOKING_HOLD_SWEEP_INTERVAL = int(os.getenv("BOOKING_HOLD_SWEEP_INTERVAL", 60))
+    BOOKING_HOLD_SWEEP_BATCH_SIZE = int(os.getenv("BOOKING_HOLD_SWEEP_BATCH_SIZE", 500))
+
+    # Seconds between rebuilds of the overdue rentals projection
+    OVERDUE_REFRESH_INTERVAL = int(os.getenv("OVERDUE_REFRESH_INTERVAL", 300))
+
+    # Responses of requests sent with an Idempotency-Key are kept this long for retries,
+    # the lock stops other workers running the same request meanwhile
+    IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", 24 * 60 * 60))
+    IDEMPOTENCY_LOCK_TTL = int(os.getenv("IDEMPOTENCY_LOCK_TTL", 120))
+    IDEMPOTENCY_MAX_BYTES = int(os.getenv("IDEMPOTENCY_MAX_BYTES", 16 * 1024 * 1024))
+
+    # Delta sync leaves the last seconds of writes for the next call, so late commits aren't skipped,
+    # tombstones are kept this many days, older cursors must sync from scratch
+    SYNC_SAFETY_LAG = int(os.getenv("SYNC_SAFETY_LAG", 5))
+    SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", 30))
+
+    # Event streams: seconds between keep-alives, messages kept for Last-Event-ID resumes,
+    # messages a slow stream may lag behind before it is closed, most streams open per worker
+    EVENTS_HEARTBEAT_SECONDS = int(os.getenv("EVENTS_HEARTBEAT_SECONDS", 15))
+    EVENTS_HISTORY_SIZE = int(os.getenv("EVENTS_HISTORY_SIZE", 1000))
+    EVENTS_QUEUE_SIZE = int(os.getenv("EVENTS_QUEUE_SIZE", 100))
+    EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", 5000))
+
+    # The outbox relay publishes to the comma separated sinks: log (JSON lines file), bus (handlers
+    # in this process), queue (a local queue standing in for a broker). Published events are kept
+    # this many days
+    OUTBOX_SINKS = os.getenv("OUTBOX_SINKS", "bus")
+    OUTBOX_LOG_PATH = os.getenv("OUTBOX_LOG_PATH", "outbox.jsonl")
+    OUTBOX_QUEUE_SIZE = int(os.getenv("OUTBOX_QUEUE_SIZE", 10000))
+    OUTBOX_RELAY_INTERVAL = int(os.getenv("OUTBOX_RELAY_INTERVAL", 5))
+    OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", 500))
+    OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", 7))
+
+    # Completed & canceled rentals that ended more than this many months ago are moved to
+    # transactions_archive, in batches, by a daily job & flask transactions archive. 0 keeps them all
+    ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", 12))
+    ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", 1000))
+    ARCHIVE_INTERVAL = int(os.getenv("ARCHIVE_INTERVAL", 24 * 60 * 60))
+
+    # Fleet utilization results are cached per range this many seconds, rentals settling & maintenance
+    # changes invalidate them sooner. A range may span at most ANALYTICS_MAX_DAYS days
+    ANALYTICS_CACHE_TTL = int(os.getenv("ANALYTICS_CACHE_TTL", 600))
+    ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", 731))
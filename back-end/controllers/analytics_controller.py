@@ -0,0 +1,75 @@
+from datetime import datetime
+from flask import Blueprint, Response, request
+from flask_cors import cross_origin
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import sessionmaker
+from config.config import Config
+from connector.mysql_connector import connection
+from models.calendar import CALENDAR_START, CALENDAR_END
+from models.users import UserModel
+from utils.analytics import cached_utilization, utilization_csv
+from utils.handle_response import ResponseHandler
+
+analytics_blueprint = Blueprint("analytics_blueprint", __name__)
+
+
+@analytics_blueprint.get("/analytics/utilization")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Rented & available days, revenue and idle streaks per car & category, ?format=csv streams the cars
+def show_utilization():
+    Session = sessionmaker(bind=connection)
+    s = Session()
+
+    try:
+        user_id = get_jwt_identity()
+        current_user = s.query(UserModel).filter_by(id=user_id).first()
+        if not current_user:
+            return ResponseHandler.error(message="User not found", status=404)
+
+        # Check if the current user's role is "admin"
+        if current_user.role_id != 1:
+            return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
+
+        try:
+            start_date = datetime.strptime(request.args.get("from", ""), "%Y-%m-%d").date()
+            end_date = datetime.strptime(request.args.get("to", ""), "%Y-%m-%d").date()
+        except ValueError:
+            return ResponseHandler.error(message="from & to must be dates formatted as YYYY-MM-DD", status=400)
+
+        if start_date > end_date:
+            return ResponseHandler.error(message="from must be on or before to", status=400)
+        if start_date < CALENDAR_START or end_date > CALENDAR_END:
+            return ResponseHandler.error(
+                message=f"The range must be between {CALENDAR_START.isoformat()} and {CALENDAR_END.isoformat()}",
+                status=400,
+            )
+        if (end_date - start_date).days + 1 > Config.ANALYTICS_MAX_DAYS:
+            return ResponseHandler.error(
+                message=f"The range can't be longer than {Config.ANALYTICS_MAX_DAYS} days", status=400
+            )
+
+        output_format = request.args.get("format", default="json", type=str)
+        if output_format not in ("json", "csv"):
+            return ResponseHandler.error(message="format must be json or csv", status=400)
+
+        result = cached_utilization(s, start_date, end_date)
+
+        if output_format == "csv":
+            response = Response(utilization_csv(result), mimetype="text/csv")
+            response.headers["Content-Disposition"] = (
+                f"attachment; filename=utilization_{start_date.isoformat()}_{end_date.isoformat()}.csv"
+            )
+            return response
+
+        return ResponseHandler.success(data=result, status=200)
+
+    except Exception as e:
+        return ResponseHandler.error(
+            message="An error occured while computing the fleet utilization",
+            data=str(e),
+            status=500,
+        )
+
+    finally:
+        s.close()
@@ -14,6 +14,7 @@ from flask_login import logout_user, login_user, current_user
 from cerberus import Validator
 from schemas.auth_schema import login_schema, register_schema, update_profile_schema
 from utils.handle_response import ResponseHandler
+from utils.outbox import record
 
 auth_blueprint = Blueprint("auth_blueprint", __name__)
 revoked_tokens = set()
@@ -54,6 +55,13 @@ def register():
         new_user.set_password(password)
 
         s.add(new_user)
+        record(
+            s,
+            "user",
+            new_user,
+            "user.registered",
+            {"role_id": 2, "email": email, "name": name, "address": address, "phone_number": phone_number},
+        )
         s.commit()
 
         return ResponseHandler.success(data=new_user.to_dictionaries(), status=201)
@@ -94,7 +102,7 @@ def login():
             return ResponseHandler.error(message="Invalid password!", status=403)
 
         login_user(user)
-        access_token = create_access_token(identity=str(user.id))
+        access_token = create_access_token(identity=str(user.id), additional_claims={"role_id": user.role_id})
 
         return ResponseHandler.success(
             data={"message": "Login success!", "access_token": access_token, "user": user.to_dictionaries()},
@@ -201,6 +209,12 @@ def update_profile():
         if "address" in data:
             user.address = data["address"]
 
+        # The password itself never leaves the users table
+        changes = {field: data[field] for field in ["email", "phone_number", "name", "address"] if field in data}
+        if "password" in data:
+            changes["password_changed"] = True
+        if changes:
+            record(s, "user", user, "user.updated", changes)
         s.commit()
 
         return ResponseHandler.success(data=user.to_dictionaries(), status=200)
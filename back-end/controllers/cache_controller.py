@@ -0,0 +1,33 @@
+from flask import Blueprint
+from flask_cors import cross_origin
+from models.users import UserModel
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from utils.handle_response import ResponseHandler
+from utils.cache import cache
+
+cache_blueprint = Blueprint("cache_blueprint", __name__)
+
+
+@cache_blueprint.get("/cache/stats")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Only admin can see the cache hit/miss metrics
+def show_cache_stats():
+    user_id = get_jwt_identity()
+    try:
+        current_user = UserModel.query.filter_by(id=user_id).first()
+        if not current_user:
+            return ResponseHandler.error(message="User not found", status=404)
+
+        # Check if the current user's role is "admin"
+        if current_user.role_id != 1:
+            return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
+
+        return ResponseHandler.success(data=cache.stats(), status=200)
+
+    except Exception as e:
+        return ResponseHandler.error(
+            message="An error occured while showing cache stats",
+            data=str(e),
+            status=500,
+        )
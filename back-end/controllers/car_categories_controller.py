@@ -8,6 +8,10 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from cerberus import Validator
 from schemas.car_categories_schema import add_categories_schema, update_categories_schema
 from utils.handle_response import ResponseHandler
+from utils.cache import cache
+from utils.search_index import search_index
+from utils.post_commit import after_commit
+from utils.outbox import record
 
 car_categories_blueprint = Blueprint("car_categories_blueprint", __name__)
 
@@ -52,7 +56,10 @@ def create_category():
         new_car_categories = CarCategoryModel(car_brand=car_brand, type=type)
 
         s.add(new_car_categories)
+        record(s, "car_category", new_car_categories, "car_category.created", {"car_brand": car_brand, "type": type})
         s.commit()
+        cache.invalidate("categories:list")
+        after_commit(search_index.index_category, new_car_categories)
 
         return ResponseHandler.success(
             message="Car category added successfully",
@@ -75,6 +82,7 @@ def create_category():
 @car_categories_blueprint.get("/car-categories")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
+@cache.cached(tags=["categories:list"])
 def show_all_category():
     try:
         # Get query parameters for pagination
@@ -116,6 +124,7 @@ def show_all_category():
 @car_categories_blueprint.get("/car-categories/filter")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
+@cache.cached(tags=["categories:list"])
 def show_all_category_filter():
     try:
         car_categories = (CarCategoryModel).query.all()
@@ -131,6 +140,7 @@ def show_all_category_filter():
 
 @car_categories_blueprint.get("/car-categories/<int:id>")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@cache.cached(tags=["categories:list"])
 def show_category_by_id(id):
     try:
         car_category = (CarCategoryModel).query.filter_by(id=id).first()
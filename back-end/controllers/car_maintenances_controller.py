@@ -9,6 +9,9 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from cerberus import Validator
 from schemas.car_maintenances_schema import add_maintenance_schema, update_maintenance_schema
 from utils.handle_response import ResponseHandler
+from utils.resolvers import resolve_car, ResolveError
+from utils.outbox import record, changes_of
+from utils.cache import cache
 from sqlalchemy import and_
 
 car_maintenances_blueprint = Blueprint("car_maintenances_blueprint", __name__)
@@ -39,12 +42,10 @@ def create_maintenance():
             return ResponseHandler.error(message="Invalid data!", data=validator.errors, status=400)
 
         # Check if the car exist in database
-        car = s.query(CarModel).filter_by(name=data["car_name"]).first()
-        if not car:
-            return ResponseHandler.error(
-                message="Car name doesn't exist in database!",
-                status=404,
-            )
+        try:
+            car = resolve_car(s, data.get("car_id"), data.get("car_slug"), data.get("car_name"))
+        except ResolveError as e:
+            return ResponseHandler.error(message=e.message, data=e.candidates, status=e.status)
 
         # Check if the date and description exist in database
         existing_data = (
@@ -71,7 +72,21 @@ def create_maintenance():
             cost=data["cost"],
         )
         s.add(new_maintenance)
+        record(
+            s,
+            "car_maintenance",
+            new_maintenance,
+            "car_maintenance.created",
+            {
+                "car_id": car.id,
+                "maintenance_date": data["maintenance_date"],
+                "description": data["description"],
+                "cost": data["cost"],
+            },
+        )
         s.commit()
+        # Maintenance days aren't available for rent
+        cache.invalidate("analytics:utilization")
 
         return ResponseHandler.success(
             message="Car Maintenance added successfully",
@@ -205,18 +220,15 @@ def update_maintenance(maintenance_id):
             return ResponseHandler.error(message="Invalid data!", data=validator.errors, status=400)
 
         # Extract fields from the data
-        new_car_name = data.get("car_name")
         new_maintenance_date = data.get("maintenance_date")
         new_description = data.get("description")
 
-        # Validate car existence if car_name is provided
-        if new_car_name:
-            car = s.query(CarModel).filter_by(name=new_car_name).first()
-            if not car:
-                return ResponseHandler.error(
-                    message="Car name doesn't exist in the database!",
-                    status=404,
-                )
+        # Validate car existence if the car is changed
+        if "car_id" in data or "car_slug" in data or "car_name" in data:
+            try:
+                car = resolve_car(s, data.get("car_id"), data.get("car_slug"), data.get("car_name"))
+            except ResolveError as e:
+                return ResponseHandler.error(message=e.message, data=e.candidates, status=e.status)
             car_maintenance.car_id = car.id
 
         # Check for uniqueness of maintenance_date and description
@@ -225,7 +237,7 @@ def update_maintenance(maintenance_id):
                 s.query(CarMaintenanceModel)
                 .filter(
                     and_(
-                        CarMaintenanceModel.car_id == car.id,  # Check for the same car
+                        CarMaintenanceModel.car_id == car_maintenance.car_id,  # Check for the same car
                         CarMaintenanceModel.maintenance_date
                         == (new_maintenance_date or car_maintenance.maintenance_date),
                         CarMaintenanceModel.description == (new_description or car_maintenance.description),
@@ -251,7 +263,11 @@ def update_maintenance(maintenance_id):
         if "cost" in data:
             car_maintenance.cost = data["cost"]
 
+        changes = changes_of(car_maintenance, ["car_id", "maintenance_date", "description", "cost"])
+        if changes:
+            record(s, "car_maintenance", car_maintenance, "car_maintenance.updated", changes)
         s.commit()
+        cache.invalidate("analytics:utilization")
 
         return ResponseHandler.success(
             message="Car maintenance data updated successfully",
@@ -300,7 +316,9 @@ def delete_maintenance(maintenance_id):
         car_maintenance_info = car_maintenance.to_dictionaries()
 
         s.delete(car_maintenance)
+        record(s, "car_maintenance", maintenance_id, "car_maintenance.deleted", car_maintenance_info)
         s.commit()
+        cache.invalidate("analytics:utilization")
         return ResponseHandler.success(
             message="Car maintenance deleted successfully", data=car_maintenance_info, status=200
         )
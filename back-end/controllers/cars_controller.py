@@ -1,31 +1,44 @@
-from flask import Blueprint, request
+from flask import Blueprint, request, send_file
 from flask_cors import cross_origin
 from connector.mysql_connector import connection
-from models.cars import CarModel
+from models.cars import CarModel, gmt_plus_7_now
 from models.car_categories import CarCategoryModel
 from models.users import UserModel
 from models.car_images import CarImageModel
 from sqlalchemy.orm import sessionmaker
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from cerberus import Validator
-from schemas.cars_schema import add_car_schema, update_car_schema
+from schemas.cars_schema import add_car_schema, update_car_schema, bulk_update_car_schema
 from utils.handle_response import ResponseHandler
-import os
-import cloudinary
-import cloudinary.uploader
-from slugify import slugify
+from utils.cache import cache
+from utils.conditional import conditional, latest
+from utils.search_index import search_index
+from utils.post_commit import after_commit
+from utils.uploads import upload_pipeline, read_files, UploadError
+from utils.images import image_processor, ImageProcessingError, CAR_IMAGE_VARIANTS
+from utils.image_cleanup import enqueue_image_deletions
+from utils.bulk import bulk_items, unique_conflicts, apply_grouped_updates
+from utils.idempotency import idempotency
+from utils.sync import log_deletions
+from utils.event_bus import event_bus
+from utils.outbox import record, changes_of
+from utils.car_import import (
+    CarImporter,
+    ImportFormatError,
+    read_rows,
+    save_error_report,
+    load_error_report,
+    refresh_imported_cars,
+)
+from config.config import Config
+from utils.slugs import allocate_slug, allocate_slugs, slug_base, base_of
 from math import ceil
-from sqlalchemy import or_
+import io
+from sqlalchemy import or_, and_, func, select, insert, case, cast, literal, false, String
 
 
 cars_blueprint = Blueprint("cars_blueprint", __name__)
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-)
-
 
 @cars_blueprint.post("/cars")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
@@ -82,7 +95,7 @@ def create_car():
             )
 
         category_id = car_category.id
-        slug = CarModel.generate_slug(data["name"])
+        slug = allocate_slug(s, data["name"])
         # Get the uploaded files from the request
         # files = request.files.getlist("image")
         # if not files:
@@ -110,8 +123,17 @@ def create_car():
             status=data["status"],
         )
         s.add(new_car)
+        record(
+            s,
+            "car",
+            new_car,
+            "car.created",
+            {field: getattr(new_car, field) for field in ["category_id", "slug", *BULK_CAR_FIELDS, "name"]},
+        )
 
         s.commit()
+        cache.invalidate("cars:list", "analytics:utilization")
+        after_commit(search_index.index_car, new_car)
 
         return ResponseHandler.success(
             message="Car added successfully",
@@ -132,8 +154,9 @@ def create_car():
 
 
 @cars_blueprint.put("/cars/upload-image/<int:car_id>")
-@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization", "Idempotency-Key"])
 @jwt_required()
+@idempotency.idempotent
 # Only admin can upload car image
 def upload_car_image(car_id):
     Session = sessionmaker(bind=connection)
@@ -166,31 +189,66 @@ def upload_car_image(car_id):
         if not files or files[0].filename == "":
             return ResponseHandler.error(message="At least one car image is required", status=400)
 
-        image_urls = []
+        # End the read transaction, it must not stay open while we process & upload the images
+        s.rollback()
+
+        # Resize every image into its thumbnail, card & full variants
+        try:
+            processed_images = image_processor.process_many(read_files(files), CAR_IMAGE_VARIANTS)
+        except ImageProcessingError as e:
+            return ResponseHandler.error(message=f"{e.filename} is not a valid image", status=400)
 
-        for file in files:
-            # upload_result = cloudinary.uploader.upload(file)
-            # image_url = upload_result["secure_url"]
-            # image_urls.append(image_url)
-            # You might want to add validation here for file type, size, etc.
-            upload_result = cloudinary.uploader.upload(file)
-            image_urls.append(upload_result["secure_url"])
+        try:
+            urls = iter(upload_pipeline.upload_many([file for image in processed_images for file in image.values()]))
+        except UploadError as e:
+            # Queue the files that did upload, nothing will reference them
+            s.begin()
+            enqueue_image_deletions(s, e.urls)
+            s.commit()
+            return ResponseHandler.error(message="Failed to upload car images", data=e.errors, status=502)
+        image_urls = [{variant: next(urls) for variant in image} for image in processed_images]
+
+        s.begin()
+        car = s.query(CarModel).filter_by(id=car_id).first()
+        if not car:
+            # The car was deleted while we uploaded
+            enqueue_image_deletions(s, [url for image in image_urls for url in image.values()])
+            s.commit()
+            return ResponseHandler.error(message="Car not found!", status=404)
 
         if not car.image:
-            car.image = image_urls.pop(0)  # Take the first URL and remove it from the list
-
-        for url in image_urls:
-            new_image = CarImageModel(car_id=car.id, url=url)
-            # By adding to the session, you are marking it for insertion.
-            # SQLAlchemy is smart enough to handle the relationship automatically as well,
-            # but being explicit by adding it to the session is clear.
-            s.add(new_image)
-            # Alternatively, and more cleanly with relationships set up:
-            # new_image = CarImageModel(url=url)
-            # car.additional_images.append(new_image)
-
-        # car.image = image_urls[0]
+            main_image = image_urls.pop(0)  # Take the first image and remove it from the list
+            car.image = main_image["full"]
+            car.image_thumbnail = main_image["thumbnail"]
+            car.image_card = main_image["card"]
+
+        # Insert every additional image with a single executemany
+        if image_urls:
+            s.execute(
+                insert(CarImageModel),
+                [
+                    {
+                        "car_id": car.id,
+                        "url": image["full"],
+                        "thumbnail_url": image["thumbnail"],
+                        "card_url": image["card"],
+                    }
+                    for image in image_urls
+                ],
+            )
+
+        # The images are part of the car clients sync, mark it changed even when only additional images were added
+        car.updated_at = gmt_plus_7_now()
+        record(
+            s,
+            "car",
+            car,
+            "car.images_added",
+            {"image": car.image, "additional_images": [image["full"] for image in image_urls]},
+        )
         s.commit()
+        cache.invalidate("cars:list", f"car:{car.slug}")
+        after_commit(search_index.index_car, car)
 
         return ResponseHandler.success(
             message="Car Images successfully added!",
@@ -210,76 +268,224 @@ def upload_car_image(car_id):
         s.close()
 
 
+# Facet buckets as (label, lower bound inclusive, upper bound exclusive)
+CAPACITY_BUCKETS = [("1-4", None, 5), ("5-6", 5, 7), ("7-8", 7, 9), ("9+", 9, None)]
+PRICE_BUCKETS = [
+    ("under-300k", None, 300000),
+    ("300k-500k", 300000, 500000),
+    ("500k-1m", 500000, 1000000),
+    ("over-1m", 1000000, None),
+]
+
+
+def bucket_condition(column, lower, upper):
+    conditions = []
+    if lower is not None:
+        conditions.append(column >= lower)
+    if upper is not None:
+        conditions.append(column < upper)
+    return and_(*conditions)
+
+
+def bucket_label(column, buckets):
+    return case(*[(bucket_condition(column, lower, upper), label) for label, lower, upper in buckets])
+
+
+def filter_cars(car_query, args):
+    # Get query parameters for search filters
+    car_brand = args.get("car_brand", default=None, type=str)
+    car_type = args.get("type", default=None, type=str)
+
+    # Resolve the brand/type text against car_categories, so the wildcard LIKE only
+    # scans that small table and cars are filtered by an IN on cars.category_id
+    if car_brand or car_type:
+        category_ids = select(CarCategoryModel.id)
+        if car_brand:
+            category_ids = category_ids.where(CarCategoryModel.car_brand.ilike(f"%{car_brand}%"))
+        if car_type:
+            category_ids = category_ids.where(CarCategoryModel.type.ilike(f"%{car_type}%"))
+        car_query = car_query.filter(CarModel.category_id.in_(category_ids))
+
+    # Exact filters on the remaining facets
+    for field in ["transmission", "fuel", "status"]:
+        value = args.get(field, default=None, type=str)
+        if value:
+            car_query = car_query.filter(getattr(CarModel, field) == value)
+
+    for field, buckets in [("capacity", CAPACITY_BUCKETS), ("price", PRICE_BUCKETS)]:
+        value = args.get(field, default=None, type=str)
+        if value:
+            bucket = next((bucket for bucket in buckets if bucket[0] == value), None)
+            if bucket is None:
+                # Unknown bucket label matches nothing, like an unknown brand does
+                car_query = car_query.filter(false())
+            else:
+                car_query = car_query.filter(bucket_condition(getattr(CarModel, field), bucket[1], bucket[2]))
+
+    return car_query
+
+
+def count_car_facets(args):
+    # One grouped SELECT per facet, sent to the database as a single UNION ALL
+    facet_columns = {
+        "car_brand": CarCategoryModel.car_brand,
+        "type": CarCategoryModel.type,
+        "transmission": CarModel.transmission,
+        "fuel": CarModel.fuel,
+        "capacity": bucket_label(CarModel.capacity, CAPACITY_BUCKETS),
+        "price": bucket_label(CarModel.price, PRICE_BUCKETS),
+        "status": CarModel.status,
+    }
+
+    facet_queries = []
+    for facet, column in facet_columns.items():
+        value = cast(column, String(255))
+        facet_query = (
+            CarModel.query.join(CarCategoryModel, CarModel.category_id == CarCategoryModel.id)
+            .with_entities(literal(facet).label("facet"), value.label("value"), func.count(CarModel.id).label("total"))
+            .group_by(value)
+        )
+        facet_queries.append(filter_cars(facet_query, args))
+    rows = facet_queries[0].union_all(*facet_queries[1:]).all()
+
+    facets = {facet: {} for facet in facet_columns}
+    for facet, value, total in rows:
+        facets[facet][value] = total
+
+    # Keep the buckets in their natural order, and list empty ones too
+    for facet, buckets in [("capacity", CAPACITY_BUCKETS), ("price", PRICE_BUCKETS)]:
+        facets[facet] = {label: facets[facet].get(label, 0) for label, _, _ in buckets}
+
+    return facets
+
+
+def list_cars(args):
+    # Get query parameters for pagination
+    page = args.get("page", default=1, type=int)
+    per_page = args.get("per_page", default=5, type=int)
+
+    car_query = CarModel.query.join(CarCategoryModel, CarModel.category_id == CarCategoryModel.id).add_columns(
+        CarCategoryModel.car_brand, CarCategoryModel.type
+    )
+
+    # Apply search filters
+    car_query = filter_cars(car_query, args)
+
+    # Apply pagination
+    if page and per_page:
+        pagination = car_query.paginate(page=page, per_page=per_page, error_out=False)
+        cars = pagination.items
+        total_cars = car_query.count()
+        total_pages = ceil(total_cars / per_page)
+    else:
+        cars = car_query.all()
+
+    # Create a list of car dictionaries
+    # cars_list = []
+    # for car, car_brand, car_type in cars:
+    #     car_dict = {
+    #         **{column.name: getattr(car, column.name) for column in CarModel.__table__.columns},
+    #         "car_brand": car_brand,
+    #         "type": car_type,
+    #     }
+    #     cars_list.append(car_dict)
+
+    cars_list = []
+    for car, car_brand_val, car_type_val in cars:
+        # Use the to_dictionaries() method which already includes additional_images
+        car_dict = car.to_dictionaries()
+        # Then, simply add the extra data from the join
+        car_dict["car_brand"] = car_brand_val
+        car_dict["type"] = car_type_val
+        cars_list.append(car_dict)
+
+    if page and per_page:
+        response = {
+            "data": cars_list,
+            "pagination": {
+                "total_cars": total_cars,
+                "current_page": page,
+                "total_pages": total_pages,
+                "next_page": page + 1 if page < total_pages else None,
+                "prev_page": page - 1 if page > 1 else None,
+            },
+        }
+    else:
+        response = {"data": cars_list}
+
+    return response
+
+
+def car_list_fingerprint():
+    # Row count and newest update of everything the car list renders
+    car_count, car_updated_at, category_updated_at, image_count, image_updated_at = filter_cars(
+        CarModel.query.join(CarCategoryModel, CarModel.category_id == CarCategoryModel.id).with_entities(
+            func.count(CarModel.id),
+            func.max(CarModel.updated_at),
+            select(func.max(CarCategoryModel.updated_at)).correlate(None).scalar_subquery(),
+            select(func.count(CarImageModel.id)).correlate(None).scalar_subquery(),
+            select(func.max(CarImageModel.updated_at)).correlate(None).scalar_subquery(),
+        ),
+        request.args,
+    ).one()
+
+    return latest(car_updated_at, category_updated_at, image_updated_at), f"{car_count}-{image_count}"
+
+
+def car_fingerprint(slug):
+    result = (
+        CarModel.query.join(CarCategoryModel, CarModel.category_id == CarCategoryModel.id)
+        .with_entities(
+            CarModel.updated_at,
+            CarCategoryModel.updated_at,
+            select(func.count(CarImageModel.id)).where(CarImageModel.car_id == CarModel.id).scalar_subquery(),
+            select(func.max(CarImageModel.updated_at)).where(CarImageModel.car_id == CarModel.id).scalar_subquery(),
+        )
+        .filter(CarModel.slug == slug)
+        .first()
+    )
+    if not result:
+        return None
+
+    car_updated_at, category_updated_at, image_count, image_updated_at = result
+    return latest(car_updated_at, category_updated_at, image_updated_at), image_count
+
+
 @cars_blueprint.get("/cars")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
+@conditional(car_list_fingerprint)
+@cache.cached(tags=["cars:list"])
 def show_all_car():
     try:
-        # Get query parameters for pagination
-        page = request.args.get("page", default=1, type=int)
-        per_page = request.args.get("per_page", default=5, type=int)
+        response = list_cars(request.args)
 
-        # Get query parameters for search filters
-        car_brand = request.args.get("car_brand", default=None, type=str)
-        car_type = request.args.get("type", default=None, type=str)
+        return ResponseHandler.success(data=response, status=200)
 
-        car_query = CarModel.query.join(CarCategoryModel, CarModel.category_id == CarCategoryModel.id).add_columns(
-            CarCategoryModel.car_brand, CarCategoryModel.type
+    except Exception as e:
+        return ResponseHandler.error(
+            message="An error occured while showing cars",
+            data=str(e),
+            status=500,
         )
 
-        # Apply search filters
-        if car_brand:
-            car_query = car_query.filter(CarCategoryModel.car_brand.ilike(f"%{car_brand}%"))
-        if car_type:
-            car_query = car_query.filter(CarCategoryModel.type.ilike(f"%{car_type}%"))
-
-        # Apply pagination
-        if page and per_page:
-            pagination = car_query.paginate(page=page, per_page=per_page, error_out=False)
-            cars = pagination.items
-            total_cars = car_query.count()
-            total_pages = ceil(total_cars / per_page)
-        else:
-            cars = car_query.all()
-
-        # Create a list of car dictionaries
-        # cars_list = []
-        # for car, car_brand, car_type in cars:
-        #     car_dict = {
-        #         **{column.name: getattr(car, column.name) for column in CarModel.__table__.columns},
-        #         "car_brand": car_brand,
-        #         "type": car_type,
-        #     }
-        #     cars_list.append(car_dict)
-
-        cars_list = []
-        for car, car_brand_val, car_type_val in cars:
-            # Use the to_dictionaries() method which already includes additional_images
-            car_dict = car.to_dictionaries()
-            # Then, simply add the extra data from the join
-            car_dict["car_brand"] = car_brand_val
-            car_dict["type"] = car_type_val
-            cars_list.append(car_dict)
-
-        if page and per_page:
-            response = {
-                "data": cars_list,
-                "pagination": {
-                    "total_cars": total_cars,
-                    "current_page": page,
-                    "total_pages": total_pages,
-                    "next_page": page + 1 if page < total_pages else None,
-                    "prev_page": page - 1 if page > 1 else None,
-                },
-            }
-        else:
-            response = {"data": cars_list}
+
+@cars_blueprint.get("/cars/facets")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+@conditional(car_list_fingerprint)
+@cache.cached(tags=["cars:list"])
+# Filtered car page together with the facet counts for the same filters
+def show_car_facets():
+    try:
+        response = list_cars(request.args)
+        response["facets"] = count_car_facets(request.args)
 
         return ResponseHandler.success(data=response, status=200)
 
     except Exception as e:
         return ResponseHandler.error(
-            message="An error occured while showing cars",
+            message="An error occured while showing car facets",
             data=str(e),
             status=500,
         )
@@ -288,6 +494,8 @@ def show_all_car():
 @cars_blueprint.get("/cars/<slug>")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
+@conditional(car_fingerprint)
+@cache.cached(tags=["car:{slug}"])
 def show_car_by_slug(slug):
     try:
         car_result = (
@@ -387,15 +595,10 @@ def update_car(slug):
             car.category_id = car_category.id
 
         if "name" in data:
-            name = data["name"]
-            slug_base = slugify(name)
-
-            # Preserve the numeric part of the slug
-            numeric_part = car.slug.split("-")[-1]
-            new_slug = f"{slug_base}-{numeric_part}"
-
-            car.name = name
-            car.slug = new_slug
+            # Only a name with another slug base needs a new slug, the old one stays valid otherwise
+            if slug_base(data["name"]) != base_of(car.slug):
+                car.slug = allocate_slug(s, data["name"])
+            car.name = data["name"]
 
         if "transmission" in data:
             car.transmission = data["transmission"]
@@ -440,6 +643,7 @@ def update_car(slug):
         if "price" in data:
             car.price = data["price"]
 
+        status_changed = "status" in data and data["status"] != car.status
         if "status" in data:
             car.status = data["status"]
 
@@ -458,7 +662,20 @@ def update_car(slug):
 
         #     car.image = image_urls[0] if image_urls else car.image
 
+        changes = changes_of(car, ["category_id", "slug", "name", *BULK_CAR_FIELDS])
+        if changes:
+            record(s, "car", car, "car.updated", changes)
         s.commit()
+        cache.invalidate("cars:list", f"car:{slug}", f"car:{car.slug}")
+        if "category_id" in changes:
+            # The car's days & revenue move to its new category's totals
+            cache.invalidate("analytics:utilization")
+        after_commit(search_index.index_car, car)
+        if status_changed:
+            after_commit(
+                event_bus.publish,
+                "car", {"id": car.id, "slug": car.slug, "status": car.status, "at": gmt_plus_7_now().isoformat()}
+            )
 
         return ResponseHandler.success(
             message="Car updated successfully",
@@ -478,6 +695,280 @@ def update_car(slug):
         s.close()
 
 
+# Columns a bulk item may set as they are
+BULK_CAR_FIELDS = ["transmission", "fuel", "color", "plate_number", "capacity", "registration_number", "price", "status"]
+
+
+@cars_blueprint.patch("/cars/bulk")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Only admin can update the cars
+def bulk_update_cars():
+    Session = sessionmaker(bind=connection)
+    s = Session()
+    s.begin()
+
+    try:
+        user_id = get_jwt_identity()
+        current_user = s.query(UserModel).filter_by(id=user_id).first()
+        if not current_user:
+            return ResponseHandler.error(message="User not found", status=404)
+
+        # Check if the current user's role is "admin"
+        if current_user.role_id != 1:
+            return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
+
+        items, message = bulk_items(request.get_json(silent=True))
+        if message:
+            return ResponseHandler.error(message=message, status=400)
+
+        results = [{"index": index, "id": None, "slug": None, "success": False, "errors": {}} for index in range(len(items))]
+
+        # Validate every item first, only the valid ones reach the database
+        validator = Validator(bulk_update_car_schema)
+        valid_items = {}
+        for index, item in enumerate(items):
+            data = dict(item)
+            # JSON has no float type, a whole number price arrives as an integer
+            if type(data.get("price")) is int:
+                data["price"] = float(data["price"])
+
+            if not validator.validate(data):
+                results[index]["errors"] = validator.errors
+            elif "id" not in data and "slug" not in data:
+                results[index]["errors"] = {"id": ["id or slug is required"]}
+            elif ("car_brand" in data) != ("type" in data):
+                results[index]["errors"] = {"car_brand": ["car_brand and type must be changed together"]}
+            else:
+                valid_items[index] = data
+
+        # Load every car of the batch with one query
+        ids = [data["id"] for data in valid_items.values() if "id" in data]
+        slugs = [data["slug"] for data in valid_items.values() if "slug" in data]
+        cars = s.query(CarModel).filter(or_(CarModel.id.in_(ids), CarModel.slug.in_(slugs))).all() if valid_items else []
+        cars_by_id = {car.id: car for car in cars}
+        cars_by_slug = {car.slug: car for car in cars}
+
+        # Resolve every brand & type of the batch with one query
+        categories = {}
+        brands = {data["car_brand"] for data in valid_items.values() if "car_brand" in data}
+        if brands:
+            types = {data["type"] for data in valid_items.values() if "type" in data}
+            for category in s.query(CarCategoryModel).filter(
+                CarCategoryModel.car_brand.in_(brands), CarCategoryModel.type.in_(types)
+            ):
+                categories[(category.car_brand.lower(), category.type.lower())] = category.id
+
+        changes_by_id = {}
+        index_by_id = {}
+        for index, data in valid_items.items():
+            car = cars_by_id.get(data["id"]) if "id" in data else cars_by_slug.get(data["slug"])
+            if not car:
+                results[index]["errors"] = {"car": ["Car not found"]}
+                continue
+
+            results[index]["id"] = car.id
+            results[index]["slug"] = car.slug
+            if car.id in changes_by_id:
+                results[index]["errors"] = {"car": ["Car is already changed by another item"]}
+                continue
+
+            changes = {field: data[field] for field in BULK_CAR_FIELDS if field in data}
+
+            if "car_brand" in data:
+                category_id = categories.get((data["car_brand"].lower(), data["type"].lower()))
+                if category_id is None:
+                    results[index]["errors"] = {"car_brand": ["Car brand or type doesn't exist in database"]}
+                    continue
+                changes["category_id"] = category_id
+
+            if "name" in data:
+                changes["name"] = data["name"]
+
+            # Drop the values the car already has, so identical change sets share one UPDATE
+            changes_by_id[car.id] = {field: value for field, value in changes.items() if getattr(car, field) != value}
+            index_by_id[car.id] = index
+
+        # Check plate number & registration number uniqueness for the whole batch at once
+        conflicts = unique_conflicts(s, CarModel, ["plate_number", "registration_number"], changes_by_id)
+        for car_id, fields in conflicts.items():
+            results[index_by_id[car_id]]["errors"] = {field: ["Already used by another car"] for field in fields}
+            del changes_by_id[car_id]
+
+        # Renamed cars whose slug base changes get new slugs, reserved together
+        renamed = [
+            car_id
+            for car_id, changes in changes_by_id.items()
+            if "name" in changes and slug_base(changes["name"]) != base_of(results[index_by_id[car_id]]["slug"])
+        ]
+        new_slugs = allocate_slugs(s, [changes_by_id[car_id]["name"] for car_id in renamed])
+        for car_id, slug in zip(renamed, new_slugs):
+            changes_by_id[car_id]["slug"] = slug
+
+        apply_grouped_updates(s, CarModel, changes_by_id)
+        for car_id, changes in changes_by_id.items():
+            if changes:
+                record(s, "car", car_id, "car.updated", changes)
+        s.commit()
+
+        changed_slugs = []
+        for car_id, changes in changes_by_id.items():
+            result = results[index_by_id[car_id]]
+            result["success"] = True
+            result["changed"] = sorted(changes)
+            if changes:
+                changed_slugs += [result["slug"], changes.get("slug", result["slug"])]
+                result["slug"] = changes.get("slug", result["slug"])
+
+        if changed_slugs:
+            cache.invalidate("cars:list", *[f"car:{slug}" for slug in set(changed_slugs)])
+            after_commit(search_index.index_cars, [car_id for car_id, changes in changes_by_id.items() if changes])
+            for car_id, changes in changes_by_id.items():
+                if "status" in changes:
+                    after_commit(
+                        event_bus.publish,
+                        "car",
+                        {
+                            "id": car_id,
+                            "slug": results[index_by_id[car_id]]["slug"],
+                            "status": changes["status"],
+                            "at": gmt_plus_7_now().isoformat(),
+                        },
+                    )
+
+        updated = len(changes_by_id)
+        failed = len(items) - updated
+        if not updated:
+            return ResponseHandler.error(message="No car was updated", data=results, status=400)
+
+        return ResponseHandler.success(
+            message=f"{updated} car(s) updated, {failed} failed",
+            data=results,
+            status=207 if failed else 200,
+        )
+
+    except Exception as e:
+        s.rollback()
+        return ResponseHandler.error(
+            message="An error occurred while updating the cars",
+            data=str(e),
+            status=500,
+        )
+
+    finally:
+        s.close()
+
+
+# Rejected rows returned inline, the full list is in the downloadable report
+IMPORT_ERRORS_PREVIEW = 50
+
+
+@cars_blueprint.post("/cars/import")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Only admin can import cars
+def import_cars():
+    Session = sessionmaker(bind=connection)
+    s = Session()
+    s.begin()
+
+    try:
+        user_id = get_jwt_identity()
+        current_user = s.query(UserModel).filter_by(id=user_id).first()
+        if not current_user:
+            return ResponseHandler.error(message="User not found", status=404)
+
+        # Check if the current user's role is "admin"
+        if current_user.role_id != 1:
+            return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
+
+        file = request.files.get("file")
+        if not file or file.filename == "":
+            return ResponseHandler.error(message="A .csv or .xlsx file is required", status=400)
+        dry_run = request.form.get("dry_run", "false").lower() == "true"
+
+        importer = CarImporter(s, chunk_size=Config.IMPORT_CHUNK_SIZE, dry_run=dry_run)
+        try:
+            result = importer.run(read_rows(file.stream, file.filename))
+        except ImportFormatError as e:
+            return ResponseHandler.error(message=str(e), status=400)
+
+        car_ids = result.pop("car_ids")
+        if car_ids:
+            after_commit(refresh_imported_cars, car_ids)
+
+        # Keep the full error report in the database, so any worker can serve the download
+        errors = result.pop("errors")
+        result["report_id"] = None
+        if errors:
+            try:
+                result["report_id"] = save_error_report(s, errors)
+            except Exception:
+                # The cars are already imported, the response still lists the first errors
+                s.rollback()
+        result["errors"] = errors[:IMPORT_ERRORS_PREVIEW]
+        result["dry_run"] = dry_run
+
+        return ResponseHandler.success(
+            message=f"{result['imported']} car(s) {'valid' if dry_run else 'imported'}, {result['failed']} rejected",
+            data=result,
+            status=200 if dry_run or not result["imported"] else 201,
+        )
+
+    except Exception as e:
+        s.rollback()
+        return ResponseHandler.error(
+            message="An error occurred while importing the cars",
+            data=str(e),
+            status=500,
+        )
+
+    finally:
+        s.close()
+
+
+@cars_blueprint.get("/cars/import/reports/<report_id>")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Only admin can download the import reports
+def download_import_report(report_id):
+    Session = sessionmaker(bind=connection)
+    s = Session()
+    s.begin()
+
+    try:
+        user_id = get_jwt_identity()
+        current_user = s.query(UserModel).filter_by(id=user_id).first()
+        if not current_user:
+            return ResponseHandler.error(message="User not found", status=404)
+
+        # Check if the current user's role is "admin"
+        if current_user.role_id != 1:
+            return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
+
+        report = load_error_report(s, report_id)
+        if report is None:
+            return ResponseHandler.error(message="Import report not found or expired!", status=404)
+
+        return send_file(
+            io.BytesIO(report),
+            mimetype="text/csv",
+            as_attachment=True,
+            download_name=f"car_import_errors_{report_id}.csv",
+        )
+
+    except Exception as e:
+        s.rollback()
+        return ResponseHandler.error(
+            message="An error occurred while downloading the import report",
+            data=str(e),
+            status=500,
+        )
+
+    finally:
+        s.close()
+
+
 @cars_blueprint.delete("/cars/<int:car_id>")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
@@ -505,20 +996,21 @@ def delete_car(car_id):
                 status=404,
             )
 
-        # Delete the image from Cloudinary
-        # Only try to delete the image if it exists
-        if car.image:
-            try:
-                public_id = os.path.splitext(os.path.basename(car.image))[0]
-                cloudinary.uploader.destroy(public_id)
-            except Exception as img_error:
-                # Log the error but continue with car deletion
-                print(f"Error deleting image: {str(img_error)}")
+        # Queue the image, its variants & the additional images for deletion from the storage
+        # The queue is committed with the car, the cleanup worker deletes them in the background
+        image_urls = [car.image, car.image_thumbnail, car.image_card]
+        for image in car.additional_images:
+            image_urls += [image.url, image.thumbnail_url, image.card_url]
+        enqueue_image_deletions(s, image_urls)
 
         car_info = car.to_dictionaries()
 
         s.delete(car)
+        log_deletions(s, "cars", [car_id])
+        record(s, "car", car_id, "car.deleted", car_info)
         s.commit()
+        cache.invalidate("cars:list", f"car:{car_info['slug']}", "analytics:utilization")
+        after_commit(search_index.remove, "car", car_id)
 
         return ResponseHandler.success(message="Car deleted successfully", data=car_info, status=200)
 
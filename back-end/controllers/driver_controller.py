@@ -1,13 +1,23 @@
 from flask import Blueprint, request
 from flask_cors import cross_origin
 from connector.mysql_connector import connection
-from models.drivers import DriverModel
+from models.drivers import DriverModel, gmt_plus_7_now
 from models.users import UserModel
 from sqlalchemy.orm import sessionmaker
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from cerberus import Validator
-from schemas.driver_schema import add_driver_schema, update_driver_schema
+from schemas.driver_schema import add_driver_schema, update_driver_schema, bulk_update_driver_schema
 from utils.handle_response import ResponseHandler
+from utils.cache import cache
+from utils.conditional import conditional
+from utils.search_index import search_index
+from utils.post_commit import after_commit
+from utils.bulk import bulk_items, unique_conflicts, apply_grouped_updates
+from utils.driver_schedule import free_drivers
+from utils.sync import log_deletions
+from utils.event_bus import event_bus
+from utils.outbox import record, changes_of
+from datetime import datetime
 from math import ceil
 
 drivers_blueprint = Blueprint("drivers_blueprint", __name__)
@@ -66,7 +76,16 @@ def create_driver():
             status=status,
         )
         s.add(new_driver)
+        record(
+            s,
+            "driver",
+            new_driver,
+            "driver.created",
+            {field: getattr(new_driver, field) for field in BULK_DRIVER_FIELDS},
+        )
         s.commit()
+        cache.invalidate("drivers:list")
+        after_commit(search_index.index_driver, new_driver)
 
         return ResponseHandler.success(
             message="Driver added successfully",
@@ -89,6 +108,7 @@ def create_driver():
 @drivers_blueprint.get("/drivers")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
+@cache.cached(tags=["drivers:list"])
 def show_all_driver():
     try:
         # Get query parameters for pagination
@@ -130,10 +150,25 @@ def show_all_driver():
 @drivers_blueprint.get("/drivers-available")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
+@cache.cached(tags=["drivers:list"])
 def show_all_available_driver():
     try:
-        drivers = (DriverModel).query.filter(DriverModel.status.ilike("Available")).all()
-        drivers_list = [driver.to_dictionaries() for driver in drivers]
+        # Without dates, the drivers free today
+        try:
+            today = gmt_plus_7_now().date()
+            start_date = datetime.strptime(request.args["start"], "%Y-%m-%d").date() if "start" in request.args else today
+            end_date = datetime.strptime(request.args["end"], "%Y-%m-%d").date() if "end" in request.args else start_date
+        except ValueError:
+            return ResponseHandler.error(message="start and end must be dates formatted as YYYY-MM-DD", status=400)
+
+        if end_date < start_date:
+            return ResponseHandler.error(message="End date must be greater than start date", status=400)
+
+        # One query, the overlap check runs against the transactions (driver_id, start_date, end_date) index
+        drivers = free_drivers(DriverModel.query, start_date, end_date).all()
+        drivers_list = [
+            {**driver.to_dictionaries(), "active_bookings": active_bookings} for driver, active_bookings in drivers
+        ]
         return ResponseHandler.success(data=drivers_list, status=200)
 
     except Exception as e:
@@ -144,9 +179,18 @@ def show_all_available_driver():
         )
 
 
+def driver_fingerprint(driver_id):
+    result = DriverModel.query.with_entities(DriverModel.updated_at).filter_by(id=driver_id).first()
+    if not result:
+        return None
+    return result.updated_at, driver_id
+
+
 @drivers_blueprint.get("/drivers/<int:driver_id>")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
+@conditional(driver_fingerprint)
+@cache.cached(tags=["driver:{driver_id}"])
 def show_driver_by_id(driver_id):
     try:
         driver = (DriverModel).query.filter_by(id=driver_id).first()
@@ -231,10 +275,21 @@ def update_driver(driver_id):
                     )
                 driver.license_number = data["license_number"]
 
+        status_changed = "status" in data and data["status"] != driver.status
         if "status" in data:
             driver.status = data["status"]
 
+        changes = changes_of(driver, BULK_DRIVER_FIELDS)
+        if changes:
+            record(s, "driver", driver, "driver.updated", changes)
         s.commit()
+        cache.invalidate("drivers:list", f"driver:{driver_id}")
+        if status_changed:
+            after_commit(
+                event_bus.publish,
+                "driver", {"id": driver_id, "status": data["status"], "at": gmt_plus_7_now().isoformat()}
+            )
+        after_commit(search_index.index_driver, driver)
 
         return ResponseHandler.success(
             message="Driver updated successfully",
@@ -254,6 +309,119 @@ def update_driver(driver_id):
         s.close()
 
 
+# Columns a bulk item may set
+BULK_DRIVER_FIELDS = ["name", "gender", "dob", "address", "phone_number", "license_number", "status"]
+
+
+@drivers_blueprint.patch("/drivers/bulk")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Only admin can update the drivers
+def bulk_update_drivers():
+    Session = sessionmaker(bind=connection)
+    s = Session()
+    s.begin()
+
+    try:
+        user_id = get_jwt_identity()
+        current_user = s.query(UserModel).filter_by(id=user_id).first()
+        if not current_user:
+            return ResponseHandler.error(message="User not found", status=404)
+
+        # Check if the current user's role is "admin"
+        if current_user.role_id != 1:
+            return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
+
+        items, message = bulk_items(request.get_json(silent=True))
+        if message:
+            return ResponseHandler.error(message=message, status=400)
+
+        results = [{"index": index, "id": None, "success": False, "errors": {}} for index in range(len(items))]
+
+        # Validate every item first, only the valid ones reach the database
+        validator = Validator(bulk_update_driver_schema)
+        valid_items = {}
+        for index, item in enumerate(items):
+            if validator.validate(item):
+                valid_items[index] = item
+            else:
+                results[index]["errors"] = validator.errors
+
+        # Load every driver of the batch with one query
+        ids = [data["id"] for data in valid_items.values()]
+        drivers = {driver.id: driver for driver in s.query(DriverModel).filter(DriverModel.id.in_(ids))} if ids else {}
+
+        changes_by_id = {}
+        index_by_id = {}
+        for index, data in valid_items.items():
+            results[index]["id"] = data["id"]
+            driver = drivers.get(data["id"])
+            if not driver:
+                results[index]["errors"] = {"driver": ["Driver not found"]}
+                continue
+            if driver.id in changes_by_id:
+                results[index]["errors"] = {"driver": ["Driver is already changed by another item"]}
+                continue
+
+            changes = {field: data[field] for field in BULK_DRIVER_FIELDS if field in data}
+            if "dob" in changes:
+                changes["dob"] = datetime.strptime(changes["dob"], "%Y-%m-%d").date()
+
+            # Drop the values the driver already has, so identical change sets share one UPDATE
+            changes_by_id[driver.id] = {field: value for field, value in changes.items() if getattr(driver, field) != value}
+            index_by_id[driver.id] = index
+
+        # Check phone number & license number uniqueness for the whole batch at once
+        conflicts = unique_conflicts(s, DriverModel, ["phone_number", "license_number"], changes_by_id)
+        for driver_id, fields in conflicts.items():
+            results[index_by_id[driver_id]]["errors"] = {field: ["Already in use by another driver"] for field in fields}
+            del changes_by_id[driver_id]
+
+        apply_grouped_updates(s, DriverModel, changes_by_id)
+        for driver_id, changes in changes_by_id.items():
+            if changes:
+                record(s, "driver", driver_id, "driver.updated", changes)
+        s.commit()
+
+        for driver_id, changes in changes_by_id.items():
+            result = results[index_by_id[driver_id]]
+            result["success"] = True
+            result["changed"] = sorted(changes)
+
+        changed_ids = [driver_id for driver_id, changes in changes_by_id.items() if changes]
+        if changed_ids:
+            cache.invalidate("drivers:list", *[f"driver:{driver_id}" for driver_id in changed_ids])
+            after_commit(search_index.index_drivers, changed_ids)
+            for driver_id, changes in changes_by_id.items():
+                if "status" in changes:
+                    after_commit(
+                        event_bus.publish,
+                        "driver", {"id": driver_id, "status": changes["status"], "at": gmt_plus_7_now().isoformat()}
+                    )
+
+        updated = len(changes_by_id)
+        failed = len(items) - updated
+        if not updated:
+            return ResponseHandler.error(message="No driver was updated", data=results, status=400)
+
+        return ResponseHandler.success(
+            message=f"{updated} driver(s) updated, {failed} failed",
+            data=results,
+            status=207 if failed else 200,
+        )
+
+    except Exception as e:
+        s.rollback()
+        return ResponseHandler.error(
+            message="An error occurred while updating the drivers",
+            data=str(e),
+            status=500,
+        )
+
+    finally:
+        s.close()
+
+
 @drivers_blueprint.delete("/drivers/<int:driver_id>")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
@@ -284,7 +452,11 @@ def delete_driver(driver_id):
         driver_info = driver.to_dictionaries()
 
         s.delete(driver)
+        log_deletions(s, "drivers", [driver_id])
+        record(s, "driver", driver_id, "driver.deleted", driver_info)
         s.commit()
+        cache.invalidate("drivers:list", f"driver:{driver_id}")
+        after_commit(search_index.remove, "driver", driver_id)
 
         return ResponseHandler.success(message="Driver deleted successfully", data=driver_info, status=200)
 
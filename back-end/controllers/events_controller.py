@@ -0,0 +1,90 @@
+import json
+import time
+from flask import Blueprint, Response, request
+from flask_cors import cross_origin
+from flask_jwt_extended import jwt_required, get_jwt, get_jwt_identity
+from config.config import Config
+from models.users import UserModel
+from utils.event_bus import event_bus
+from utils.handle_response import ResponseHandler
+from utils.transaction_states import on_transition
+
+events_blueprint = Blueprint("events_blueprint", __name__)
+
+
+@on_transition
+def publish_transition(transition_event):
+    # The transaction is private to its customer, the car's new status is public
+    event_bus.publish("transaction", transition_event, user_id=transition_event["user_id"])
+    event_bus.publish(
+        "car",
+        {
+            "id": transition_event["car_id"],
+            "slug": transition_event["car_slug"],
+            "status": transition_event["car_status"],
+            "at": transition_event["at"],
+        },
+    )
+
+
+def format_message(message):
+    return f"id: {message['id']}\nevent: {message['type']}\ndata: {json.dumps(message['data'], default=str)}\n\n"
+
+
+@events_blueprint.get("/events/stream")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization", "Last-Event-ID"])
+# EventSource can't set headers, browsers pass the token as ?jwt=
+@jwt_required(locations=["headers", "query_string"])
+# Server-Sent Events of the caller's transactions and of the fleet's statuses
+def stream_events():
+    user_id = int(get_jwt_identity())
+    expires_at = get_jwt()["exp"]
+
+    # Read once when the stream opens, the token's claim may be older than the role
+    current_user = UserModel.query.filter_by(id=user_id).first()
+    if not current_user:
+        return ResponseHandler.error(message="User not found", status=404)
+    is_admin = current_user.role_id == 1
+
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        last_event_id = int(last_event_id) if last_event_id else None
+    except ValueError:
+        return ResponseHandler.error(message="Last-Event-ID must be an event id", status=400)
+
+    def accepts(message):
+        return message["user_id"] is None or is_admin or message["user_id"] == user_id
+
+    subscription, replay = event_bus.subscribe(accepts, last_event_id)
+    if subscription is None:
+        response = ResponseHandler.error(message="Too many open event streams, retry later", status=503)
+        response.headers["Retry-After"] = "5"
+        return response
+
+    def generate():
+        try:
+            yield f"retry: {Config.EVENTS_HEARTBEAT_SECONDS * 1000}\n\n"
+            if replay is None:
+                # The missed messages aren't kept anymore, the client reloads what it shows
+                yield f"id: {event_bus.newest_id()}\nevent: reset\ndata: {{}}\n\n"
+            for message in replay or []:
+                yield format_message(message)
+
+            # Ends when the token expires, the reconnect is authorized with a fresh one
+            while time.time() < expires_at:
+                message = subscription.get(timeout=Config.EVENTS_HEARTBEAT_SECONDS)
+                if message is not None:
+                    yield format_message(message)
+                elif subscription.overflowed:
+                    # Too slow to keep up, it reconnects & resumes from the history
+                    return
+                else:
+                    # Keeps proxies from closing an idle stream and finds dead clients
+                    yield ": keep-alive\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,19 @@
+from flask import Blueprint, abort, send_from_directory
+from utils.storage import storage, LocalStorage
+
+media_blueprint = Blueprint("media_blueprint", __name__)
+
+# Blobs are content addressed, a URL never changes what it points to
+MEDIA_MAX_AGE = 365 * 24 * 60 * 60
+
+
+@media_blueprint.get("/media/<path:path>")
+def show_media(path):
+    # Only the local storage backend serves its own files
+    if not isinstance(storage, LocalStorage):
+        abort(404)
+
+    # send_from_directory rejects paths escaping the root and answers Range & conditional requests
+    response = send_from_directory(storage.root, path, max_age=MEDIA_MAX_AGE, conditional=True)
+    response.headers["Cache-Control"] = f"public, max-age={MEDIA_MAX_AGE}, immutable"
+    return response
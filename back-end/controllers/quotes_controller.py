@@ -0,0 +1,95 @@
+from datetime import datetime
+from flask import Blueprint, request
+from flask_cors import cross_origin
+from flask_jwt_extended import jwt_required
+from config.config import Config
+from models.cars import CarModel
+from utils.cache import cache
+from utils.handle_response import ResponseHandler
+from utils.pricing import pricing
+
+quotes_blueprint = Blueprint("quotes_blueprint", __name__)
+
+
+def split_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+
+@quotes_blueprint.get("/quotes")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+@cache.cached(tags=["cars:list"])
+# Prices of many cars for the same dates, e.g. a whole catalog page
+def show_quotes():
+    try:
+        try:
+            start_date = datetime.strptime(request.args.get("start", ""), "%Y-%m-%d").date()
+            end_date = datetime.strptime(request.args.get("end", ""), "%Y-%m-%d").date()
+        except ValueError:
+            return ResponseHandler.error(message="start and end must be dates formatted as YYYY-MM-DD", status=400)
+
+        if end_date <= start_date:
+            return ResponseHandler.error(message="End date must be greater than start date", status=400)
+        if (end_date - start_date).days > Config.QUOTE_MAX_DAYS:
+            return ResponseHandler.error(message=f"At most {Config.QUOTE_MAX_DAYS} days can be quoted at once", status=400)
+
+        # Cars are picked by a comma separated car_ids and/or car_slugs
+        try:
+            car_ids = [int(id) for id in split_list(request.args.get("car_ids"))]
+        except ValueError:
+            return ResponseHandler.error(message="car_ids must be a comma separated list of ids", status=400)
+        car_slugs = split_list(request.args.get("car_slugs"))
+
+        if not car_ids and not car_slugs:
+            return ResponseHandler.error(message="car_ids or car_slugs is required", status=400)
+        if len(car_ids) + len(car_slugs) > Config.QUOTE_MAX_CARS:
+            return ResponseHandler.error(message=f"At most {Config.QUOTE_MAX_CARS} cars can be quoted at once", status=400)
+
+        with_driver = request.args.get("with_driver", default="false", type=str).lower() == "true"
+
+        # One query for every car, one pricing pass for their prices
+        cars = (
+            CarModel.query.with_entities(CarModel.id, CarModel.slug, CarModel.price, CarModel.status)
+            .filter((CarModel.id.in_(car_ids)) | (CarModel.slug.in_(car_slugs)))
+            .order_by(CarModel.id)
+            .all()
+        )
+        quote = pricing.quote([car.price for car in cars], start_date, end_date, with_driver)
+
+        quotes = [
+            {
+                "car_id": car.id,
+                "slug": car.slug,
+                "status": car.status,
+                "daily_price": float(car.price),
+                "base": float(quote["base"][index]),
+                "discount": float(quote["discount"][index]),
+                "driver": float(quote["driver"][index]),
+                "total": float(quote["total"][index]),
+            }
+            for index, car in enumerate(cars)
+        ]
+        found_ids = {car.id for car in cars}
+        found_slugs = {car.slug for car in cars}
+
+        return ResponseHandler.success(
+            data={
+                "start_date": start_date.isoformat(),
+                "end_date": end_date.isoformat(),
+                "days": quote["days"],
+                "with_driver": with_driver,
+                "quotes": quotes,
+                "not_found": {
+                    "car_ids": [id for id in car_ids if id not in found_ids],
+                    "car_slugs": [slug for slug in car_slugs if slug not in found_slugs],
+                },
+            },
+            status=200,
+        )
+
+    except Exception as e:
+        return ResponseHandler.error(
+            message="An error occured while quoting cars",
+            data=str(e),
+            status=500,
+        )
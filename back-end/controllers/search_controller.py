@@ -0,0 +1,42 @@
+from flask import Blueprint, request
+from flask_cors import cross_origin
+from flask_jwt_extended import jwt_required
+from utils.handle_response import ResponseHandler
+from utils.search_index import search_index
+
+search_blueprint = Blueprint("search_blueprint", __name__)
+
+SEARCH_KINDS = ["car", "category", "driver"]
+
+
+@search_blueprint.get("/search")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+def search():
+    try:
+        query = request.args.get("q", default="", type=str).strip()
+        limit = request.args.get("limit", default=20, type=int)
+        kinds = request.args.get("type", default=None, type=str)
+
+        if not query:
+            return ResponseHandler.error(message="Search query is required", status=400)
+
+        # Optional comma separated filter on the result kinds, e.g. type=car,driver
+        if kinds:
+            kinds = [kind.strip() for kind in kinds.split(",") if kind.strip()]
+            invalid_kinds = [kind for kind in kinds if kind not in SEARCH_KINDS]
+            if invalid_kinds:
+                return ResponseHandler.error(
+                    message="Invalid search type!", data={"allowed": SEARCH_KINDS, "invalid": invalid_kinds}, status=400
+                )
+
+        results = search_index.search(query, kinds=kinds, limit=max(1, min(limit, 100)))
+
+        return ResponseHandler.success(data={"query": query, "results": results}, status=200)
+
+    except Exception as e:
+        return ResponseHandler.error(
+            message="An error occured while searching",
+            data=str(e),
+            status=500,
+        )
@@ -0,0 +1,81 @@
+from flask import Blueprint, request
+from flask_cors import cross_origin
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from sqlalchemy.orm import sessionmaker, selectinload
+from connector.mysql_connector import connection
+from models.cars import CarModel
+from models.car_categories import CarCategoryModel
+from models.deletion_log import DeletionLogModel
+from models.drivers import DriverModel
+from models.transactions import TransactionModel
+from utils.handle_response import ResponseHandler
+from utils.sync import sync_page, CursorError, SYNC_MAX_LIMIT
+
+sync_blueprint = Blueprint("sync_blueprint", __name__)
+
+
+def sync_response(entity, build_query, deletion_filters=lambda user_id: ()):
+    Session = sessionmaker(bind=connection)
+    s = Session()
+
+    try:
+        user_id = int(get_jwt_identity())
+        since = request.args.get("since", default=None, type=str)
+        limit = max(1, min(request.args.get("limit", default=500, type=int), SYNC_MAX_LIMIT))
+        model, query = build_query(s, user_id)
+
+        try:
+            page = sync_page(s, query, model, entity, since, limit, deletion_filters(user_id))
+        except CursorError as e:
+            return ResponseHandler.error(message=e.message, status=e.status)
+
+        return ResponseHandler.success(data=page, status=200)
+
+    except Exception as e:
+        return ResponseHandler.error(
+            message=f"An error occured while syncing {entity}",
+            data=str(e),
+            status=500,
+        )
+
+    finally:
+        s.close()
+
+
+@sync_blueprint.get("/sync/cars")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Cars changed or deleted since the cursor
+def sync_cars():
+    return sync_response(
+        "cars",
+        lambda s, user_id: (CarModel, s.query(CarModel).options(selectinload(CarModel.additional_images))),
+    )
+
+
+@sync_blueprint.get("/sync/drivers")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Drivers changed or deleted since the cursor
+def sync_drivers():
+    return sync_response("drivers", lambda s, user_id: (DriverModel, s.query(DriverModel)))
+
+
+@sync_blueprint.get("/sync/categories")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Car categories changed or deleted since the cursor
+def sync_categories():
+    return sync_response("categories", lambda s, user_id: (CarCategoryModel, s.query(CarCategoryModel)))
+
+
+@sync_blueprint.get("/sync/transactions")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# The caller's own transactions changed or deleted since the cursor
+def sync_transactions():
+    return sync_response(
+        "transactions",
+        lambda s, user_id: (TransactionModel, s.query(TransactionModel).filter(TransactionModel.user_id == user_id)),
+        lambda user_id: (DeletionLogModel.user_id == user_id,),
+    )
@@ -9,34 +9,63 @@ from models.cars import CarModel
 from models.car_categories import CarCategoryModel
 from models.drivers import DriverModel
 from models.transactions import TransactionModel
+from models.overdue_rentals import OverdueRentalModel
+from models.transactions_archive import TransactionArchiveModel
 from sqlalchemy.orm import sessionmaker
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from cerberus import Validator
 from schemas.transactions_schema import (
     add_transaction_schema,
     validating_payment_schema,
+    bulk_validating_payment_schema,
     return_car_schema,
     generate_report_schema,
 )
 from utils.handle_response import ResponseHandler
-import os
-import cloudinary
-import cloudinary.uploader
+from utils.cache import cache
+from utils.authorization import admin_required
+from utils.conditional import conditional, latest
+from utils.uploads import upload_pipeline, read_files, UploadError
+from utils.images import image_processor, ImageProcessingError, PAYMENT_PROOF_VARIANTS
+from utils.image_cleanup import enqueue_image_deletions
+from utils.resolvers import resolve_car, resolve_driver, ResolveError
+from utils.driver_schedule import is_driver_free, assign_driver
+from utils.pricing import pricing
+from utils.statuses import RENTAL_STATUSES, PAYMENT_STATUSES
+from utils.transaction_states import transition, on_transition, TransitionError
+from utils.booking_holds import hold_expiry, expire_holds, release_if_expired
+from utils.bulk import bulk_items
+from utils.idempotency import idempotency
+from utils.outbox import record
+from utils.archive import rentals_ending_between
 from sqlalchemy import or_, and_, func
 from datetime import datetime, timedelta
 
 transactions_blueprint = Blueprint("transactions_blueprint", __name__)
 
-cloudinary.config(
-    cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
-    api_key=os.getenv("CLOUDINARY_API_KEY"),
-    api_secret=os.getenv("CLOUDINARY_API_SECRET"),
-)
+
+def match_statuses(text, statuses):
+    text = text.lower()
+    return [status for status in statuses if text in status.lower()]
+
+
+@on_transition
+def invalidate_booking_cache(transition_event):
+    # Bookings change the car & driver status shown in the catalog
+    cache.invalidate("cars:list", f"car:{transition_event['car_slug']}")
+    if transition_event["driver_id"]:
+        cache.invalidate("drivers:list", f"driver:{transition_event['driver_id']}")
+    if transition_event["event"] == "return":
+        cache.invalidate("transactions:overdue")
+    if transition_event["event"] in ("approve_payment", "return"):
+        # A paid rental counts as rented days, a return may shorten it
+        cache.invalidate("analytics:utilization")
 
 
 @transactions_blueprint.post("/transactions")
-@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization", "Idempotency-Key"])
 @jwt_required()
+@idempotency.idempotent
 def create_transaction():
     Session = sessionmaker(bind=connection)
     s = Session()
@@ -53,8 +82,6 @@ def create_transaction():
         if not validator.validate(data):
             return ResponseHandler.error(message="Data Invalid!", data=validator.errors, status=400)
 
-        car_name = data.get("car_name")
-        driver_name = data.get("driver_name", None)  # Use None if driver is not selected
         start_date_string = data.get("start_date")
         end_date_string = data.get("end_date")
 
@@ -65,31 +92,33 @@ def create_transaction():
         if end_date <= start_date:
             return ResponseHandler.error(message="End date must be greater than start date", status=400)
 
-        # Calculate rent duration
-        date_difference = end_date - start_date
-        rent_duration = date_difference.days
-        driver_cost = 0
-
-        existing_car = s.query(CarModel).filter(CarModel.name == car_name).first()
-        if not existing_car:
-            return ResponseHandler.error(message="Car not found!", status=404)
+        try:
+            existing_car = resolve_car(s, data.get("car_id"), data.get("car_slug"), data.get("car_name"))
+        except ResolveError as e:
+            return ResponseHandler.error(message=e.message, data=e.candidates, status=e.status)
+        # A booking whose hold ran out may still mark the car booked until the next sweep
+        if existing_car.status == "Booked" and expire_holds(s, TransactionModel.car_id == existing_car.id):
+            s.refresh(existing_car)
         if existing_car.status != "Available":
             return ResponseHandler.error(message="Car is not available!", status=404)
 
         # Check if the user want to use driver or not
         existing_driver = None
-        if "driver_name" in data:
-            existing_driver = s.query(DriverModel).filter(DriverModel.name == driver_name).first()
+        if "driver_id" in data or "driver_name" in data:
+            try:
+                existing_driver = resolve_driver(s, data.get("driver_id"), data.get("driver_name"))
+            except ResolveError as e:
+                return ResponseHandler.error(message=e.message, data=e.candidates, status=e.status)
+            if not is_driver_free(s, existing_driver, start_date.date(), end_date.date()):
+                return ResponseHandler.error(message="Driver is not available for these dates!", status=409)
+        elif data.get("auto_assign_driver"):
+            existing_driver = assign_driver(s, start_date.date(), end_date.date())
             if not existing_driver:
-                return ResponseHandler.error(message="Driver not found!", status=404)
-            if existing_driver.status != "Available":
-                return ResponseHandler.error(message="Driver is not available!", status=404)
+                return ResponseHandler.error(message="No driver is free for these dates", status=409)
 
-            # Calculate driver cost
-            driver_cost = 100000 * rent_duration
-
-        # Calculate total cost for transaction
-        total_cost = (existing_car.price * rent_duration) + driver_cost
+        # Calculate total cost for transaction, the same pricing GET /quotes shows
+        quote = pricing.quote_one(existing_car.price, start_date.date(), end_date.date(), with_driver=bool(existing_driver))
+        total_cost = quote["total"]
 
         # Create the transaction
         new_transaction = TransactionModel(
@@ -99,18 +128,15 @@ def create_transaction():
             start_date=start_date,
             end_date=end_date,
             return_date=None,
-            rental_status="Pending",
-            payment_status="Pending",
             payment_proof=None,
             late_fee=None,
             total_cost=total_cost,
+            hold_expires_at=hold_expiry(),
         )
         new_transaction.generate_invoice()
 
-        # Update car status to booked & Driver status if using driver
-        existing_car.status = "Booked"
-        if existing_driver:
-            existing_driver.status = "Booked"
+        # Pending transaction & booked car, the driver is held by the transaction's dates
+        transition(s, new_transaction, "book", existing_car)
 
         s.add(new_transaction)
         s.commit()
@@ -148,10 +174,11 @@ def show_customer_transaction():
         page = request.args.get("page", default=1, type=int)
         per_page = request.args.get("per_page", default=5, type=int)
 
+        # Archived rentals are listed on their own with archived=true, the default history reads the live table only
+        model = TransactionArchiveModel if request.args.get("archived", "false").lower() == "true" else TransactionModel
+
         # Check the transactions belongs to the current user
-        transactions = TransactionModel.query.filter_by(user_id=user_id).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        transactions = model.query.filter_by(user_id=user_id).paginate(page=page, per_page=per_page, error_out=False)
         if not transactions:
             return ResponseHandler.error(message="No transactions found", status=404)
 
@@ -179,9 +206,7 @@ def show_customer_transaction():
             # Append datas into transactions_data
             transactions_data.append(
                 {
-                    **{
-                        column.name: getattr(transaction, column.name) for column in TransactionModel.__table__.columns
-                    },
+                    **{column.name: getattr(transaction, column.name) for column in model.__table__.columns},
                     "car_data": car_data,
                     "driver_data": driver_data,
                 }
@@ -233,12 +258,15 @@ def show_all_transaction():
 
         query = TransactionModel.query
 
-        # Apply search filters
+        # Apply search filters, matched against the known statuses so the
+        # database compares exact values instead of scanning with LIKE
         if rental_status:
-            query = query.filter(TransactionModel.rental_status.ilike(f"%{rental_status}%"))
+            query = query.filter(TransactionModel.rental_status.in_(match_statuses(rental_status, RENTAL_STATUSES)))
 
         if payment_status:
-            query = query.filter(TransactionModel.payment_status.ilike(f"%{payment_status}%"))
+            query = query.filter(
+                TransactionModel.payment_status.in_(match_statuses(payment_status, PAYMENT_STATUSES))
+            )
 
         transactions = query.paginate(page=page, per_page=per_page, error_out=False)
         if not transactions:
@@ -301,9 +329,78 @@ def show_all_transaction():
         )
 
 
+def transaction_fingerprint(transaction_id):
+    # The transaction detail also renders its car, category & driver
+    result = (
+        TransactionModel.query.join(CarModel, CarModel.id == TransactionModel.car_id)
+        .join(CarCategoryModel, CarCategoryModel.id == CarModel.category_id)
+        .outerjoin(DriverModel, DriverModel.id == TransactionModel.driver_id)
+        .with_entities(
+            TransactionModel.updated_at,
+            CarModel.updated_at,
+            CarCategoryModel.updated_at,
+            DriverModel.updated_at,
+        )
+        .filter(TransactionModel.id == transaction_id)
+        .first()
+    )
+    if not result:
+        return None
+    return latest(*result), transaction_id
+
+
+@transactions_blueprint.get("/transactions/overdue")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+@admin_required
+@cache.cached(tags=["transactions:overdue"])
+# Only admin can show the overdue rentals, read from the projection the overdue job keeps
+def show_overdue_transactions():
+    try:
+        page = request.args.get("page", default=1, type=int)
+        per_page = request.args.get("per_page", default=20, type=int)
+
+        # Most overdue first
+        overdue_rentals = OverdueRentalModel.query.order_by(
+            OverdueRentalModel.days_late.desc(), OverdueRentalModel.transaction_id
+        ).paginate(page=page, per_page=per_page, error_out=False)
+
+        total, accrued_late_fees, refreshed_at = OverdueRentalModel.query.with_entities(
+            func.count(OverdueRentalModel.transaction_id),
+            func.coalesce(func.sum(OverdueRentalModel.accrued_late_fee), 0),
+            func.max(OverdueRentalModel.refreshed_at),
+        ).one()
+
+        response_data = {
+            "overdue_rentals": [overdue_rental.to_dictionaries() for overdue_rental in overdue_rentals],
+            "summary": {
+                "total_overdue": total,
+                "accrued_late_fees": float(accrued_late_fees),
+                "refreshed_at": refreshed_at,
+            },
+            "pagination": {
+                "total_overdue": overdue_rentals.total,
+                "current_page": overdue_rentals.page,
+                "total_pages": overdue_rentals.pages,
+                "next_page": page + 1 if page < overdue_rentals.pages else None,
+                "prev_page": page - 1 if page > 1 else None,
+            },
+        }
+
+        return ResponseHandler.success(data=response_data, status=200)
+
+    except Exception as e:
+        return ResponseHandler.error(
+            message="An error occured while showing overdue transactions",
+            data=str(e),
+            status=500,
+        )
+
+
 @transactions_blueprint.get("/transactions/<int:transaction_id>")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
+@conditional(transaction_fingerprint)
 def show_transaction_by_id(transaction_id):
     user_id = get_jwt_identity()
     try:
@@ -311,7 +408,12 @@ def show_transaction_by_id(transaction_id):
         if not current_user:
             return ResponseHandler.error(message="User not found", status=404)
 
+        # Archived rentals keep their id, looked up only when the transaction isn't live anymore
         transaction = TransactionModel.query.filter_by(id=transaction_id).first()
+        model = TransactionModel
+        if not transaction:
+            transaction = TransactionArchiveModel.query.filter_by(id=transaction_id).first()
+            model = TransactionArchiveModel
         if not transaction:
             return ResponseHandler.error(message="No transactions found", status=404)
 
@@ -334,7 +436,7 @@ def show_transaction_by_id(transaction_id):
             driver_data = {"driver_name": driver_info.name, "driver_phone_number": driver_info.phone_number}
 
         transaction_data = {
-            **{column.name: getattr(transaction, column.name) for column in TransactionModel.__table__.columns},
+            **{column.name: getattr(transaction, column.name) for column in model.__table__.columns},
             "car_data": car_data,
             "driver_data": driver_data,
         }
@@ -350,8 +452,9 @@ def show_transaction_by_id(transaction_id):
 
 
 @transactions_blueprint.put("/transactions/upload-payment-proof/<int:transaction_id>")
-@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization", "Idempotency-Key"])
 @jwt_required()
+@idempotency.idempotent
 # Upload payment proof for customer only
 def upload_payment(transaction_id):
     Session = sessionmaker(bind=connection)
@@ -377,19 +480,60 @@ def upload_payment(transaction_id):
         if transaction.payment_proof not in [None, ""]:
             return ResponseHandler.error(message="Payment Proof is uploaded!", status=400)
 
+        # Check if the booking still holds the car
+        if release_if_expired(s, transaction):
+            s.commit()
+            return ResponseHandler.error(message="The booking expired before it was paid, please book again", status=409)
+        if transaction.rental_status != "Pending":
+            return ResponseHandler.error(message="Only a pending booking can be paid!", status=409)
+
         # Get the uploaded files from the request
         files = request.files.getlist("payment_proof_image")
         if not files:
             return ResponseHandler.error(message="Payment Proof Image is required", status=400)
 
-        image_urls = []
+        # End the read transaction, it must not stay open while we process & upload the proof
+        s.rollback()
 
-        for file in files:
-            upload_result = cloudinary.uploader.upload(file)
-            image_url = upload_result["secure_url"]
-            image_urls.append(image_url)
+        # Only the first file is kept as the payment proof
+        try:
+            processed_images = image_processor.process_many(read_files(files[:1]), PAYMENT_PROOF_VARIANTS)
+        except ImageProcessingError as e:
+            return ResponseHandler.error(message=f"{e.filename} is not a valid image", status=400)
 
+        try:
+            image_urls = upload_pipeline.upload_many([image["full"] for image in processed_images])
+        except UploadError as e:
+            # Queue the files that did upload, nothing will reference them
+            s.begin()
+            enqueue_image_deletions(s, e.urls)
+            s.commit()
+            return ResponseHandler.error(message="Failed to upload the payment proof", data=e.errors, status=502)
+
+        s.begin()
+        transaction = s.query(TransactionModel).filter_by(id=transaction_id, user_id=user_id).first()
+        if not transaction:
+            # Archived or deleted while we uploaded
+            enqueue_image_deletions(s, image_urls)
+            s.commit()
+            return ResponseHandler.error(message="Transaction not found or belongs to other users!", status=404)
+
+        if transaction.payment_proof not in [None, ""]:
+            # Another request uploaded a proof meanwhile, ours is not needed
+            enqueue_image_deletions(s, image_urls)
+            s.commit()
+            return ResponseHandler.error(message="Payment Proof is uploaded!", status=400)
+
+        if release_if_expired(s, transaction) or transaction.rental_status != "Pending":
+            # The hold expired while we uploaded
+            enqueue_image_deletions(s, image_urls)
+            s.commit()
+            return ResponseHandler.error(message="The booking expired before it was paid, please book again", status=409)
+
+        # A paid booking waits for the admin's validation without expiring
         transaction.payment_proof = image_urls[0]
+        transaction.hold_expires_at = None
+        record(s, "transaction", transaction, "transaction.payment_proof_uploaded", {"payment_proof": image_urls[0]})
         s.commit()
 
         return ResponseHandler.success(
@@ -429,8 +573,8 @@ def payment_validation(transaction_id):
         if current_user.role_id != 1:
             return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
 
-        # Check transaction's data in database
-        transaction = s.query(TransactionModel).filter_by(id=transaction_id).first()
+        # Check transaction's data in database, locked so the hold sweeper can't expire it meanwhile
+        transaction = s.query(TransactionModel).filter_by(id=transaction_id).with_for_update().first()
         if not transaction:
             return ResponseHandler.error(message="Transaction not found!", status=404)
 
@@ -441,25 +585,10 @@ def payment_validation(transaction_id):
 
         rental_status = data.get("rental_status")
 
-        if rental_status == "Valid":
-            if transaction.driver_id not in [None, ""]:
-                driver = s.query(DriverModel).filter_by(id=transaction.driver_id).first()
-                driver.status = "Rented"
-
-            car = s.query(CarModel).filter_by(id=transaction.car_id).first()
-            car.status = "Rented"
-            transaction.payment_status = "Success"
-            transaction.rental_status = "In Progress"
-
-        elif rental_status == "Invalid":
-            if transaction.driver_id not in [None, ""]:
-                driver = s.query(DriverModel).filter_by(id=transaction.driver_id).first()
-                driver.status = "Available"
-
-            car = s.query(CarModel).filter_by(id=transaction.car_id).first()
-            car.status = "Available"
-            transaction.payment_status = "Invalid"
-            transaction.rental_status = "Canceled"
+        try:
+            transition(s, transaction, "approve_payment" if rental_status == "Valid" else "reject_payment")
+        except TransitionError as e:
+            return ResponseHandler.error(message=e.message, status=e.status)
 
         s.commit()
 
@@ -481,6 +610,101 @@ def payment_validation(transaction_id):
         s.close()
 
 
+@transactions_blueprint.put("/transactions/payment-proof-validation")
+@cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
+@jwt_required()
+# Only admin can validate the payment proofs, many at once
+def bulk_payment_validation():
+    Session = sessionmaker(bind=connection)
+    s = Session()
+    s.begin()
+
+    try:
+        user_id = get_jwt_identity()
+        current_user = s.query(UserModel).filter_by(id=user_id).first()
+        if not current_user:
+            return ResponseHandler.error(message="User not found", status=404)
+
+        # Check if the current user's role is "admin"
+        if current_user.role_id != 1:
+            return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
+
+        items, message = bulk_items(request.get_json(silent=True))
+        if message:
+            return ResponseHandler.error(message=message, status=400)
+
+        results = [{"index": index, "id": None, "success": False, "errors": {}} for index in range(len(items))]
+
+        validator = Validator(bulk_validating_payment_schema)
+        valid_items = {}
+        for index, item in enumerate(items):
+            if validator.validate(item):
+                valid_items[index] = item
+            else:
+                results[index]["errors"] = validator.errors
+
+        # Load the transactions & their cars with one query each, the transactions
+        # are locked so another validation or the hold sweeper can't change them meanwhile
+        ids = [data["id"] for data in valid_items.values()]
+        transactions = (
+            {
+                transaction.id: transaction
+                for transaction in s.query(TransactionModel).filter(TransactionModel.id.in_(ids)).with_for_update()
+            }
+            if ids
+            else {}
+        )
+        car_ids = {transaction.car_id for transaction in transactions.values()}
+        cars = {car.id: car for car in s.query(CarModel).filter(CarModel.id.in_(car_ids))} if car_ids else {}
+
+        validated = set()
+        for index, data in valid_items.items():
+            result = results[index]
+            result["id"] = data["id"]
+            transaction = transactions.get(data["id"])
+            if not transaction:
+                result["errors"] = {"transaction": ["Transaction not found"]}
+                continue
+            if transaction.id in validated:
+                result["errors"] = {"transaction": ["Transaction is already validated by another item"]}
+                continue
+
+            name = "approve_payment" if data["rental_status"] == "Valid" else "reject_payment"
+            try:
+                transition(s, transaction, name, cars[transaction.car_id])
+            except TransitionError as e:
+                result["errors"] = {"rental_status": [e.message]}
+                continue
+
+            validated.add(transaction.id)
+            result["success"] = True
+            result["rental_status"] = transaction.rental_status
+            result["payment_status"] = transaction.payment_status
+
+        s.commit()
+
+        failed = len(items) - len(validated)
+        if not validated:
+            return ResponseHandler.error(message="No payment proof was validated", data=results, status=400)
+
+        return ResponseHandler.success(
+            message=f"{len(validated)} payment proof(s) validated, {failed} failed",
+            data=results,
+            status=207 if failed else 200,
+        )
+
+    except Exception as e:
+        s.rollback()
+        return ResponseHandler.error(
+            message="An error occurred while validating the payment proofs",
+            data=str(e),
+            status=500,
+        )
+
+    finally:
+        s.close()
+
+
 @transactions_blueprint.put("/transactions/return-car/<int:transaction_id>")
 @cross_origin(origin="localhost", headers=["Content-Type", "Authorization"])
 @jwt_required()
@@ -500,18 +724,13 @@ def return_car(transaction_id):
         if current_user.role_id != 2:
             return ResponseHandler.error(message="Unauthorized access, only customer can access this!", status=403)
 
-        # Check transaction's data in database
-        transaction = s.query(TransactionModel).filter_by(id=transaction_id, user_id=user_id).first()
+        # Check transaction's data in database, locked so the hold sweeper can't change it meanwhile
+        transaction = (
+            s.query(TransactionModel).filter_by(id=transaction_id, user_id=user_id).with_for_update().first()
+        )
         if not transaction:
             return ResponseHandler.error(message="Transaction not found or belongs to other users!", status=404)
 
-        if transaction.driver_id not in [None, ""]:
-            driver = s.query(DriverModel).filter_by(id=transaction.driver_id).first()
-            driver.status = "Available"
-
-        car = s.query(CarModel).filter_by(id=transaction.car_id).first()
-        car.status = "Available"
-
         data = request.get_json()
         validator = Validator(return_car_schema)
         if not validator.validate(data):
@@ -529,15 +748,24 @@ def return_car(transaction_id):
             # Calculate days late & late_fee cost
             date_difference = return_date - end_date
             day_late = date_difference.days
-            transaction.late_fee = 200000 * day_late
+            transaction.late_fee = pricing.late_fee(day_late)
             transaction.total_cost += transaction.late_fee
-            transaction.rental_status = "Success"
 
         elif return_date < end_date or return_date == end_date:
             transaction.late_fee = 0
-            transaction.rental_status = "Success"
+
+        # Completes the rental & frees the car
+        try:
+            returned = transition(s, transaction, "return")
+        except TransitionError as e:
+            return ResponseHandler.error(message=e.message, status=e.status)
+        s.query(OverdueRentalModel).filter_by(transaction_id=transaction.id).delete()
 
         transaction.return_date = return_date
+        # The outbox & the subscribers get the settled amounts with the event
+        returned.update(
+            return_date=return_date.isoformat(), late_fee=transaction.late_fee, total_cost=transaction.total_cost
+        )
         s.commit()
 
         return ResponseHandler.success(
@@ -610,16 +838,13 @@ def generate_report():
                 status=400,
             )
 
-        # Query transactions within the date range
-        transactions = (
-            s.query(TransactionModel)
-            .filter(
-                TransactionModel.end_date >= start_date,
-                TransactionModel.end_date <= end_date,
-                TransactionModel.rental_status == "Success",
-            )
-            .order_by(TransactionModel.end_date)
-            .all()
+        # Query transactions within the date range, archived ones too when the range reaches back to them
+        transactions = rentals_ending_between(
+            s,
+            start_date,
+            end_date,
+            ["id", "user_id", "invoice", "total_cost", "end_date"],
+            rental_status="Success",
         )
 
         if not transactions:
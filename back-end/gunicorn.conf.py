@@ -0,0 +1,28 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Event streams stay open for as long as a page is, a gevent worker holds each one
+# in a greenlet instead of a thread, so thousands of idle streams fit in one worker:
+#   gunicorn "app:create_app()"
+#
+# The gevent worker serves every route, not only the streams. Blocking calls are
+# patched to yield, so a request waiting on MySQL, storage or the image processing
+# pool (utils/images.py, a ProcessPoolExecutor of IMAGE_PROCESS_WORKERS processes)
+# lets the worker's other requests run, but CPU bound code in a request blocks them
+# all, which is why resizing stays in the process pool.
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+# The response cache, its locks & the event bus live in the process without
+# CACHE_REDIS_URL, a second worker would invalidate, lock & stream on its own
+redis_url = os.getenv("CACHE_REDIS_URL")
+workers = int(os.getenv("GUNICORN_WORKERS", 2 if redis_url else 1))
+if workers > 1 and not redis_url:
+    raise RuntimeError("GUNICORN_WORKERS > 1 needs CACHE_REDIS_URL, the workers share their state through Redis")
+
+worker_class = "gevent"
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 5000))
+# Streams send a keep-alive every EVENTS_HEARTBEAT_SECONDS, so an open stream never looks idle
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+keepalive = 75
@@ -6,3 +6,11 @@ from models.car_maintenances import CarMaintenanceModel
 from models.drivers import DriverModel
 from models.transactions import TransactionModel
 from models.car_images import CarImageModel
+from models.image_deletions import ImageDeletionModel
+from models.car_slug_sequences import CarSlugSequenceModel
+from models.overdue_rentals import OverdueRentalModel
+from models.deletion_log import DeletionLogModel
+from models.outbox_events import OutboxEventModel
+from models.transactions_archive import TransactionArchiveModel
+from models.calendar import CalendarModel
+from models.import_reports import ImportReportModel
@@ -0,0 +1,24 @@
+from db import db
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import Integer, Date
+from datetime import date
+
+# The migration fills the calendar with every day of this span
+CALENDAR_START = date(2000, 1, 1)
+CALENDAR_END = date(2099, 12, 31)
+
+
+class CalendarModel(db.Model):
+    """One row per day, day_number counts the days since CALENDAR_START.
+
+    Joining a date to its day_number turns date spans into integer
+    arithmetic, the same SQL runs on every database.
+    """
+
+    __tablename__ = "calendar"
+
+    day = mapped_column(Date, primary_key=True)
+    day_number = mapped_column(Integer, unique=True, nullable=False)
+
+    def __repr__(self):
+        return f"<Calendar {self.day}>"
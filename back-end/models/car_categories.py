@@ -1,6 +1,6 @@
 from db import db
 from sqlalchemy.orm import mapped_column, relationship
-from sqlalchemy import String, Integer, DateTime
+from sqlalchemy import String, Integer, DateTime, Index
 from datetime import datetime, timedelta
 
 
@@ -10,6 +10,8 @@ def gmt_plus_7_now():
 
 class CarCategoryModel(db.Model):
     __tablename__ = "car_categories"
+    # Delta sync reads the rows changed after a (updated_at, id) cursor
+    __table_args__ = (Index("ix_car_categories_updated_at_id", "updated_at", "id"),)
 
     id = mapped_column(Integer, primary_key=True)
     car_brand = mapped_column(String(255), nullable=False)
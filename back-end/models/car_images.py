@@ -14,6 +14,8 @@ class CarImageModel(db.Model):
     id = mapped_column(Integer, primary_key=True)
     car_id = mapped_column(Integer, ForeignKey("cars.id"), nullable=False)
     url = mapped_column(String(255), nullable=False)
+    thumbnail_url = mapped_column(String(255), nullable=True)
+    card_url = mapped_column(String(255), nullable=True)
     created_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
     updated_at = mapped_column(DateTime, default=gmt_plus_7_now, onupdate=gmt_plus_7_now, nullable=False)
 
@@ -21,4 +23,4 @@ class CarImageModel(db.Model):
         return f"<CarImage {self.id} for Car {self.car_id}>"
 
     def to_dictionaries(self):
-        return {"id": self.id, "url": self.url}
+        return {"id": self.id, "url": self.url, "thumbnail_url": self.thumbnail_url, "card_url": self.card_url}
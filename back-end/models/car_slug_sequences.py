@@ -0,0 +1,15 @@
+from db import db
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, Integer
+
+
+class CarSlugSequenceModel(db.Model):
+    """Last slug number handed out for every slug base, e.g. "toyota-avanza" -> 1003."""
+
+    __tablename__ = "car_slug_sequences"
+
+    base = mapped_column(String(255), primary_key=True)
+    last_value = mapped_column(Integer, nullable=False)
+
+    def __repr__(self):
+        return f"<CarSlugSequence {self.base}>"
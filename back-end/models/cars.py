@@ -1,9 +1,8 @@
 from db import db
 from sqlalchemy.orm import mapped_column, relationship
-from sqlalchemy import String, Integer, DateTime, ForeignKey, DECIMAL
+from sqlalchemy import String, Integer, DateTime, ForeignKey, DECIMAL, Enum, Index
 from datetime import datetime, timedelta
-from slugify import slugify
-import random
+from utils.statuses import CAR_STATUSES
 
 
 def gmt_plus_7_now():
@@ -12,11 +11,13 @@ def gmt_plus_7_now():
 
 class CarModel(db.Model):
     __tablename__ = "cars"
+    # Delta sync reads the rows changed after a (updated_at, id) cursor
+    __table_args__ = (Index("ix_cars_updated_at_id", "updated_at", "id"),)
 
     id = mapped_column(Integer, primary_key=True)
     category_id = mapped_column(Integer, ForeignKey("car_categories.id"), unique=False, nullable=False)
     slug = mapped_column(String(255), unique=True, nullable=False)
-    name = mapped_column(String(255), nullable=False)
+    name = mapped_column(String(255), nullable=False, index=True)
     transmission = mapped_column(String(255), nullable=False)
     fuel = mapped_column(String(255), nullable=False)
     color = mapped_column(String(255), nullable=False)
@@ -25,7 +26,9 @@ class CarModel(db.Model):
     registration_number = mapped_column(Integer, nullable=False)
     price = mapped_column(DECIMAL(10, 2), nullable=False)
     image = mapped_column(String(255), nullable=True)
-    status = mapped_column(String(255), nullable=False)
+    image_thumbnail = mapped_column(String(255), nullable=True)
+    image_card = mapped_column(String(255), nullable=True)
+    status = mapped_column(Enum(*CAR_STATUSES, name="car_status"), nullable=False)
     created_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
     updated_at = mapped_column(DateTime, default=gmt_plus_7_now, onupdate=gmt_plus_7_now, nullable=False)
 
@@ -51,6 +54,8 @@ class CarModel(db.Model):
             "registration_number": self.registration_number,
             "price": self.price,
             "image": self.image,
+            "image_thumbnail": self.image_thumbnail,
+            "image_card": self.image_card,
             "additional_images": [
                 img.to_dictionaries() for img in self.additional_images
             ],  # Include additional images
@@ -58,9 +63,3 @@ class CarModel(db.Model):
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
-
-    @staticmethod
-    def generate_slug(name):
-        slug_base = slugify(name)
-        unique_number = random.randint(100, 999)
-        return f"{slug_base}-{unique_number}"
@@ -0,0 +1,30 @@
+from db import db
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, Integer, DateTime, Index
+from datetime import datetime, timedelta
+
+
+def gmt_plus_7_now():
+    return datetime.utcnow() + timedelta(hours=7)
+
+
+class DeletionLogModel(db.Model):
+    """Tombstones of deleted rows, so sync clients learn what to drop from their copies."""
+
+    __tablename__ = "deletion_log"
+    __table_args__ = (Index("ix_deletion_log_entity_id", "entity", "id"),)
+
+    id = mapped_column(Integer, primary_key=True)
+    entity = mapped_column(String(50), nullable=False)
+    entity_id = mapped_column(Integer, nullable=False)
+    user_id = mapped_column(Integer, nullable=True)  # Owner of the row, for entities synced per user
+    deleted_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<DeletionLog {self.entity} {self.entity_id}>"
+
+    def to_dictionaries(self):
+        return {
+            "id": self.entity_id,
+            "deleted_at": self.deleted_at,
+        }
@@ -1,7 +1,8 @@
 from db import db
 from sqlalchemy.orm import mapped_column, relationship
-from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Numeric
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, Numeric, Enum, Index
 from datetime import datetime, timedelta
+from utils.statuses import DRIVER_STATUSES
 
 
 def gmt_plus_7_now():
@@ -10,15 +11,17 @@ def gmt_plus_7_now():
 
 class DriverModel(db.Model):
     __tablename__ = "drivers"
+    # Delta sync reads the rows changed after a (updated_at, id) cursor
+    __table_args__ = (Index("ix_drivers_updated_at_id", "updated_at", "id"),)
 
     id = mapped_column(Integer, primary_key=True)
-    name = mapped_column(String(255), nullable=False)
+    name = mapped_column(String(255), nullable=False, index=True)
     gender = mapped_column(String(255), nullable=False)
     dob = mapped_column(Date, nullable=False)
     address = mapped_column(String(255), nullable=False)
     phone_number = mapped_column(String(255), nullable=False)
     license_number = mapped_column(String(255), nullable=False)
-    status = mapped_column(String(255), nullable=False)
+    status = mapped_column(Enum(*DRIVER_STATUSES, name="driver_status"), nullable=False)
     created_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
     updated_at = mapped_column(DateTime, default=gmt_plus_7_now, onupdate=gmt_plus_7_now, nullable=False)
 
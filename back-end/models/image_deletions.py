@@ -0,0 +1,36 @@
+from db import db
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, Integer, DateTime, Index
+from datetime import datetime, timedelta
+
+
+def gmt_plus_7_now():
+    return datetime.utcnow() + timedelta(hours=7)
+
+
+class ImageDeletionModel(db.Model):
+    """Outbox of stored images waiting to be deleted by the image cleanup worker."""
+
+    __tablename__ = "image_deletions"
+    __table_args__ = (Index("ix_image_deletions_next_attempt_at", "next_attempt_at"),)
+
+    id = mapped_column(Integer, primary_key=True)
+    url = mapped_column(String(255), nullable=False, index=True)
+    attempts = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
+    last_error = mapped_column(String(255), nullable=True)
+    created_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
+    updated_at = mapped_column(DateTime, default=gmt_plus_7_now, onupdate=gmt_plus_7_now, nullable=False)
+
+    def __repr__(self):
+        return f"<ImageDeletion {self.id}>"
+
+    def to_dictionaries(self):
+        return {
+            "id": self.id,
+            "url": self.url,
+            "attempts": self.attempts,
+            "next_attempt_at": self.next_attempt_at,
+            "last_error": self.last_error,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,23 @@
+from db import db
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, DateTime, LargeBinary
+from datetime import datetime, timedelta
+
+
+def gmt_plus_7_now():
+    return datetime.utcnow() + timedelta(hours=7)
+
+
+class ImportReportModel(db.Model):
+    """Error reports of the car imports, kept until they expire so any worker can serve the download."""
+
+    __tablename__ = "import_reports"
+
+    id = mapped_column(String(32), primary_key=True)
+    # Up to 16 MB, a MEDIUMBLOB on MySQL
+    content = mapped_column(LargeBinary(length=16 * 1024 * 1024 - 1), nullable=False)
+    created_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
+    expires_at = mapped_column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<ImportReport {self.id}>"
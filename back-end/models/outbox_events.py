@@ -0,0 +1,50 @@
+from db import db
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, Integer, DateTime, JSON, Text, Index
+from datetime import datetime, timedelta
+
+
+def gmt_plus_7_now():
+    return datetime.utcnow() + timedelta(hours=7)
+
+
+class OutboxEventModel(db.Model):
+    """Append-only log of the state changes, written in the transaction making them.
+
+    The relay publishes the unpublished events in id order. Ids are assigned
+    when the rows are inserted by the before_commit hook, after the flush
+    locking the changed rows, so a later change to the same aggregate waits
+    for that commit and gets a larger id: the events of an aggregate are in
+    the order its changes committed.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        Index("ix_outbox_events_published_at_id", "published_at", "id"),
+        Index("ix_outbox_events_aggregate", "aggregate_type", "aggregate_id", "id"),
+    )
+
+    id = mapped_column(Integer, primary_key=True)
+    aggregate_type = mapped_column(String(50), nullable=False)
+    aggregate_id = mapped_column(Integer, nullable=False)
+    event_type = mapped_column(String(100), nullable=False)
+    payload = mapped_column(JSON, nullable=False)
+    actor_id = mapped_column(Integer, nullable=True)  # User whose request made the change, None for jobs
+    created_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
+    published_at = mapped_column(DateTime, nullable=True)
+    attempts = mapped_column(Integer, default=0, nullable=False)
+    last_error = mapped_column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<OutboxEvent {self.id} {self.event_type}>"
+
+    def to_dictionaries(self):
+        return {
+            "id": self.id,
+            "aggregate_type": self.aggregate_type,
+            "aggregate_id": self.aggregate_id,
+            "event_type": self.event_type,
+            "payload": self.payload,
+            "actor_id": self.actor_id,
+            "created_at": self.created_at,
+        }
@@ -0,0 +1,52 @@
+from db import db
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, DECIMAL
+from datetime import datetime, timedelta
+
+
+def gmt_plus_7_now():
+    return datetime.utcnow() + timedelta(hours=7)
+
+
+class OverdueRentalModel(db.Model):
+    """Projection of the in progress rentals past their end date, rebuilt by the overdue job.
+
+    The car & customer details are copied in, so the overdue list is read
+    from this table alone.
+    """
+
+    __tablename__ = "overdue_rentals"
+
+    transaction_id = mapped_column(Integer, ForeignKey("transactions.id"), primary_key=True)
+    invoice = mapped_column(String(255), nullable=False)
+    user_id = mapped_column(Integer, nullable=False)
+    customer_name = mapped_column(String(255), nullable=False)
+    customer_phone_number = mapped_column(String(255), nullable=True)
+    car_id = mapped_column(Integer, nullable=False)
+    car_slug = mapped_column(String(255), nullable=False)
+    car_name = mapped_column(String(255), nullable=False)
+    driver_id = mapped_column(Integer, nullable=True)
+    end_date = mapped_column(Date, nullable=False)
+    days_late = mapped_column(Integer, nullable=False, index=True)
+    accrued_late_fee = mapped_column(DECIMAL(10, 2), nullable=False)
+    refreshed_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
+
+    def __repr__(self):
+        return f"<OverdueRental {self.transaction_id}>"
+
+    def to_dictionaries(self):
+        return {
+            "transaction_id": self.transaction_id,
+            "invoice": self.invoice,
+            "user_id": self.user_id,
+            "customer_name": self.customer_name,
+            "customer_phone_number": self.customer_phone_number,
+            "car_id": self.car_id,
+            "car_slug": self.car_slug,
+            "car_name": self.car_name,
+            "driver_id": self.driver_id,
+            "end_date": self.end_date,
+            "days_late": self.days_late,
+            "accrued_late_fee": self.accrued_late_fee,
+            "refreshed_at": self.refreshed_at,
+        }
@@ -1,7 +1,8 @@
 from db import db
 from sqlalchemy.orm import mapped_column, relationship
-from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, DECIMAL
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, DECIMAL, Index, Enum
 from datetime import datetime, timedelta
+from utils.statuses import RENTAL_STATUSES, PAYMENT_STATUSES
 import random
 
 
@@ -11,6 +12,14 @@ def gmt_plus_7_now():
 
 class TransactionModel(db.Model):
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Driver schedule lookups, the bookings of a driver overlapping some dates
+        Index("ix_transactions_driver_id_start_date_end_date", "driver_id", "start_date", "end_date"),
+        # Overdue rentals, the in progress rentals that ended before a date
+        Index("ix_transactions_rental_status_end_date", "rental_status", "end_date"),
+        # Delta sync of a customer's transactions changed after a (updated_at, id) cursor
+        Index("ix_transactions_user_id_updated_at_id", "user_id", "updated_at", "id"),
+    )
 
     id = mapped_column(Integer, primary_key=True)
     user_id = mapped_column(Integer, ForeignKey("users.id"), unique=False, nullable=False)
@@ -20,11 +29,13 @@ class TransactionModel(db.Model):
     start_date = mapped_column(Date, nullable=False)
     end_date = mapped_column(Date, nullable=False)
     return_date = mapped_column(Date, nullable=True)
-    rental_status = mapped_column(String(255), nullable=False)
-    payment_status = mapped_column(String(255), nullable=False)
+    rental_status = mapped_column(Enum(*RENTAL_STATUSES, name="rental_status"), nullable=False)
+    payment_status = mapped_column(Enum(*PAYMENT_STATUSES, name="payment_status"), nullable=False)
     payment_proof = mapped_column(String(255), nullable=True)
     late_fee = mapped_column(DECIMAL(10, 2), nullable=True)
     total_cost = mapped_column(DECIMAL(10, 2), nullable=False)
+    # An unpaid booking holds its car & driver until then, cleared once a proof is uploaded
+    hold_expires_at = mapped_column(DateTime, nullable=True, index=True)
     created_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
     updated_at = mapped_column(DateTime, default=gmt_plus_7_now, onupdate=gmt_plus_7_now, nullable=False)
 
@@ -46,6 +57,7 @@ class TransactionModel(db.Model):
             "payment_proof": self.payment_proof,
             "late_fee": self.late_fee,
             "total_cost": self.total_cost,
+            "hold_expires_at": self.hold_expires_at,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
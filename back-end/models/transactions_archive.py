@@ -0,0 +1,65 @@
+from db import db
+from sqlalchemy.orm import mapped_column
+from sqlalchemy import String, Integer, Date, DateTime, ForeignKey, DECIMAL, Index, Enum
+from datetime import datetime, timedelta
+from utils.statuses import RENTAL_STATUSES, PAYMENT_STATUSES
+
+
+def gmt_plus_7_now():
+    return datetime.utcnow() + timedelta(hours=7)
+
+
+class TransactionArchiveModel(db.Model):
+    """Completed & canceled transactions moved out of transactions by the archiver.
+
+    The rows keep their transaction's id and columns, reports reaching back
+    past the archive boundary read both tables.
+    """
+
+    __tablename__ = "transactions_archive"
+    __table_args__ = (
+        # Customer history of archived rentals
+        Index("ix_transactions_archive_user_id_end_date", "user_id", "end_date"),
+    )
+
+    id = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    car_id = mapped_column(Integer, ForeignKey("cars.id"), nullable=False)
+    driver_id = mapped_column(Integer, ForeignKey("drivers.id"), nullable=True)
+    invoice = mapped_column(String(255), unique=True, nullable=False)
+    start_date = mapped_column(Date, nullable=False)
+    end_date = mapped_column(Date, nullable=False, index=True)
+    return_date = mapped_column(Date, nullable=True)
+    rental_status = mapped_column(Enum(*RENTAL_STATUSES, name="rental_status"), nullable=False)
+    payment_status = mapped_column(Enum(*PAYMENT_STATUSES, name="payment_status"), nullable=False)
+    payment_proof = mapped_column(String(255), nullable=True)
+    late_fee = mapped_column(DECIMAL(10, 2), nullable=True)
+    total_cost = mapped_column(DECIMAL(10, 2), nullable=False)
+    hold_expires_at = mapped_column(DateTime, nullable=True)
+    created_at = mapped_column(DateTime, nullable=False)
+    updated_at = mapped_column(DateTime, nullable=False)
+    archived_at = mapped_column(DateTime, default=gmt_plus_7_now, nullable=False)
+
+    def __repr__(self):
+        return f"<TransactionArchive {self.id}>"
+
+    def to_dictionaries(self):
+        return {
+            "id": self.id,
+            "user_id": self.user_id,
+            "car_id": self.car_id,
+            "driver_id": self.driver_id,
+            "invoice": self.invoice,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "return_date": self.return_date,
+            "rental_status": self.rental_status,
+            "payment_status": self.payment_status,
+            "payment_proof": self.payment_proof,
+            "late_fee": self.late_fee,
+            "total_cost": self.total_cost,
+            "hold_expires_at": self.hold_expires_at,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "archived_at": self.archived_at,
+        }
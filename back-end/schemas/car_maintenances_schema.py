@@ -9,15 +9,20 @@ def validate_date(field, value, error):
         error(field, "must be of date type")
 
 
+# The car is picked by car_id, car_slug or car_name
 add_maintenance_schema = {
-    "car_name": {"type": "string", "maxlength": 100, "required": True},
+    "car_id": {"type": "integer", "required": False, "excludes": ["car_slug", "car_name"]},
+    "car_slug": {"type": "string", "maxlength": 255, "required": False, "excludes": ["car_id", "car_name"]},
+    "car_name": {"type": "string", "maxlength": 100, "required": False, "excludes": ["car_id", "car_slug"]},
     "maintenance_date": {"type": "string", "maxlength": 50, "required": True, "check_with": validate_date},
     "description": {"type": "string", "maxlength": 50, "required": True},
     "cost": {"type": "float", "required": True},
 }
 
 update_maintenance_schema = {
-    "car_name": {"type": "string", "maxlength": 100, "required": False},
+    "car_id": {"type": "integer", "required": False, "excludes": ["car_slug", "car_name"]},
+    "car_slug": {"type": "string", "maxlength": 255, "required": False, "excludes": ["car_id", "car_name"]},
+    "car_name": {"type": "string", "maxlength": 100, "required": False, "excludes": ["car_id", "car_slug"]},
     "maintenance_date": {"type": "string", "maxlength": 50, "required": False, "check_with": validate_date},
     "description": {"type": "string", "maxlength": 50, "required": False},
     "cost": {"type": "float", "required": False},
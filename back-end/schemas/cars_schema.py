@@ -1,3 +1,5 @@
+from utils.statuses import CAR_STATUSES
+
 add_car_schema = {
     "car_brand": {"type": "string", "maxlength": 50, "required": True},
     "type": {"type": "string", "maxlength": 50, "required": True},
@@ -12,7 +14,7 @@ add_car_schema = {
     "status": {
         "type": "string",
         "maxlength": 50,
-        "allowed": ["Available", "Unavailable", "Rented", "Booked"],
+        "allowed": CAR_STATUSES,
         "required": True,
     },
 }
@@ -31,7 +33,14 @@ update_car_schema = {
     "status": {
         "type": "string",
         "maxlength": 50,
-        "allowed": ["Available", "Unavailable", "Rented", "Booked"],
+        "allowed": CAR_STATUSES,
         "required": False,
     },
 }
+
+# An item of PATCH /cars/bulk, the car is picked by its id or its slug
+bulk_update_car_schema = {
+    "id": {"type": "integer", "required": False, "excludes": "slug"},
+    "slug": {"type": "string", "maxlength": 255, "required": False, "excludes": "id"},
+    **update_car_schema,
+}
@@ -1,5 +1,6 @@
 from datetime import datetime
 from cerberus import Validator
+from utils.statuses import DRIVER_STATUSES
 
 
 def validate_date(field, value, error):
@@ -16,7 +17,7 @@ add_driver_schema = {
     "address": {"type": "string", "maxlength": 100, "required": True},
     "phone_number": {"type": "string", "maxlength": 100, "required": True},
     "license_number": {"type": "string", "maxlength": 100, "required": True},
-    "status": {"type": "string", "maxlength": 100, "allowed": ["Available", "Unavailable"], "required": True},
+    "status": {"type": "string", "maxlength": 100, "allowed": DRIVER_STATUSES, "required": True},
 }
 
 update_driver_schema = {
@@ -26,5 +27,11 @@ update_driver_schema = {
     "address": {"type": "string", "maxlength": 100, "required": False},
     "phone_number": {"type": "string", "maxlength": 100, "required": False},
     "license_number": {"type": "string", "maxlength": 100, "required": False},
-    "status": {"type": "string", "maxlength": 100, "allowed": ["Available", "Unavailable"], "required": False},
+    "status": {"type": "string", "maxlength": 100, "allowed": DRIVER_STATUSES, "required": False},
+}
+
+# An item of PATCH /drivers/bulk
+bulk_update_driver_schema = {
+    "id": {"type": "integer", "required": True},
+    **update_driver_schema,
 }
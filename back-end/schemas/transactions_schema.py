@@ -9,9 +9,15 @@ def validate_date(field, value, error):
         error(field, "must be of date type")
 
 
+# The car is picked by car_id, car_slug or car_name, the driver by driver_id or driver_name,
+# or auto_assign_driver picks the least loaded driver free on the dates
 add_transaction_schema = {
-    "car_name": {"type": "string", "maxlength": 100, "required": True},
-    "driver_name": {"type": "string", "maxlength": 100, "required": False},
+    "car_id": {"type": "integer", "required": False, "excludes": ["car_slug", "car_name"]},
+    "car_slug": {"type": "string", "maxlength": 255, "required": False, "excludes": ["car_id", "car_name"]},
+    "car_name": {"type": "string", "maxlength": 100, "required": False, "excludes": ["car_id", "car_slug"]},
+    "driver_id": {"type": "integer", "required": False, "excludes": ["driver_name", "auto_assign_driver"]},
+    "driver_name": {"type": "string", "maxlength": 100, "required": False, "excludes": ["driver_id", "auto_assign_driver"]},
+    "auto_assign_driver": {"type": "boolean", "required": False, "excludes": ["driver_id", "driver_name"]},
     "start_date": {"type": "string", "maxlength": 50, "required": True, "check_with": validate_date},
     "end_date": {
         "type": "string",
@@ -30,6 +36,12 @@ validating_payment_schema = {
     }
 }
 
+# An item of PUT /transactions/payment-proof-validation
+bulk_validating_payment_schema = {
+    "id": {"type": "integer", "required": True},
+    **validating_payment_schema,
+}
+
 return_car_schema = {
     "return_date": {"type": "string", "maxlength": 50, "required": True, "check_with": validate_date},
 }
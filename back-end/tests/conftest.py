@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+# Set before the app's modules read the config: a throwaway SQLite database,
+# in-process cache & event bus, and no background jobs
+DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ["CACHE_REDIS_URL"] = ""
+os.environ["BACKGROUND_JOBS"] = "false"
+os.environ["OUTBOX_SINKS"] = "bus"
+
+from config.config import Config
+
+Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{DATABASE_PATH}"
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+import app as app_module
+from db import db
+from models.roles import RoleModel
+from models.users import UserModel
+from models.car_categories import CarCategoryModel
+from utils.cache import cache, MemoryBackend
+
+ADMIN_ID = 1
+CUSTOMER_ID = 2
+
+
+@pytest.fixture(scope="session")
+def app():
+    app = app_module.create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+@pytest.fixture(autouse=True)
+def database(app):
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        db.session.add_all([RoleModel(id=1, name="admin"), RoleModel(id=2, name="customer")])
+        admin = UserModel(id=ADMIN_ID, role_id=1, name="admin", email="admin@example.com", address="x", phone_number="1")
+        admin.set_password("password1")
+        customer = UserModel(
+            id=CUSTOMER_ID, role_id=2, name="customer", email="customer@example.com", address="x", phone_number="2"
+        )
+        customer.set_password("password1")
+        db.session.add_all([admin, customer, CarCategoryModel(car_brand="Toyota", type="MPV")])
+        db.session.commit()
+        yield db
+        db.session.remove()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    backend = cache.backend
+    cache.backend = MemoryBackend()
+    yield cache
+    cache.backend = backend
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_headers(app):
+    def build(user_id, **claims):
+        with app.app_context():
+            token = create_access_token(identity=str(user_id), additional_claims=claims)
+        return {"Authorization": f"Bearer {token}"}
+
+    return build
@@ -0,0 +1,90 @@
+from datetime import date
+import pytest
+from sqlalchemy import event
+from models.drivers import DriverModel
+from utils.bulk import unique_conflicts, apply_grouped_updates
+
+UNIQUE_FIELDS = ["phone_number", "license_number"]
+
+
+@pytest.fixture
+def drivers(database):
+    rows = [
+        DriverModel(
+            id=id,
+            name=f"Driver {id}",
+            gender="Male",
+            dob=date(1990, 1, 1),
+            address="x",
+            phone_number=f"08{id}",
+            license_number=f"SIM-{id}",
+            status="Available",
+        )
+        for id in [1, 2, 3]
+    ]
+    database.session.add_all(rows)
+    database.session.commit()
+    return database.session
+
+
+def test_value_held_by_another_row_conflicts(drivers):
+    conflicts = unique_conflicts(drivers, DriverModel, UNIQUE_FIELDS, {1: {"phone_number": "082"}})
+
+    assert conflicts == {1: ["phone_number"]}
+
+
+def test_row_keeping_its_own_value_doesnt_conflict(drivers):
+    changes_by_id = {1: {"phone_number": "081", "license_number": "SIM-9"}, 2: {"phone_number": "089"}}
+
+    assert unique_conflicts(drivers, DriverModel, UNIQUE_FIELDS, changes_by_id) == {}
+
+
+def test_in_batch_duplicate_claims_keep_the_first_item(drivers):
+    changes_by_id = {
+        1: {"phone_number": "089", "license_number": "SIM-9"},
+        2: {"phone_number": "089"},
+        3: {"license_number": "SIM-9"},
+    }
+
+    conflicts = unique_conflicts(drivers, DriverModel, UNIQUE_FIELDS, changes_by_id)
+
+    assert conflicts == {2: ["phone_number"], 3: ["license_number"]}
+
+
+def test_swap_between_two_rows_is_refused_for_both(drivers):
+    # Each UPDATE runs on its own, the first one would break the unique value of the second row
+    changes_by_id = {1: {"phone_number": "082"}, 2: {"phone_number": "081"}}
+
+    conflicts = unique_conflicts(drivers, DriverModel, UNIQUE_FIELDS, changes_by_id)
+
+    assert conflicts == {1: ["phone_number"], 2: ["phone_number"]}
+
+
+def test_rows_sharing_a_change_set_are_updated_together(drivers):
+    statements = []
+    engine = drivers.get_bind()
+
+    def count_updates(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count_updates)
+    try:
+        changes_by_id = {
+            1: {"status": "Unavailable"},
+            2: {"status": "Unavailable"},
+            3: {"status": "Unavailable", "address": "y"},
+        }
+        groups = apply_grouped_updates(drivers, DriverModel, changes_by_id)
+    finally:
+        event.remove(engine, "before_cursor_execute", count_updates)
+    drivers.commit()
+
+    assert groups == 2
+    assert len(statements) == 2
+    rows = {driver.id: (driver.status, driver.address) for driver in drivers.query(DriverModel)}
+    assert rows == {1: ("Unavailable", "x"), 2: ("Unavailable", "x"), 3: ("Unavailable", "y")}
+
+
+def test_rows_without_changes_are_left_alone(drivers):
+    assert apply_grouped_updates(drivers, DriverModel, {1: {}, 2: {}}) == 0
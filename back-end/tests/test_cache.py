@@ -0,0 +1,61 @@
+import pytest
+from flask_jwt_extended import verify_jwt_in_request
+
+from conftest import ADMIN_ID, CUSTOMER_ID
+from utils.authorization import admin_required
+from utils.cache import cache
+
+OVERDUE = "/transactions/overdue"
+
+
+def test_admin_entry_is_cached_for_admins(client, auth_headers):
+    admin = auth_headers(ADMIN_ID, role_id=1)
+
+    assert client.get(OVERDUE, headers=admin).headers["X-Cache"] == "MISS"
+    assert client.get(OVERDUE, headers=admin).headers["X-Cache"] == "HIT"
+
+
+def test_customer_token_never_receives_an_admin_entry(client, auth_headers):
+    # Filled by every kind of admin token first
+    assert client.get(OVERDUE, headers=auth_headers(ADMIN_ID, role_id=1)).status_code == 200
+    assert client.get(OVERDUE, headers=auth_headers(ADMIN_ID)).status_code == 200
+
+    # A customer token with the role claim, without it, or with a stale admin claim
+    for headers in [
+        auth_headers(CUSTOMER_ID, role_id=2),
+        auth_headers(CUSTOMER_ID),
+        auth_headers(CUSTOMER_ID, role_id=1),
+    ]:
+        response = client.get(OVERDUE, headers=headers)
+        assert response.status_code == 403
+        assert "X-Cache" not in response.headers
+
+
+def test_token_without_role_claim_bypasses_the_cache(client, auth_headers):
+    headers = auth_headers(ADMIN_ID)
+    bypasses = cache.stats()["bypasses"]
+
+    for _ in range(2):
+        response = client.get(OVERDUE, headers=headers)
+        assert response.status_code == 200
+        assert "X-Cache" not in response.headers
+    assert cache.stats()["bypasses"] == bypasses + 2
+
+
+def test_authorization_below_the_cache_is_refused():
+    def view():
+        return "ok"
+
+    with pytest.raises(TypeError):
+        cache.cached()(admin_required(view))
+
+
+def test_cached_view_answering_forbidden_raises(app, auth_headers):
+    @cache.cached()
+    def view():
+        return "Forbidden", 403
+
+    with app.test_request_context("/guarded", headers=auth_headers(CUSTOMER_ID, role_id=2)):
+        verify_jwt_in_request()
+        with pytest.raises(RuntimeError):
+            view()
@@ -0,0 +1,64 @@
+from datetime import timedelta
+import pytest
+from conftest import ADMIN_ID
+from models.car_categories import CarCategoryModel
+from models.cars import CarModel
+
+
+@pytest.fixture
+def car(database):
+    category = database.session.query(CarCategoryModel).first()
+    car = CarModel(
+        category_id=category.id,
+        slug="toyota-avanza",
+        name="Toyota Avanza",
+        transmission="AT",
+        fuel="Petrol",
+        color="Black",
+        plate_number="B 1",
+        capacity=7,
+        registration_number=1,
+        price=300000,
+        status="Available",
+    )
+    database.session.add(car)
+    database.session.commit()
+    return car
+
+
+def test_cached_body_is_served_under_its_own_etag(client, auth_headers, car):
+    headers = auth_headers(ADMIN_ID, role_id=1)
+
+    first = client.get("/cars/toyota-avanza", headers=headers)
+    second = client.get("/cars/toyota-avanza", headers=headers)
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+
+def test_entry_older_than_the_fingerprint_is_a_miss(client, auth_headers, database, car):
+    headers = auth_headers(ADMIN_ID, role_id=1)
+    first = client.get("/cars/toyota-avanza", headers=headers)
+
+    # A write that didn't invalidate the cache, e.g. from another process without Redis
+    car.color = "White"
+    car.updated_at = car.updated_at + timedelta(seconds=1)
+    database.session.commit()
+
+    second = client.get("/cars/toyota-avanza", headers=headers)
+    assert second.headers["X-Cache"] == "MISS"
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.get_json()["data"]["color"] == "White"
+
+    third = client.get("/cars/toyota-avanza", headers=headers)
+    assert third.headers["X-Cache"] == "HIT"
+    assert third.headers["ETag"] == second.headers["ETag"]
+
+
+def test_matching_etag_answers_not_modified(client, auth_headers, car):
+    headers = auth_headers(ADMIN_ID, role_id=1)
+    etag = client.get("/cars/toyota-avanza", headers=headers).headers["ETag"]
+
+    response = client.get("/cars/toyota-avanza", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
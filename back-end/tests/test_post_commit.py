@@ -0,0 +1,42 @@
+import logging
+from models.cars import CarModel
+from utils.search_index import search_index
+from conftest import ADMIN_ID
+
+CAR = dict(
+    car_brand="Toyota",
+    type="MPV",
+    name="Toyota Avanza",
+    transmission="AT",
+    fuel="Petrol",
+    color="Black",
+    plate_number="B 1",
+    capacity="7",
+    registration_number="1",
+    price="300000",
+    status="Available",
+)
+
+
+class UnloadedCar:
+    @property
+    def car_categories(self):
+        raise AssertionError("The category was loaded for an index that isn't built")
+
+
+def test_unbuilt_index_leaves_the_car_relationship_alone(monkeypatch):
+    monkeypatch.setattr(search_index, "built_at", None)
+    search_index.index_car(UnloadedCar())
+
+
+def test_index_failure_after_the_commit_keeps_the_response(client, auth_headers, database, monkeypatch, caplog):
+    def fail(car):
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(search_index, "index_car", fail)
+    with caplog.at_level(logging.ERROR, logger="utils.post_commit"):
+        response = client.post("/cars", headers=auth_headers(ADMIN_ID, role_id=1), data=CAR)
+
+    assert response.status_code == 201
+    assert database.session.query(CarModel).filter_by(plate_number="B 1").count() == 1
+    assert "failed after the commit" in caplog.text
@@ -0,0 +1,64 @@
+from datetime import date
+from decimal import Decimal
+from conftest import ADMIN_ID
+from config.config import Config
+from utils.pricing import PricingEngine
+
+# 2026-10-19 is a Monday
+MONDAY = date(2026, 10, 19)
+
+
+def test_half_cents_round_up_like_the_decimal_columns():
+    engine = PricingEngine(driver_daily_rate=0, late_fee_daily_rate=0, weekend_multiplier=Decimal("1.5"))
+
+    # Saturday only, 100.01 * 1.5 = 150.015
+    quote = engine.quote_one(Decimal("100.01"), date(2026, 10, 24), date(2026, 10, 25))
+
+    assert quote["days"] == 1
+    assert quote["base"] == Decimal("150.02")
+
+
+def test_discount_and_multipliers_are_exact():
+    engine = PricingEngine(
+        driver_daily_rate=100000,
+        late_fee_daily_rate=200000,
+        seasons=[{"start": "10-01", "end": "10-31", "multiplier": Decimal("1.1")}],
+        duration_discounts={"3": Decimal("0.05")},
+    )
+
+    # Three weekdays in season, 100.10 * 3.3 = 330.33, its 5% is 16.5165
+    quote = engine.quote_one(Decimal("100.10"), MONDAY, date(2026, 10, 22), with_driver=True)
+
+    assert quote == {
+        "days": 3,
+        "base": Decimal("330.33"),
+        "discount": Decimal("16.52"),
+        "driver": Decimal("300000.00"),
+        "total": Decimal("300313.81"),
+    }
+
+
+def test_quote_without_days_costs_nothing():
+    engine = PricingEngine(driver_daily_rate=100000, late_fee_daily_rate=200000)
+
+    quote = engine.quote([Decimal("300000")], MONDAY, MONDAY)
+
+    assert quote["days"] == 0
+    assert quote["total"] == [Decimal("0.00")]
+
+
+def test_late_fees_are_decimals():
+    engine = PricingEngine(driver_daily_rate=0, late_fee_daily_rate=Decimal("0.015"))
+
+    assert engine.late_fees([1, 0, -2]) == [Decimal("0.02"), Decimal("0.00"), Decimal("0.00")]
+
+
+def test_quotes_refuse_ranges_longer_than_the_limit(client, auth_headers):
+    response = client.get(
+        "/quotes",
+        headers=auth_headers(ADMIN_ID, role_id=1),
+        query_string={"start": "2026-01-01", "end": "2030-01-01", "car_ids": "1"},
+    )
+
+    assert response.status_code == 400
+    assert str(Config.QUOTE_MAX_DAYS) in response.get_json()["message"]
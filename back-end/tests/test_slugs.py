@@ -0,0 +1,62 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+from models.car_slug_sequences import CarSlugSequenceModel
+from utils.slugs import allocate_slug, allocate_slugs, counter_upsert, slug_base, base_of
+
+
+@pytest.fixture
+def s():
+    engine = create_engine("sqlite://")
+    CarSlugSequenceModel.__table__.create(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def counters(s):
+    return {row.base: row.last_value for row in s.query(CarSlugSequenceModel)}
+
+
+def test_first_slug_of_a_base_creates_its_counter(s):
+    assert allocate_slug(s, "Toyota Avanza") == "toyota-avanza-1000"
+    assert counters(s) == {"toyota-avanza": 1000}
+
+
+def test_counter_is_bumped_by_the_batch_size(s):
+    allocate_slug(s, "Toyota Avanza")
+
+    slugs = allocate_slugs(s, ["Toyota Avanza", "Honda CRV", "toyota avanza", "Toyota Avanza"])
+
+    assert slugs == ["toyota-avanza-1001", "honda-crv-1000", "toyota-avanza-1002", "toyota-avanza-1003"]
+    assert counters(s) == {"toyota-avanza": 1003, "honda-crv": 1000}
+
+
+def test_counters_survive_the_commit(s):
+    allocate_slugs(s, ["Toyota Avanza", "Toyota Avanza"])
+    s.commit()
+
+    assert allocate_slug(s, "Toyota Avanza") == "toyota-avanza-1002"
+
+
+def test_mysql_bumps_the_counter_on_duplicate_key():
+    sql = str(counter_upsert("mysql", "toyota-avanza", 3).compile(dialect=mysql.dialect()))
+
+    assert sql == (
+        "INSERT INTO car_slug_sequences (base, `last_value`) VALUES (%s, %s) "
+        "ON DUPLICATE KEY UPDATE `last_value` = (car_slug_sequences.`last_value` + %s)"
+    )
+
+
+def test_mysql_counter_starts_at_the_first_number_plus_the_batch():
+    compiled = counter_upsert("mysql", "toyota-avanza", 3).compile(dialect=mysql.dialect())
+
+    assert compiled.params["base"] == "toyota-avanza"
+    assert compiled.params["last_value"] == 1002
+
+
+def test_base_is_a_truncated_slug_of_the_name():
+    assert slug_base("  Toyota  Avanza! ") == "toyota-avanza"
+    assert slug_base("!!!") == "car"
+    assert len(slug_base("x" * 300)) == 240
+    assert base_of("toyota-avanza-1003") == "toyota-avanza"
@@ -0,0 +1,147 @@
+from datetime import date
+import pytest
+from conftest import CUSTOMER_ID
+from models.car_categories import CarCategoryModel
+from models.cars import CarModel
+from models.transactions import TransactionModel
+from utils import transaction_states
+from utils.transaction_states import transition, TransitionError
+
+
+@pytest.fixture
+def events(monkeypatch):
+    received = []
+    monkeypatch.setattr(transaction_states, "_subscribers", [received.append])
+    return received
+
+
+@pytest.fixture
+def car(database):
+    category = database.session.query(CarCategoryModel).first()
+    car = CarModel(
+        category_id=category.id,
+        slug="toyota-avanza",
+        name="Toyota Avanza",
+        transmission="AT",
+        fuel="Petrol",
+        color="Black",
+        plate_number="B 1",
+        capacity=7,
+        registration_number=1,
+        price=300000,
+        status="Available",
+    )
+    database.session.add(car)
+    database.session.commit()
+    return car
+
+
+def book(database, car):
+    transaction = TransactionModel(
+        user_id=CUSTOMER_ID,
+        car_id=car.id,
+        invoice="INV-1",
+        start_date=date(2026, 10, 20),
+        end_date=date(2026, 10, 22),
+        total_cost=900000,
+    )
+    database.session.add(transaction)
+    transition(database.session, transaction, "book", car)
+    database.session.commit()
+    return transaction
+
+
+@pytest.mark.parametrize(
+    "names, statuses, car_status",
+    [
+        (["book"], ("Pending", "Pending"), "Booked"),
+        (["book", "approve_payment"], ("In Progress", "Success"), "Rented"),
+        (["book", "reject_payment"], ("Canceled", "Invalid"), "Available"),
+        (["book", "expire"], ("Canceled", "Expired"), "Available"),
+        (["book", "approve_payment", "return"], ("Success", "Success"), "Available"),
+    ],
+)
+def test_allowed_transitions(database, car, events, names, statuses, car_status):
+    transaction = book(database, car)
+    for name in names[1:]:
+        transition(database.session, transaction, name)
+        database.session.commit()
+
+    assert (transaction.rental_status, transaction.payment_status) == statuses
+    assert car.status == car_status
+    assert [transition_event["event"] for transition_event in events] == names
+
+
+@pytest.mark.parametrize(
+    "names, refused",
+    [
+        (["book"], "return"),
+        (["book", "approve_payment"], "approve_payment"),
+        (["book", "approve_payment"], "expire"),
+        (["book", "reject_payment"], "approve_payment"),
+        (["book", "approve_payment", "return"], "return"),
+    ],
+)
+def test_refused_transitions(database, car, events, names, refused):
+    transaction = book(database, car)
+    for name in names[1:]:
+        transition(database.session, transaction, name)
+        database.session.commit()
+    statuses = (transaction.rental_status, transaction.payment_status)
+
+    with pytest.raises(TransitionError) as refusal:
+        transition(database.session, transaction, refused)
+    assert refusal.value.status == 409
+    assert (transaction.rental_status, transaction.payment_status) == statuses
+
+
+def test_returning_an_unpaid_booking_answers_conflict(client, auth_headers, database, car):
+    transaction = book(database, car)
+
+    response = client.put(
+        f"/transactions/return-car/{transaction.id}",
+        headers=auth_headers(CUSTOMER_ID, role_id=2),
+        json={"return_date": "2026-10-22"},
+    )
+
+    assert response.status_code == 409
+    database.session.refresh(transaction)
+    assert transaction.rental_status == "Pending"
+
+
+def test_events_fire_only_after_the_commit(database, car, events):
+    transaction = book(database, car)
+    events.clear()
+
+    transition(database.session, transaction, "approve_payment")
+    database.session.flush()
+    assert events == []
+
+    database.session.commit()
+    assert [transition_event["event"] for transition_event in events] == ["approve_payment"]
+    assert events[0]["transaction_id"] == transaction.id
+
+
+def test_rolled_back_transitions_are_never_announced(database, car, events):
+    transaction = book(database, car)
+    events.clear()
+
+    transition(database.session, transaction, "expire")
+    database.session.rollback()
+    database.session.commit()
+
+    assert events == []
+    assert transaction.rental_status == "Pending"
+
+
+def test_failing_subscriber_is_logged_after_the_commit(database, car, monkeypatch, caplog):
+    def fail(transition_event):
+        raise RuntimeError("subscriber down")
+
+    monkeypatch.setattr(transaction_states, "_subscribers", [fail])
+    with caplog.at_level("ERROR", logger="utils.transaction_states"):
+        transaction = book(database, car)
+
+    assert transaction.id is not None
+    assert "Transition handler fail failed" in caplog.text
+    assert "subscriber down" in caplog.text
@@ -0,0 +1,270 @@
+import csv
+import io
+from sqlalchemy import and_, case, func, select, union_all
+from sqlalchemy.orm import aliased
+from config.config import Config
+from models.calendar import CalendarModel, CALENDAR_START
+from models.car_categories import CarCategoryModel
+from models.car_maintenances import CarMaintenanceModel
+from models.cars import CarModel
+from models.transactions import TransactionModel, gmt_plus_7_now
+from models.transactions_archive import TransactionArchiveModel
+from utils.archive import archive_reaches
+from utils.cache import cache
+
+# Rentals whose car is out, paid bookings that started or ended
+RENTED_STATUSES = ["In Progress", "Success"]
+
+UTILIZATION_CSV_COLUMNS = [
+    "car_id",
+    "slug",
+    "name",
+    "car_brand",
+    "type",
+    "fleet_days",
+    "maintenance_days",
+    "available_days",
+    "rented_days",
+    "idle_days",
+    "utilization",
+    "revenue",
+    "rentals",
+    "longest_idle_streak",
+    "current_idle_streak",
+]
+
+
+def day_number(day):
+    return (day - CALENDAR_START).days
+
+
+def rental_spans(s, start_date, end_date, today):
+    """Paid rentals overlapping the range, archived ones too when the range reaches back to them.
+
+    A car is out from its start date until it is returned, an unreturned
+    rental past its end date keeps the car until today.
+    """
+
+    def spans(model):
+        occupied_until = func.coalesce(
+            model.return_date,
+            case((and_(model.rental_status == "In Progress", model.end_date < today), today), else_=model.end_date),
+        )
+        return select(
+            model.car_id,
+            model.total_cost,
+            model.start_date.label("start_date"),
+            occupied_until.label("occupied_until"),
+        ).where(model.rental_status.in_(RENTED_STATUSES), model.start_date <= end_date, occupied_until >= start_date)
+
+    statement = spans(TransactionModel)
+    if archive_reaches(s, start_date):
+        statement = union_all(statement, spans(TransactionArchiveModel))
+    return statement.subquery("rentals")
+
+
+def fleet_utilization(s, start_date, end_date):
+    """Rented & available days, revenue and idle streaks of every car over the range.
+
+    Everything is computed by one query. Rental spans are clipped to the
+    range through their calendar day numbers, revenue is pro rated by the
+    share of a rental's days inside the range, idle gaps between a car's
+    consecutive rentals come from a LAG window. Only the per car rows come
+    back to Python, to be summed per category.
+    """
+    first_day, last_day = day_number(start_date), day_number(end_date)
+    rentals = rental_spans(s, start_date, end_date, gmt_plus_7_now().date())
+
+    rental_start = aliased(CalendarModel)
+    rental_end = aliased(CalendarModel)
+    clipped_first = case((rental_start.day_number < first_day, first_day), else_=rental_start.day_number)
+    clipped_last = case((rental_end.day_number > last_day, last_day), else_=rental_end.day_number)
+    clipped = (
+        select(
+            rentals.c.car_id,
+            rentals.c.total_cost,
+            clipped_first.label("first_day"),
+            clipped_last.label("last_day"),
+            (rental_end.day_number - rental_start.day_number + 1).label("rental_days"),
+        )
+        .select_from(rentals)
+        .join(rental_start, rental_start.day == rentals.c.start_date)
+        .join(rental_end, rental_end.day == rentals.c.occupied_until)
+        .subquery("clipped")
+    )
+
+    rented_days = clipped.c.last_day - clipped.c.first_day + 1
+    rental_stats = (
+        select(
+            clipped.c.car_id,
+            func.count().label("rentals"),
+            func.sum(rented_days).label("rented_days"),
+            func.sum(clipped.c.total_cost * rented_days / clipped.c.rental_days).label("revenue"),
+            func.min(clipped.c.first_day).label("first_rented_day"),
+            func.max(clipped.c.last_day).label("last_rented_day"),
+        )
+        .group_by(clipped.c.car_id)
+        .subquery("rental_stats")
+    )
+
+    previous_last_day = func.lag(clipped.c.last_day).over(partition_by=clipped.c.car_id, order_by=clipped.c.first_day)
+    ordered = select(clipped.c.car_id, clipped.c.first_day, previous_last_day.label("previous_last_day")).subquery(
+        "ordered"
+    )
+    gaps = (
+        select(ordered.c.car_id, func.max(ordered.c.first_day - ordered.c.previous_last_day - 1).label("longest_gap"))
+        .where(ordered.c.previous_last_day.is_not(None))
+        .group_by(ordered.c.car_id)
+        .subquery("gaps")
+    )
+
+    maintenances = (
+        select(
+            CarMaintenanceModel.car_id,
+            func.count(func.distinct(CarMaintenanceModel.maintenance_date)).label("maintenance_days"),
+        )
+        .where(CarMaintenanceModel.maintenance_date.between(start_date, end_date))
+        .group_by(CarMaintenanceModel.car_id)
+        .subquery("maintenances")
+    )
+
+    # A car only counts from the day it joined the fleet
+    joined = func.date(CarModel.created_at)
+    fleet_start = aliased(CalendarModel)
+    rows = s.execute(
+        select(
+            CarModel.id,
+            CarModel.slug,
+            CarModel.name,
+            CarCategoryModel.id.label("category_id"),
+            CarCategoryModel.car_brand,
+            CarCategoryModel.type,
+            fleet_start.day_number.label("fleet_first_day"),
+            rental_stats.c.rentals,
+            rental_stats.c.rented_days,
+            rental_stats.c.revenue,
+            rental_stats.c.first_rented_day,
+            rental_stats.c.last_rented_day,
+            gaps.c.longest_gap,
+            maintenances.c.maintenance_days,
+        )
+        .join(CarCategoryModel, CarCategoryModel.id == CarModel.category_id)
+        .join(fleet_start, fleet_start.day == case((joined > start_date, joined), else_=start_date))
+        .outerjoin(rental_stats, rental_stats.c.car_id == CarModel.id)
+        .outerjoin(gaps, gaps.c.car_id == CarModel.id)
+        .outerjoin(maintenances, maintenances.c.car_id == CarModel.id)
+        .where(joined <= end_date)
+        .order_by(CarModel.id)
+    ).all()
+
+    cars = [car_utilization(row, last_day) for row in rows]
+    return {
+        "from": start_date.isoformat(),
+        "to": end_date.isoformat(),
+        "days": last_day - first_day + 1,
+        "fleet": summarize(cars),
+        "categories": summarize_categories(cars),
+        "cars": cars,
+    }
+
+
+def car_utilization(row, last_day):
+    fleet_days = last_day - row.fleet_first_day + 1
+    maintenance_days = row.maintenance_days or 0
+    available_days = max(fleet_days - maintenance_days, 0)
+    rented_days = int(row.rented_days or 0)
+
+    if row.rentals:
+        # Before the first rental, between two rentals and after the last one
+        idle_gaps = [
+            row.first_rented_day - row.fleet_first_day,
+            row.longest_gap or 0,
+            last_day - row.last_rented_day,
+        ]
+        longest_idle_streak = max(idle_gaps)
+        current_idle_streak = last_day - row.last_rented_day
+    else:
+        longest_idle_streak = current_idle_streak = fleet_days
+
+    return {
+        "car_id": row.id,
+        "slug": row.slug,
+        "name": row.name,
+        "category_id": row.category_id,
+        "car_brand": row.car_brand,
+        "type": row.type,
+        "fleet_days": fleet_days,
+        "maintenance_days": maintenance_days,
+        "available_days": available_days,
+        "rented_days": rented_days,
+        "idle_days": max(available_days - rented_days, 0),
+        "utilization": round(rented_days / available_days, 4) if available_days else None,
+        "revenue": round(float(row.revenue or 0), 2),
+        "rentals": row.rentals or 0,
+        "longest_idle_streak": longest_idle_streak,
+        "current_idle_streak": current_idle_streak,
+    }
+
+
+def summarize(cars):
+    available_days = sum(car["available_days"] for car in cars)
+    rented_days = sum(car["rented_days"] for car in cars)
+    return {
+        "cars": len(cars),
+        "available_days": available_days,
+        "rented_days": rented_days,
+        "idle_days": sum(car["idle_days"] for car in cars),
+        "utilization": round(rented_days / available_days, 4) if available_days else None,
+        "revenue": round(sum(car["revenue"] for car in cars), 2),
+        "rentals": sum(car["rentals"] for car in cars),
+    }
+
+
+def summarize_categories(cars):
+    categories = {}
+    for car in cars:
+        categories.setdefault(car["category_id"], []).append(car)
+    return [
+        {
+            "category_id": category_id,
+            "car_brand": category_cars[0]["car_brand"],
+            "type": category_cars[0]["type"],
+            **summarize(category_cars),
+        }
+        for category_id, category_cars in categories.items()
+    ]
+
+
+def cached_utilization(s, start_date, end_date):
+    """fleet_utilization cached per range, concurrent misses for a range share one computation."""
+    key = f"analytics:utilization:{start_date.isoformat()}:{end_date.isoformat()}"
+    entry = cache.get(key)
+    if entry is None:
+
+        def compute():
+            # Versions read first, a rental settling meanwhile invalidates what we store
+            versions = cache.tag_versions(["analytics:utilization"])
+            entry = {"tags": versions, "result": fleet_utilization(s, start_date, end_date)}
+            cache.set(key, entry, ttl=Config.ANALYTICS_CACHE_TTL)
+            return entry
+
+        entry, _ = cache.flight.do(key, compute)
+    return entry["result"]
+
+
+def utilization_csv(result):
+    """The per car rows as CSV, yielded row by row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        row = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return row
+
+    writer.writerow(UTILIZATION_CSV_COLUMNS)
+    yield flush()
+    for car in result["cars"]:
+        writer.writerow([car[column] for column in UTILIZATION_CSV_COLUMNS])
+        yield flush()
@@ -0,0 +1,126 @@
+from datetime import date
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import sessionmaker
+from config.config import Config
+from connector.mysql_connector import engine
+from models.transactions import TransactionModel
+from models.transactions_archive import TransactionArchiveModel, gmt_plus_7_now
+
+# Only rentals that can't change anymore are archived
+ARCHIVABLE_STATUSES = ["Success", "Canceled"]
+
+
+def archive_cutoff(months, today=None):
+    """First day of the month months ago, rentals ending before it are archived."""
+    today = today or gmt_plus_7_now().date()
+    month = today.year * 12 + today.month - 1 - months
+    return date(month // 12, month % 12 + 1, 1)
+
+
+def archive_reaches(s, start_date):
+    """Whether archived rentals may end on or after start_date, the max is read from the end_date index."""
+    newest = s.query(func.max(TransactionArchiveModel.end_date)).scalar()
+    return newest is not None and newest >= start_date
+
+
+def rentals_ending_between(s, start_date, end_date, columns, **filters):
+    """Rows of the rentals ending in the range, ordered by end_date.
+
+    Only a range reaching back into the archive reads it too, with a
+    UNION ALL of the same columns from both tables, the live table is the
+    only one queried otherwise.
+    """
+
+    def select_rows(model):
+        return select(*[getattr(model, column) for column in columns]).where(
+            model.end_date >= start_date,
+            model.end_date <= end_date,
+            *[getattr(model, field) == value for field, value in filters.items()],
+        )
+
+    statement = select_rows(TransactionModel)
+    if archive_reaches(s, start_date):
+        statement = union_all(statement, select_rows(TransactionArchiveModel))
+    return s.execute(statement.order_by("end_date")).all()
+
+
+class TransactionArchiver:
+    """Moves the completed & canceled rentals that ended before the cutoff to transactions_archive.
+
+    Every batch copies its rows and deletes them from transactions in one
+    transaction, so a row is always in exactly one table. An interrupted
+    run is resumed by running again, the rows left are still selected by
+    the cutoff.
+    """
+
+    def __init__(self, bind, batch_size=1000):
+        self.Session = sessionmaker(bind=bind)
+        self.batch_size = batch_size
+
+    def eligible(self, cutoff):
+        s = self.Session()
+        try:
+            return (
+                s.query(func.count(TransactionModel.id))
+                .filter(TransactionModel.rental_status.in_(ARCHIVABLE_STATUSES), TransactionModel.end_date < cutoff)
+                .scalar()
+            )
+        finally:
+            s.close()
+
+    def archive_batch(self, cutoff):
+        s = self.Session()
+        try:
+            # Served by the (rental_status, end_date) index, rows locked by a request are left for the next batch
+            ids = [
+                id
+                for (id,) in s.query(TransactionModel.id)
+                .filter(TransactionModel.rental_status.in_(ARCHIVABLE_STATUSES), TransactionModel.end_date < cutoff)
+                .order_by(TransactionModel.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+            ]
+            if not ids:
+                s.commit()
+                return 0
+
+            columns = [column.name for column in TransactionModel.__table__.columns]
+            s.execute(
+                insert(TransactionArchiveModel).from_select(
+                    [*columns, "archived_at"],
+                    select(*TransactionModel.__table__.columns, literal(gmt_plus_7_now())).where(
+                        TransactionModel.id.in_(ids)
+                    ),
+                )
+            )
+            s.execute(delete(TransactionModel).where(TransactionModel.id.in_(ids)))
+            s.commit()
+            return len(ids)
+        except Exception:
+            s.rollback()
+            raise
+        finally:
+            s.close()
+
+    def archive(self, months, max_batches=None, on_batch=None):
+        """Archive in batches until nothing is left or max_batches ran, returns the rows moved."""
+        cutoff = archive_cutoff(months)
+        total = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            archived = self.archive_batch(cutoff)
+            total += archived
+            batches += 1
+            if on_batch and archived:
+                on_batch(total)
+            if archived < self.batch_size:
+                break
+        return total
+
+    def run(self):
+        if Config.ARCHIVE_AFTER_MONTHS <= 0:
+            return 0
+        return self.archive(Config.ARCHIVE_AFTER_MONTHS)
+
+
+transaction_archiver = TransactionArchiver(engine, batch_size=Config.ARCHIVE_BATCH_SIZE)
@@ -0,0 +1,29 @@
+from functools import wraps
+
+from flask_jwt_extended import get_jwt_identity
+from models.users import UserModel
+from utils.handle_response import ResponseHandler
+
+
+def admin_required(view):
+    """Refuse the callers who aren't admins according to the database, on every request.
+
+    Must sit below @jwt_required and above @cache.cached, so a cached
+    response of an admin only view is never served before the check runs.
+    """
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        current_user = UserModel.query.filter_by(id=get_jwt_identity()).first()
+        if not current_user:
+            return ResponseHandler.error(message="User not found", status=404)
+
+        # Check if the current user's role is "admin"
+        if current_user.role_id != 1:
+            return ResponseHandler.error(message="Unauthorized access, only admin can access this!", status=403)
+
+        return view(*args, **kwargs)
+
+    # Lets @cache.cached refuse to be stacked above the check
+    wrapper.authorizes = True
+    return wrapper
@@ -0,0 +1,130 @@
+from datetime import timedelta
+from sqlalchemy import and_, exists, or_
+from sqlalchemy.orm import sessionmaker
+from config.config import Config
+from connector.mysql_connector import engine
+from models.cars import CarModel
+from models.transactions import TransactionModel, gmt_plus_7_now
+from utils.transaction_states import TRANSITIONS, make_event, announce
+
+
+def hold_expiry():
+    """When a booking made now stops holding its car if it isn't paid."""
+    return gmt_plus_7_now() + timedelta(minutes=Config.BOOKING_HOLD_MINUTES)
+
+
+def hold_expired():
+    """SQL condition for an unpaid booking whose hold has run out."""
+    return and_(
+        TransactionModel.rental_status == "Pending",
+        TransactionModel.payment_status == "Pending",
+        TransactionModel.hold_expires_at <= gmt_plus_7_now(),
+    )
+
+
+def hold_active():
+    """SQL condition for a booking that still holds its car & driver, expired holds don't even before a sweep."""
+    return or_(TransactionModel.hold_expires_at.is_(None), TransactionModel.hold_expires_at > gmt_plus_7_now())
+
+
+def expire_holds(s, *conditions, limit=None):
+    """Cancel the expired holds matching the conditions, within s's transaction.
+
+    The bookings and their cars are updated with one UPDATE each, whatever
+    the number of holds. A car is only freed when no other booking holds it,
+    drivers need no update, their schedule is read from the bookings.
+    Returns the number of expired holds.
+    """
+    query = (
+        s.query(
+            TransactionModel.id,
+            TransactionModel.invoice,
+            TransactionModel.user_id,
+            TransactionModel.car_id,
+            TransactionModel.driver_id,
+            CarModel.slug,
+        )
+        .join(CarModel, CarModel.id == TransactionModel.car_id)
+        .filter(hold_expired(), *conditions)
+        .order_by(TransactionModel.hold_expires_at)
+    )
+    if limit:
+        query = query.limit(limit)
+    # Skip the holds another sweeper or request is expiring
+    rows = query.with_for_update(skip_locked=True, of=TransactionModel).all()
+    if not rows:
+        return 0
+
+    rule = TRANSITIONS["expire"]
+    s.query(TransactionModel).filter(TransactionModel.id.in_([row.id for row in rows])).update(
+        {
+            TransactionModel.rental_status: rule["rental_status"],
+            TransactionModel.payment_status: rule["payment_status"],
+            TransactionModel.hold_expires_at: None,
+        },
+        synchronize_session=False,
+    )
+
+    still_booked = exists().where(
+        TransactionModel.car_id == CarModel.id,
+        TransactionModel.rental_status.in_(["Pending", "In Progress"]),
+    )
+    s.query(CarModel).filter(
+        CarModel.id.in_({row.car_id for row in rows}), CarModel.status == "Booked", ~still_booked
+    ).update({CarModel.status: rule["car_status"]}, synchronize_session=False)
+
+    # A car still held by another booking stays Booked
+    car_statuses = dict(s.query(CarModel.id, CarModel.status).filter(CarModel.id.in_({row.car_id for row in rows})))
+    for row in rows:
+        announce(
+            s,
+            make_event(
+                "expire",
+                row.id,
+                row.invoice,
+                row.user_id,
+                row.car_id,
+                row.slug,
+                row.driver_id,
+                ("Pending", "Pending"),
+                car_statuses.get(row.car_id),
+            ),
+        )
+    return len(rows)
+
+
+def release_if_expired(s, transaction):
+    """Expire the transaction's hold now when it ran out before the sweeper got to it."""
+    if transaction.hold_expires_at is None or transaction.hold_expires_at > gmt_plus_7_now():
+        return False
+    expired = expire_holds(s, TransactionModel.id == transaction.id)
+    s.refresh(transaction)
+    return bool(expired)
+
+
+class HoldSweeper:
+    """Cancels the unpaid bookings whose hold expired, a batch per transaction."""
+
+    def __init__(self, bind, batch_size=500):
+        self.Session = sessionmaker(bind=bind)
+        self.batch_size = batch_size
+
+    def sweep(self):
+        total = 0
+        while True:
+            s = self.Session()
+            try:
+                expired = expire_holds(s, limit=self.batch_size)
+                s.commit()
+            except Exception:
+                s.rollback()
+                raise
+            finally:
+                s.close()
+
+            total += expired
+            if expired < self.batch_size:
+                return total
+
+
+hold_sweeper = HoldSweeper(engine, batch_size=Config.BOOKING_HOLD_SWEEP_BATCH_SIZE)
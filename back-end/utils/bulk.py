@@ -0,0 +1,60 @@
+from sqlalchemy import or_
+
+# Most items a single bulk request may carry
+BULK_MAX_ITEMS = 500
+
+
+def bulk_items(data):
+    """The items of a bulk request body, or an error message."""
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items:
+        return None, "items must be a non-empty list"
+    if len(items) > BULK_MAX_ITEMS:
+        return None, f"At most {BULK_MAX_ITEMS} items can be changed at once"
+    if not all(isinstance(item, dict) for item in items):
+        return None, "Every item must be an object"
+    return items, None
+
+
+def unique_conflicts(s, model, fields, changes_by_id):
+    """Find the rows whose new value for a unique field is already taken.
+
+    A value is taken when another row holds it, or when an earlier item of the
+    batch claims it. All fields are checked with a single IN query. Returns
+    {id: [field, ...]}.
+    """
+    conflicts = {}
+    claimed = {field: {} for field in fields}  # field -> value -> id of the row claiming it
+    for id, changes in changes_by_id.items():
+        for field in fields:
+            if field not in changes:
+                continue
+            owner = claimed[field].setdefault(changes[field], id)
+            if owner != id:
+                conflicts.setdefault(id, []).append(field)
+
+    conditions = [getattr(model, field).in_(list(values)) for field, values in claimed.items() if values]
+    if conditions:
+        columns = [getattr(model, field) for field in fields]
+        for row in s.query(model.id, *columns).filter(or_(*conditions)):
+            for field in fields:
+                owner = claimed[field].get(getattr(row, field))
+                if owner is not None and owner != row.id and field not in conflicts.get(owner, []):
+                    conflicts.setdefault(owner, []).append(field)
+    return conflicts
+
+
+def apply_grouped_updates(s, model, changes_by_id):
+    """Apply per-row changes with one UPDATE for every distinct change set.
+
+    A seasonal price change or taking a set of cars offline is a single
+    statement however many rows it touches. Returns the number of statements.
+    """
+    groups = {}
+    for id, changes in changes_by_id.items():
+        if changes:
+            groups.setdefault(tuple(sorted(changes.items())), []).append(id)
+
+    for changes, ids in groups.items():
+        s.query(model).filter(model.id.in_(ids)).update(dict(changes), synchronize_session=False)
+    return len(groups)
@@ -0,0 +1,298 @@
+import math
+import pickle
+import random
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import current_app, g, request, Response
+from flask_jwt_extended import get_jwt
+from config.config import Config
+from utils.singleflight import SingleFlight
+
+
+class MemoryBackend:
+    """In-process LRU store, bounded by the total size of the stored values."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._counters = {}  # Counters are never evicted, losing one would revive stale entries
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        size = len(key) + len(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._store(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        """Store the value only if the key is absent or expired, True when stored."""
+        if len(key) + len(value) > self.max_bytes:
+            return False
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > time.time()):
+                return False
+            self._store(key, value, ttl)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def incr(self, key):
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def get_counters(self, keys):
+        with self._lock:
+            return [self._counters.get(key, 0) for key in keys]
+
+    def info(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size, "evictions": self.evictions}
+
+    def _store(self, key, value, ttl):
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (value, time.time() + ttl if ttl else None)
+        self._size += len(key) + len(value)
+
+        # Evict the least recently used entries until we are back under the cap
+        while self._size > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def _remove(self, key):
+        value, _ = self._entries.pop(key)
+        self._size -= len(key) + len(value)
+
+
+class RedisBackend:
+    """Shared store for running several workers, the memory backend stands in for it locally."""
+
+    def __init__(self, url, prefix="linggar-jati:"):
+        import redis
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._client.get(self.prefix + key)
+
+    def set(self, key, value, ttl=None):
+        self._client.set(self.prefix + key, value, ex=ttl)
+
+    def add(self, key, value, ttl=None):
+        return bool(self._client.set(self.prefix + key, value, ex=ttl, nx=True))
+
+    def delete(self, key):
+        self._client.delete(self.prefix + key)
+
+    def incr(self, key):
+        return self._client.incr(self.prefix + key)
+
+    def get_counters(self, keys):
+        if not keys:
+            return []
+        values = self._client.mget([self.prefix + key for key in keys])
+        return [int(value) if value is not None else 0 for value in values]
+
+    def info(self):
+        return {"backend": "redis"}
+
+
+class ResponseCache:
+    """Caches serialized GET responses and invalidates them by tag.
+
+    Every tag has a version counter in the backend. An entry remembers the tag
+    versions it was computed under, invalidating a tag bumps its counter so all
+    entries carrying the old version become misses without scanning the store.
+
+    Misses go through a single-flight, so a burst of identical requests runs the
+    view once. Entries close to expiry are refreshed early with a probability
+    that grows as expiry approaches (XFetch), so a hot key rarely expires under load.
+    """
+
+    def __init__(self, backend, default_ttl=60, beta=1.0):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.beta = beta
+        self.flight = SingleFlight()
+        self.metrics = {"hits": 0, "misses": 0, "coalesced": 0, "early_refreshes": 0, "bypasses": 0}
+        self._lock = threading.Lock()
+
+    def tag_versions(self, tags):
+        return dict(zip(tags, self.backend.get_counters([f"tag:{tag}" for tag in tags])))
+
+    def invalidate(self, *tags):
+        for tag in tags:
+            self.backend.incr(f"tag:{tag}")
+
+    def get(self, key):
+        raw = self.backend.get(key)
+        if raw is None:
+            return None
+
+        entry = pickle.loads(raw)
+        if self.tag_versions(list(entry["tags"])) != entry["tags"]:
+            self.backend.delete(key)
+            return None
+        return entry
+
+    def set(self, key, entry, ttl=None):
+        self.backend.set(key, pickle.dumps(entry), ttl=ttl)
+
+    def should_refresh(self, entry):
+        # XFetch: -log(random) is usually small, but grows with the cost of the recompute
+        return time.time() - entry["delta"] * self.beta * math.log(1.0 - random.random()) >= entry["expires_at"]
+
+    def record(self, metric):
+        with self._lock:
+            self.metrics[metric] += 1
+
+    def stats(self):
+        with self._lock:
+            metrics = dict(self.metrics)
+        total = metrics["hits"] + metrics["misses"]
+        return {
+            **metrics,
+            "hit_ratio": round(metrics["hits"] / total, 4) if total else None,
+            **self.backend.info(),
+        }
+
+    def cached(self, ttl=None, tags=()):
+        """Cache a GET view's successful responses.
+
+        Tags may reference the view arguments, e.g. "car:{slug}". The decorator
+        must sit below @jwt_required so authentication still runs on every hit.
+
+        Only views answering every authenticated caller the same can be cached,
+        the key is no authorization: a view restricted to some roles checks
+        them in a decorator above this one, e.g. @admin_required. Stacking such
+        a decorator below, or a cached view answering 401/403, raises.
+
+        Below @conditional, an entry stored under another ETag than the
+        request's (g.etag) is a miss, the fingerprint moved since.
+        """
+
+        def decorator(view):
+            if getattr(view, "authorizes", False):
+                raise TypeError(f"@cache.cached must sit below the authorization decorators of {view.__name__}")
+
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method != "GET":
+                    return view(*args, **kwargs)
+
+                key = cache_key()
+                if key is None:
+                    self.record("bypasses")
+                    return view(*args, **kwargs)
+                etag = g.get("etag")
+                entry = self.get(key)
+                if entry is not None and entry.get("etag") != etag:
+                    entry = None
+                if entry is not None:
+                    if not self.should_refresh(entry):
+                        self.record("hits")
+                        return build_response(entry, "HIT")
+                    self.record("early_refreshes")
+                else:
+                    self.record("misses")
+
+                entry_ttl = ttl or self.default_ttl
+                resolved_tags = [tag.format(**kwargs) for tag in tags]
+
+                def compute():
+                    # Read the versions before running the view, so a write that lands
+                    # while we compute invalidates the entry we are about to store
+                    versions = self.tag_versions(resolved_tags)
+                    started = time.time()
+                    response = current_app.make_response(view(*args, **kwargs))
+                    finished = time.time()
+                    if response.status_code in (401, 403):
+                        # Its response depends on who asks, a hit would skip the check
+                        raise RuntimeError(f"{view.__name__} authorizes its callers and can't be cached")
+
+                    entry = {
+                        "body": response.get_data(),
+                        "status": response.status_code,
+                        "mimetype": response.mimetype,
+                        "tags": versions,
+                        "etag": etag,
+                        "delta": finished - started,
+                        "expires_at": finished + entry_ttl,
+                    }
+                    if response.status_code == 200:
+                        self.set(key, entry, ttl=entry_ttl)
+                    return entry
+
+                # Requests seeing different fingerprints mustn't share a body
+                entry, shared = self.flight.do(f"{key}|{etag}" if etag else key, compute)
+                if shared:
+                    self.record("coalesced")
+                return build_response(entry, "COALESCED" if shared else "MISS")
+
+            return wrapper
+
+        return decorator
+
+
+def cache_key():
+    """The view's key, by route, arguments and role, None when the response must not be cached.
+
+    Role specific responses never leak across roles. Tokens issued before
+    the role_id claim existed have no role to key by, their requests skip
+    the cache instead of sharing one key whatever the caller's role.
+    """
+    try:
+        role_id = get_jwt().get("role_id")
+    except RuntimeError:
+        role_id = None
+    if role_id is None:
+        return None
+
+    args = urlencode(sorted(request.args.items(multi=True)))
+    return f"view:{role_id}:{request.path}?{args}"
+
+
+def build_response(entry, state):
+    response = Response(entry["body"], status=entry["status"], mimetype=entry["mimetype"])
+    response.headers["X-Cache"] = state
+    return response
+
+
+def build_backend():
+    if Config.CACHE_REDIS_URL:
+        return RedisBackend(Config.CACHE_REDIS_URL)
+    return MemoryBackend(max_bytes=Config.CACHE_MAX_BYTES)
+
+
+cache = ResponseCache(build_backend(), default_ttl=Config.CACHE_DEFAULT_TTL)
@@ -0,0 +1,292 @@
+import csv
+import io
+import os
+import uuid
+from datetime import timedelta
+
+from cerberus import Validator
+from openpyxl import load_workbook
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import sessionmaker
+from config.config import Config
+from connector.mysql_connector import engine
+from models.cars import CarModel
+from models.car_categories import CarCategoryModel
+from models.import_reports import ImportReportModel, gmt_plus_7_now
+from schemas.cars_schema import add_car_schema
+from utils.cache import cache
+from utils.search_index import search_index
+from utils.slugs import allocate_slugs
+from utils.outbox import record
+
+IMPORT_COLUMNS = list(add_car_schema)
+INTEGER_COLUMNS = ["capacity", "registration_number"]
+FLOAT_COLUMNS = ["price"]
+
+
+class ImportFormatError(Exception):
+    """Raised when the uploaded file can't be read as a car sheet."""
+
+
+def read_rows(stream, filename):
+    """Yield (row_number, {column: value}) for every non-empty row of a CSV or XLSX file.
+
+    Rows are read one at a time, XLSX files are opened in openpyxl's
+    read-only mode, so a large file is never held in memory as a whole.
+    """
+    extension = os.path.splitext(filename or "")[1].lower()
+    if extension == ".csv":
+        rows = csv.reader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+        workbook = None
+    elif extension == ".xlsx":
+        try:
+            workbook = load_workbook(stream, read_only=True, data_only=True)
+        except Exception:
+            raise ImportFormatError("The file is not a valid XLSX workbook")
+        rows = workbook.active.iter_rows(values_only=True)
+    else:
+        raise ImportFormatError("Only .csv and .xlsx files can be imported")
+
+    try:
+        header = next(rows, None)
+        if header is None:
+            raise ImportFormatError("The file is empty")
+        header = [str(name).strip().lower().replace(" ", "_") if name is not None else "" for name in header]
+        missing = [column for column in IMPORT_COLUMNS if column not in header]
+        if missing:
+            raise ImportFormatError(f"Missing columns: {', '.join(missing)}")
+
+        for row_number, values in enumerate(rows, start=2):
+            row = {
+                name: value.strip() if isinstance(value, str) else value
+                for name, value in zip(header, values)
+                if name in IMPORT_COLUMNS
+            }
+            if all(value in [None, ""] for value in row.values()):
+                continue
+            yield row_number, row
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+
+def to_number(value, cast):
+    if isinstance(value, str):
+        return cast(value.replace(",", "")) if value else None
+    if cast is int and isinstance(value, float) and value.is_integer():
+        return int(value)
+    return cast(value) if value is not None else None
+
+
+def coerce_row(row):
+    """Cast a raw row to the types add_car_schema expects, returns (data, errors)."""
+    data = {}
+    errors = {}
+    for column in IMPORT_COLUMNS:
+        value = row.get(column)
+        if value in [None, ""]:
+            continue
+        try:
+            if column in INTEGER_COLUMNS:
+                data[column] = to_number(value, int)
+            elif column in FLOAT_COLUMNS:
+                data[column] = to_number(value, float)
+            else:
+                data[column] = str(value)
+        except (ValueError, TypeError):
+            errors[column] = ["must be a number"]
+    return data, errors
+
+
+class CarImporter:
+    """Imports cars from the rows of a CSV or XLSX sheet.
+
+    Rows are validated and inserted in chunks. Every chunk checks plate and
+    registration numbers with one IN query, resolves categories from a
+    cache loaded once, reserves slugs per distinct name, inserts its valid
+    rows with a single executemany and commits, so a large file never holds
+    one long transaction. Invalid rows are skipped and reported with their
+    row number.
+    """
+
+    def __init__(self, s, chunk_size=500, dry_run=False):
+        self.s = s
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.validator = Validator(add_car_schema)
+        self.categories = None
+        self.seen_plate_numbers = set()
+        self.seen_registration_numbers = set()
+        self.result = {"total": 0, "imported": 0, "failed": 0, "car_ids": [], "errors": []}
+
+    def run(self, rows):
+        chunk = []
+        for row_number, row in rows:
+            chunk.append((row_number, row))
+            if len(chunk) >= self.chunk_size:
+                self.import_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.import_chunk(chunk)
+
+        self.result["errors"].sort(key=lambda error: error["row"])
+        return self.result
+
+    def import_chunk(self, chunk):
+        self.result["total"] += len(chunk)
+        categories = self.load_categories()
+
+        valid = []
+        for row_number, row in chunk:
+            data, errors = coerce_row(row)
+            if not errors and not self.validator.validate(data):
+                errors = self.validator.errors
+            if not errors:
+                data["category_id"] = categories.get((data["car_brand"].lower(), data["type"].lower()))
+                if data["category_id"] is None:
+                    errors = {"car_brand": ["Car brand or type doesn't exist in database"]}
+                elif data["plate_number"] in self.seen_plate_numbers:
+                    errors = {"plate_number": ["Used by an earlier row of the file"]}
+                elif data["registration_number"] in self.seen_registration_numbers:
+                    errors = {"registration_number": ["Used by an earlier row of the file"]}
+
+            if errors:
+                self.fail(row_number, row, errors)
+                continue
+
+            self.seen_plate_numbers.add(data["plate_number"])
+            self.seen_registration_numbers.add(data["registration_number"])
+            valid.append((row_number, row, data))
+
+        valid = self.check_existing(valid)
+        if not valid:
+            return
+
+        if self.dry_run:
+            self.result["imported"] += len(valid)
+            return
+
+        # Reserve the slugs of the whole chunk, one counter bump per distinct name
+        slugs = allocate_slugs(self.s, [data["name"] for _, _, data in valid])
+        for (_, _, data), slug in zip(valid, slugs):
+            data["slug"] = slug
+
+        # Insert the whole chunk with a single executemany
+        columns = CarModel.__table__.columns.keys()
+        self.s.execute(
+            insert(CarModel),
+            [{column: data[column] for column in columns if column in data} for _, _, data in valid],
+        )
+
+        # The chunk's outbox events commit with its rows
+        data_by_plate_number = {data["plate_number"]: data for _, _, data in valid}
+        car_ids = []
+        for id, plate_number in self.s.query(CarModel.id, CarModel.plate_number).filter(
+            CarModel.plate_number.in_(data_by_plate_number)
+        ):
+            data = data_by_plate_number[plate_number]
+            record(self.s, "car", id, "car.created", {column: data[column] for column in columns if column in data})
+            car_ids.append(id)
+        self.s.commit()
+
+        self.result["imported"] += len(valid)
+        self.result["car_ids"] += car_ids
+
+    def load_categories(self):
+        # Categories are few and don't change during an import, load them once
+        if self.categories is None:
+            self.categories = {
+                (category.car_brand.lower(), category.type.lower()): category.id
+                for category in self.s.query(CarCategoryModel.id, CarCategoryModel.car_brand, CarCategoryModel.type)
+            }
+        return self.categories
+
+    def check_existing(self, valid):
+        if not valid:
+            return valid
+
+        # One query for the plate & registration numbers of the whole chunk
+        plate_numbers = [data["plate_number"] for _, _, data in valid]
+        registration_numbers = [data["registration_number"] for _, _, data in valid]
+        existing_plate_numbers = set()
+        existing_registration_numbers = set()
+        existing_cars = self.s.query(CarModel.plate_number, CarModel.registration_number).filter(
+            or_(CarModel.plate_number.in_(plate_numbers), CarModel.registration_number.in_(registration_numbers))
+        )
+        for plate_number, registration_number in existing_cars:
+            existing_plate_numbers.add(plate_number)
+            existing_registration_numbers.add(registration_number)
+
+        remaining = []
+        for row_number, row, data in valid:
+            errors = {}
+            if data["plate_number"] in existing_plate_numbers:
+                errors["plate_number"] = ["Already used by another car"]
+            if data["registration_number"] in existing_registration_numbers:
+                errors["registration_number"] = ["Already used by another car"]
+            if errors:
+                self.fail(row_number, row, errors)
+            else:
+                remaining.append((row_number, row, data))
+        return remaining
+
+    def fail(self, row_number, row, errors):
+        self.result["failed"] += 1
+        self.result["errors"].append({"row": row_number, "errors": errors, "values": row})
+
+
+def error_report(errors):
+    """CSV of the rejected rows, with their original values so they can be fixed and imported again."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["row", "errors", *IMPORT_COLUMNS])
+    for error in errors:
+        messages = "; ".join(f"{field}: {', '.join(map(str, reasons))}" for field, reasons in error["errors"].items())
+        writer.writerow([error["row"], messages, *[error["values"].get(column, "") for column in IMPORT_COLUMNS]])
+    return output.getvalue().encode("utf-8-sig")
+
+
+def save_error_report(s, errors):
+    """Store the error report for IMPORT_REPORT_TTL seconds, returns its id."""
+    report = ImportReportModel(
+        id=uuid.uuid4().hex,
+        content=error_report(errors),
+        expires_at=gmt_plus_7_now() + timedelta(seconds=Config.IMPORT_REPORT_TTL),
+    )
+    s.add(report)
+    s.commit()
+    return report.id
+
+
+def load_error_report(s, report_id):
+    report = (
+        s.query(ImportReportModel)
+        .filter(ImportReportModel.id == report_id, ImportReportModel.expires_at > gmt_plus_7_now())
+        .first()
+    )
+    return report.content if report else None
+
+
+def prune_import_reports():
+    """Drop the expired error reports."""
+    Session = sessionmaker(bind=engine)
+    s = Session()
+    try:
+        pruned = (
+            s.query(ImportReportModel)
+            .filter(ImportReportModel.expires_at <= gmt_plus_7_now())
+            .delete(synchronize_session=False)
+        )
+        s.commit()
+        return pruned
+    except Exception:
+        s.rollback()
+        raise
+    finally:
+        s.close()
+
+
+def refresh_imported_cars(car_ids, chunk_size=500):
+    cache.invalidate("cars:list", "analytics:utilization")
+    for start in range(0, len(car_ids), chunk_size):
+        search_index.index_cars(car_ids[start : start + chunk_size])
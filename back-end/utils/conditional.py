@@ -0,0 +1,73 @@
+import hashlib
+from datetime import timedelta, timezone
+from functools import wraps
+
+from flask import current_app, g, request, Response
+
+
+def conditional(fingerprint):
+    """Answer conditional GETs with a 304 before the view queries or serializes anything.
+
+    fingerprint(**view_kwargs) returns (last_modified, token) computed with a
+    cheap aggregate query, or None when the resource doesn't exist (the view
+    then runs normally and answers with its own 404).
+
+    The ETag is left in g.etag for a @cache.cached view below, which only
+    serves an entry stored under the same ETag, so a body never outlives
+    the fingerprint it is announced with.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            validators = fingerprint(**kwargs)
+            if validators is None:
+                return view(*args, **kwargs)
+
+            last_modified, token = validators
+            etag = make_etag(last_modified, token)
+            last_modified = to_utc(last_modified)
+
+            if is_not_modified(etag, last_modified):
+                response = Response(status=304)
+            else:
+                g.etag = etag
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            if last_modified is not None:
+                response.last_modified = last_modified
+            # Let the browser keep the body but revalidate it on every use
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def make_etag(last_modified, token):
+    raw = f"{request.full_path}|{last_modified.isoformat() if last_modified else ''}|{token}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def to_utc(value):
+    # Timestamps in the database are naive GMT+7 (see gmt_plus_7_now in the models)
+    if value is None:
+        return None
+    return (value - timedelta(hours=7)).replace(tzinfo=timezone.utc, microsecond=0)
+
+
+def is_not_modified(etag, last_modified):
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since and last_modified is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def latest(*values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
@@ -0,0 +1,76 @@
+from sqlalchemy import and_, exists, func, select
+from models.drivers import DriverModel
+from models.transactions import TransactionModel
+from utils.booking_holds import hold_active
+
+# Bookings that still hold their driver for their dates
+ACTIVE_RENTAL_STATUSES = ["Pending", "In Progress"]
+
+# Drivers the admin took off duty, whatever their bookings
+OFF_DUTY_STATUS = "Unavailable"
+
+# Candidates tried by assign_driver before giving up, each one may be taken concurrently
+ASSIGN_ATTEMPTS = 3
+
+
+def overlapping_booking(start_date, end_date, exclude_transaction_id=None):
+    """EXISTS clause for an active booking of the outer driver that overlaps the dates.
+
+    Both ends are inclusive, a driver returning a car on a day isn't free for
+    another booking starting that day. The lookup is served by the
+    (driver_id, start_date, end_date) index of transactions.
+    """
+    conditions = [
+        TransactionModel.driver_id == DriverModel.id,
+        TransactionModel.start_date <= end_date,
+        TransactionModel.end_date >= start_date,
+        TransactionModel.rental_status.in_(ACTIVE_RENTAL_STATUSES),
+        hold_active(),
+    ]
+    if exclude_transaction_id is not None:
+        conditions.append(TransactionModel.id != exclude_transaction_id)
+    return exists().where(and_(*conditions))
+
+
+def active_bookings():
+    """Number of active bookings of the outer driver, how loaded they are."""
+    return (
+        select(func.count(TransactionModel.id))
+        .where(
+            TransactionModel.driver_id == DriverModel.id,
+            TransactionModel.rental_status.in_(ACTIVE_RENTAL_STATUSES),
+            hold_active(),
+        )
+        .correlate(DriverModel)
+        .scalar_subquery()
+    )
+
+
+def free_drivers(query, start_date, end_date):
+    """Narrow a DriverModel query to the on duty drivers without a booking on the dates, least loaded first."""
+    load = active_bookings().label("active_bookings")
+    return (
+        query.add_columns(load)
+        .filter(DriverModel.status != OFF_DUTY_STATUS, ~overlapping_booking(start_date, end_date))
+        .order_by(load, DriverModel.id)
+    )
+
+
+def is_driver_free(s, driver, start_date, end_date):
+    """Lock the driver and check their dates, so two bookings can't take the same driver at once."""
+    locked = s.query(DriverModel).filter_by(id=driver.id).with_for_update().first()
+    if not locked or locked.status == OFF_DUTY_STATUS:
+        return False
+
+    busy = s.query(overlapping_booking(start_date, end_date)).select_from(DriverModel).filter(DriverModel.id == driver.id)
+    return not busy.scalar()
+
+
+def assign_driver(s, start_date, end_date):
+    """Pick the least loaded driver that is free on the dates, None when everyone is busy."""
+    candidates = free_drivers(s.query(DriverModel), start_date, end_date).limit(ASSIGN_ATTEMPTS).all()
+    for driver, _ in candidates:
+        # Another booking may have taken the driver since the candidates were read
+        if is_driver_free(s, driver, start_date, end_date):
+            return driver
+    return None
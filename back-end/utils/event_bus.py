@@ -0,0 +1,150 @@
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+
+from config.config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One stream's queue of messages, bounded so a stalled client can't hold memory."""
+
+    def __init__(self, accepts, size):
+        self.accepts = accepts
+        self.queue = queue.Queue(maxsize=size)
+        self.overflowed = False
+
+    def push(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout):
+        """The next message, None when nothing arrived within the timeout or an overflow was drained."""
+        try:
+            return self.queue.get(block=not self.overflowed, timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class EventBus:
+    """In-process fan-out of status changes to the open event streams.
+
+    A publish costs one non-blocking put per matching stream, idle streams
+    cost a queue each and no thread of their own when served by a gevent
+    worker. The last messages are kept so a reconnecting stream resumes
+    from its Last-Event-ID. With a Redis URL, messages are relayed through
+    a channel and numbered by a shared counter, every worker's streams see
+    the writes of all the workers under the same ids.
+    """
+
+    def __init__(self, history_size=1000, queue_size=100, max_subscribers=5000, redis_url=None, channel="events"):
+        self.queue_size = queue_size
+        self.max_subscribers = max_subscribers
+        self.channel = channel
+        self._history = deque(maxlen=history_size)
+        self._subscribers = set()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._redis = None
+        self._listener = None
+        if redis_url:
+            import redis
+
+            self._redis = redis.Redis.from_url(redis_url)
+
+    def publish(self, event_type, data, user_id=None):
+        """Send a message to the streams, user_id limits it to that user & the admins."""
+        message = {"type": event_type, "data": data, "user_id": user_id}
+        if self._redis is not None:
+            message["id"] = self._redis.incr(f"{self.channel}:id")
+            self._redis.publish(self.channel, json.dumps(message, default=str))
+        else:
+            with self._lock:
+                message["id"] = next(self._ids)
+                self._dispatch(message)
+
+    def subscribe(self, accepts, last_id=None):
+        """Open a subscription, returns it with the missed messages to replay first.
+
+        The replay is None when the messages after last_id are no longer kept,
+        the stream must then tell its client to reload. None is returned in
+        place of the subscription when max_subscribers streams are open.
+        """
+        self._start_listener()
+        subscription = Subscription(accepts, self.queue_size)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None, []
+
+            self._subscribers.add(subscription)
+            replay = []
+            if last_id is not None:
+                # A gap after last_id, or an id from before the history started or the counter restarted
+                if not self._history:
+                    replay = None if last_id > 0 else []
+                elif self._history[0]["id"] > last_id + 1 or last_id > self._history[-1]["id"]:
+                    replay = None
+                else:
+                    replay = [message for message in self._history if message["id"] > last_id and accepts(message)]
+        return subscription, replay
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def newest_id(self):
+        with self._lock:
+            return self._history[-1]["id"] if self._history else 0
+
+    def info(self):
+        with self._lock:
+            return {"subscribers": len(self._subscribers), "history": len(self._history)}
+
+    def _dispatch(self, message):
+        # Called under the lock, so every stream receives the messages in id order
+        self._history.append(message)
+        for subscription in list(self._subscribers):
+            if subscription.accepts(message):
+                subscription.push(message)
+                if subscription.overflowed:
+                    self._subscribers.discard(subscription)
+
+    def _start_listener(self):
+        if self._redis is None or self._listener is not None:
+            return
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="event-bus-listener", daemon=True)
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for raw in pubsub.listen():
+                    try:
+                        message = json.loads(raw["data"])
+                    except (ValueError, TypeError):
+                        continue
+                    with self._lock:
+                        self._dispatch(message)
+            except Exception:
+                # Streams resume from the history once the connection is back
+                logger.error("Event bus listener failed", exc_info=True)
+                time.sleep(1)
+
+
+event_bus = EventBus(
+    history_size=Config.EVENTS_HISTORY_SIZE,
+    queue_size=Config.EVENTS_QUEUE_SIZE,
+    max_subscribers=Config.EVENTS_MAX_SUBSCRIBERS,
+    redis_url=Config.CACHE_REDIS_URL,
+)
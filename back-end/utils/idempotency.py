@@ -0,0 +1,123 @@
+import hashlib
+import pickle
+from functools import wraps
+
+from flask import current_app, request, Response
+from flask_jwt_extended import get_jwt_identity
+from config.config import Config
+from utils.cache import MemoryBackend, RedisBackend
+from utils.handle_response import ResponseHandler
+from utils.singleflight import SingleFlight
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# Returned by the leader when another process already runs the request
+_IN_PROGRESS = object()
+
+
+def request_fingerprint():
+    """Hash of what the request asks for, so a key reused for another request is caught.
+
+    Multipart bodies are hashed field by field, a retried upload gets a new
+    boundary from the client but has the same fields & files.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.path}?{sorted(request.args.items(multi=True))}".encode())
+
+    if request.mimetype == "multipart/form-data":
+        for name, value in sorted(request.form.items(multi=True)):
+            digest.update(f"form:{name}={value}".encode())
+        for name, file in sorted(request.files.items(multi=True), key=lambda item: (item[0], item[1].filename or "")):
+            digest.update(f"file:{name}:{file.filename}".encode())
+            for chunk in iter(lambda: file.stream.read(64 * 1024), b""):
+                digest.update(chunk)
+            file.stream.seek(0)
+    else:
+        digest.update(request.get_data(cache=True))
+
+    return digest.hexdigest()
+
+
+class IdempotencyStore:
+    """Answers retried requests that carry an Idempotency-Key header with the first response.
+
+    A key belongs to one user and one route. Its first request runs the view
+    and the response is kept for the TTL, unless it is a server error that
+    a retry may fix. A replay with the same body gets the stored response
+    without running the view, one with a different body is refused.
+    Duplicates arriving while the first request still runs wait for it
+    inside a process, another process holding the key's lock answers 409.
+    """
+
+    def __init__(self, backend, ttl=24 * 60 * 60, lock_ttl=120):
+        self.backend = backend
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.flight = SingleFlight(timeout=lock_ttl)
+
+    def idempotent(self, view):
+        # Must sit below @jwt_required, keys are scoped to the user
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = request.headers.get(IDEMPOTENCY_HEADER)
+            if key is None:
+                return view(*args, **kwargs)
+
+            key = key.strip()
+            if not key or len(key) > 255:
+                return ResponseHandler.error(message=f"{IDEMPOTENCY_HEADER} must be 1 to 255 characters", status=400)
+
+            scope = f"{get_jwt_identity()}:{request.method}:{request.path}:{key}"
+            store_key = f"idempotency:{hashlib.sha256(scope.encode()).hexdigest()}"
+            fingerprint = request_fingerprint()
+
+            def run():
+                raw = self.backend.get(store_key)
+                if raw is not None:
+                    return pickle.loads(raw), True
+
+                # Only one process runs the request, the lock expires if it dies midway
+                lock_key = f"{store_key}:lock"
+                if not self.backend.add(lock_key, b"1", ttl=self.lock_ttl):
+                    return _IN_PROGRESS, False
+
+                try:
+                    response = current_app.make_response(view(*args, **kwargs))
+                    entry = {
+                        "fingerprint": fingerprint,
+                        "body": response.get_data(),
+                        "status": response.status_code,
+                        "mimetype": response.mimetype,
+                    }
+                    if response.status_code < 500:
+                        self.backend.set(store_key, pickle.dumps(entry), ttl=self.ttl)
+                    return entry, False
+                finally:
+                    self.backend.delete(lock_key)
+
+            (entry, replayed), shared = self.flight.do(store_key, run)
+            if entry is _IN_PROGRESS:
+                return ResponseHandler.error(
+                    message=f"A request with this {IDEMPOTENCY_HEADER} is still in progress, retry later", status=409
+                )
+            if entry["fingerprint"] != fingerprint:
+                return ResponseHandler.error(
+                    message=f"This {IDEMPOTENCY_HEADER} was already used for a different request", status=422
+                )
+
+            response = Response(entry["body"], status=entry["status"], mimetype=entry["mimetype"])
+            response.headers[IDEMPOTENCY_HEADER] = key
+            if replayed or shared:
+                response.headers["Idempotent-Replayed"] = "true"
+            return response
+
+        return wrapper
+
+
+def build_backend():
+    if Config.CACHE_REDIS_URL:
+        return RedisBackend(Config.CACHE_REDIS_URL, prefix="linggar-jati:")
+    return MemoryBackend(max_bytes=Config.IDEMPOTENCY_MAX_BYTES)
+
+
+idempotency = IdempotencyStore(build_backend(), ttl=Config.IDEMPOTENCY_TTL, lock_ttl=Config.IDEMPOTENCY_LOCK_TTL)
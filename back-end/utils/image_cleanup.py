@@ -0,0 +1,210 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, or_, union_all, select, func, case
+from sqlalchemy.orm import sessionmaker
+from config.config import Config
+from connector.mysql_connector import engine
+from models.cars import CarModel
+from models.car_images import CarImageModel
+from models.transactions import TransactionModel
+from models.transactions_archive import TransactionArchiveModel
+from models.image_deletions import ImageDeletionModel, gmt_plus_7_now
+from utils.storage import storage
+
+# Seconds a worker owns a claimed batch, another worker picks it up after that if we died
+CLAIM_LEASE = 5 * 60
+# Retry delays double with every attempt, up to this many seconds
+MAX_BACKOFF = 6 * 60 * 60
+# Orphans found by the reconciler are inserted this many rows at a time
+RECONCILE_CHUNK = 500
+
+
+def enqueue_image_deletions(s, urls):
+    """Queue stored images for deletion, as part of the caller's transaction."""
+    urls = list(dict.fromkeys(url for url in urls if url))
+    if urls:
+        s.execute(insert(ImageDeletionModel), [{"url": url} for url in urls])
+
+
+def referenced_urls(s, urls):
+    # The local store deduplicates identical uploads, so one blob can back several rows
+    if not urls:
+        return set()
+
+    car_rows = s.query(CarModel.image, CarModel.image_thumbnail, CarModel.image_card).filter(
+        or_(CarModel.image.in_(urls), CarModel.image_thumbnail.in_(urls), CarModel.image_card.in_(urls))
+    )
+    image_rows = s.query(CarImageModel.url, CarImageModel.thumbnail_url, CarImageModel.card_url).filter(
+        or_(CarImageModel.url.in_(urls), CarImageModel.thumbnail_url.in_(urls), CarImageModel.card_url.in_(urls))
+    )
+    proof_rows = s.query(TransactionModel.payment_proof).filter(TransactionModel.payment_proof.in_(urls))
+    # Archived rentals keep their payment proofs
+    archived_proof_rows = s.query(TransactionArchiveModel.payment_proof).filter(
+        TransactionArchiveModel.payment_proof.in_(urls)
+    )
+
+    return {url for row in [*car_rows, *image_rows, *proof_rows, *archived_proof_rows] for url in row if url in urls}
+
+
+def all_referenced_urls(s):
+    columns = [
+        CarModel.image,
+        CarModel.image_thumbnail,
+        CarModel.image_card,
+        CarImageModel.url,
+        CarImageModel.thumbnail_url,
+        CarImageModel.card_url,
+        TransactionModel.payment_proof,
+        TransactionArchiveModel.payment_proof,
+        ImageDeletionModel.url,
+    ]
+    query = union_all(*[select(column.label("url")).where(column.is_not(None)) for column in columns])
+    return {url for (url,) in s.execute(query)}
+
+
+def backoff(attempts):
+    return timedelta(seconds=min(60 * 2 ** (attempts - 1), MAX_BACKOFF))
+
+
+class ImageCleanup:
+    """Deletes queued images from the storage, and finds images nothing points to.
+
+    Request handlers only insert into image_deletions inside their own
+    transaction, so a deletion is never lost and never slows the request down.
+    The worker claims due rows with SKIP LOCKED and a lease, so several
+    processes can drain the queue at once, and deletes through the backend's
+    bulk API. Rows that keep failing stop being retried after max_attempts
+    and stay in the table for inspection.
+    """
+
+    def __init__(self, storage, bind, batch_size=100, max_attempts=8, grace=3600):
+        self.storage = storage
+        self.Session = sessionmaker(bind=bind)
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.grace = grace
+
+    def drain(self, max_batches=100):
+        totals = {"deleted": 0, "still_referenced": 0, "failed": 0}
+        for _ in range(max_batches):
+            result = self.drain_batch()
+            if result is None:
+                break
+            for key, value in result.items():
+                totals[key] += value
+        return totals
+
+    def drain_batch(self):
+        """Process one batch of due deletions, None when the queue has nothing due."""
+        s = self.Session()
+        try:
+            now = gmt_plus_7_now()
+            rows = (
+                s.query(ImageDeletionModel)
+                .filter(
+                    ImageDeletionModel.next_attempt_at <= now,
+                    ImageDeletionModel.attempts < self.max_attempts,
+                )
+                .order_by(ImageDeletionModel.id)
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if not rows:
+                s.commit()
+                return None
+
+            # Claim the batch, the row locks must not be held while we talk to the storage
+            batch = [(row.id, row.url, row.attempts) for row in rows]
+            for row in rows:
+                row.next_attempt_at = now + timedelta(seconds=CLAIM_LEASE)
+            s.commit()
+
+            urls = {url for _, url, _ in batch}
+            # A blob can be used again after it was queued, e.g. a re-upload of the same file
+            still_used = referenced_urls(s, list(urls))
+            failed = self.storage.delete_many(urls - still_used)
+            s.rollback()
+
+            done_ids = [id for id, url, _ in batch if url not in failed]
+            if done_ids:
+                s.query(ImageDeletionModel).filter(ImageDeletionModel.id.in_(done_ids)).delete(
+                    synchronize_session=False
+                )
+
+            retry_at = gmt_plus_7_now()
+            for id, url, attempts in batch:
+                if url in failed:
+                    s.query(ImageDeletionModel).filter_by(id=id).update(
+                        {
+                            "attempts": attempts + 1,
+                            "last_error": failed[url][:255],
+                            "next_attempt_at": retry_at + backoff(attempts + 1),
+                        },
+                        synchronize_session=False,
+                    )
+            s.commit()
+
+            return {
+                "deleted": len(urls - still_used) - len(failed),
+                "still_referenced": len(still_used),
+                "failed": len(failed),
+            }
+
+        except Exception:
+            s.rollback()
+            raise
+
+        finally:
+            s.close()
+
+    def reconcile(self, dry_run=False):
+        """Queue the stored images older than the grace period that no row references."""
+        # Blobs younger than the grace period may belong to an upload whose row isn't committed yet
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.grace)
+
+        s = self.Session()
+        try:
+            known = all_referenced_urls(s)
+            s.rollback()
+
+            scanned = 0
+            orphans = []
+            for url, created_at in self.storage.list_blobs():
+                scanned += 1
+                if created_at < cutoff and url not in known:
+                    orphans.append(url)
+
+            if not dry_run:
+                for start in range(0, len(orphans), RECONCILE_CHUNK):
+                    enqueue_image_deletions(s, orphans[start : start + RECONCILE_CHUNK])
+                s.commit()
+
+            return {"scanned": scanned, "orphans": len(orphans), "urls": orphans if dry_run else []}
+
+        except Exception:
+            s.rollback()
+            raise
+
+        finally:
+            s.close()
+
+    def stats(self):
+        s = self.Session()
+        try:
+            is_dead = ImageDeletionModel.attempts >= self.max_attempts
+            queued, dead = s.query(
+                func.count(ImageDeletionModel.id), func.coalesce(func.sum(case((is_dead, 1), else_=0)), 0)
+            ).one()
+            return {"queued": queued - int(dead), "dead": int(dead)}
+        finally:
+            s.close()
+
+
+image_cleanup = ImageCleanup(
+    storage,
+    engine,
+    batch_size=Config.IMAGE_CLEANUP_BATCH_SIZE,
+    max_attempts=Config.IMAGE_CLEANUP_MAX_ATTEMPTS,
+    grace=Config.IMAGE_RECONCILE_GRACE,
+)
@@ -0,0 +1,96 @@
+from concurrent.futures import ProcessPoolExecutor
+import io
+import os
+import threading
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+from config.config import Config
+
+# Variant name -> longest side in pixels
+CAR_IMAGE_VARIANTS = {"thumbnail": 160, "card": 480, "full": 1600}
+PAYMENT_PROOF_VARIANTS = {"full": 1600}
+
+FORMAT_EXTENSIONS = {"WEBP": "webp", "JPEG": "jpg"}
+
+
+class ImageProcessingError(Exception):
+    """Raised when an uploaded file can't be decoded as an image."""
+
+    def __init__(self, filename):
+        super().__init__(f"{filename} is not a valid image")
+        self.filename = filename
+
+
+def process_image(data, variants, image_format="WEBP", quality=80):
+    """Decode an image once and re-encode it at every variant size.
+
+    Runs in a worker process. Metadata (EXIF, GPS, ICC) is dropped by not
+    passing it to save(), after the EXIF orientation has been applied.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGB")
+
+        encoded = {}
+        for name, size in variants.items():
+            variant = image.copy()
+            # Only ever shrink, thumbnail() keeps the aspect ratio
+            variant.thumbnail((size, size), Image.LANCZOS)
+
+            output = io.BytesIO()
+            if image_format == "JPEG":
+                variant.save(output, format="JPEG", quality=quality, optimize=True, progressive=True)
+            else:
+                variant.save(output, format=image_format, quality=quality)
+            encoded[name] = output.getvalue()
+
+        return encoded
+
+
+class ImageProcessor:
+    """Resizes and recompresses uploads in a process pool before they are stored."""
+
+    def __init__(self, max_workers=2, image_format="WEBP", quality=80):
+        self.max_workers = max_workers
+        self.image_format = image_format
+        self.quality = quality
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def extension(self):
+        return FORMAT_EXTENSIONS.get(self.image_format, self.image_format.lower())
+
+    def process_many(self, files, variants):
+        """Turn (filename, data) pairs into one {variant: (filename, data)} dict per file."""
+        futures = [
+            (filename, self._pool().submit(process_image, data, variants, self.image_format, self.quality))
+            for filename, data in files
+        ]
+
+        processed = []
+        for filename, future in futures:
+            try:
+                encoded = future.result()
+            except (UnidentifiedImageError, OSError):
+                raise ImageProcessingError(filename)
+
+            stem = os.path.splitext(filename or "image")[0]
+            processed.append(
+                {name: (f"{stem}-{name}.{self.extension}", data) for name, data in encoded.items()}
+            )
+        return processed
+
+    def _pool(self):
+        # Started on first use, so importing the app doesn't fork worker processes
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+
+image_processor = ImageProcessor(
+    max_workers=Config.IMAGE_PROCESS_WORKERS,
+    image_format=Config.IMAGE_FORMAT,
+    quality=Config.IMAGE_QUALITY,
+)
@@ -0,0 +1,259 @@
+import json
+import os
+import queue
+from datetime import timedelta
+from flask_jwt_extended import get_jwt_identity
+from sqlalchemy import event, insert, inspect, text
+from sqlalchemy.orm import Session, sessionmaker
+from config.config import Config
+from connector.mysql_connector import engine
+from models.outbox_events import OutboxEventModel, gmt_plus_7_now
+
+# MySQL named lock electing the one relay publishing at a time
+RELAY_LOCK = "outbox_relay"
+
+
+def record(s, aggregate_type, aggregate, event_type, payload):
+    """Queue an outbox event, written by s's next commit in the same transaction.
+
+    aggregate is the changed row or its id, a row added in this session
+    gets its id from the flush preceding the write.
+    """
+    s.info.setdefault("outbox_events", []).append((aggregate_type, aggregate, event_type, payload, current_actor()))
+
+
+def changes_of(row, fields):
+    """The new values of the fields changed on a row since it was loaded, before the flush."""
+    state = inspect(row)
+    changes = {}
+    for field in fields:
+        history = state.attrs[field].history
+        if history.added and list(history.added) != list(history.deleted):
+            changes[field] = history.added[0]
+    return changes
+
+
+def current_actor():
+    try:
+        identity = get_jwt_identity()
+    except RuntimeError:
+        # A background job or a request without a token
+        return None
+    return int(identity) if identity is not None else None
+
+
+def to_json(payload):
+    # Dates & decimals are stored the way the API serializes them
+    return json.loads(json.dumps(payload, default=str))
+
+
+@event.listens_for(Session, "before_commit")
+def write_outbox(session):
+    pending = session.info.pop("outbox_events", [])
+    transitions = session.info.get("transition_events", [])
+    if not pending and not transitions:
+        return
+
+    # Flushed first so the changed rows are locked, a concurrent change of the
+    # same aggregate writes its events after this transaction commits
+    session.flush()
+    for transaction, transition_event in transitions:
+        if transaction is not None:
+            transition_event["transaction_id"] = transaction.id
+    rows = [
+        {
+            "aggregate_type": "transaction",
+            "aggregate_id": transition_event["transaction_id"],
+            "event_type": f"transaction.{transition_event['event']}",
+            "payload": to_json(transition_event),
+            "actor_id": current_actor(),
+            "created_at": gmt_plus_7_now(),
+        }
+        for transaction, transition_event in transitions
+    ]
+    rows += [
+        {
+            "aggregate_type": aggregate_type,
+            "aggregate_id": aggregate if isinstance(aggregate, int) else aggregate.id,
+            "event_type": event_type,
+            "payload": to_json(payload),
+            "actor_id": actor_id,
+            "created_at": gmt_plus_7_now(),
+        }
+        for aggregate_type, aggregate, event_type, payload, actor_id in pending
+    ]
+    session.execute(insert(OutboxEventModel), rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_outbox(session):
+    session.info.pop("outbox_events", None)
+
+
+class LogSink:
+    """Appends the events to a JSON lines file."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def publish(self, events):
+        with open(self.path, "a", encoding="utf-8") as log:
+            log.write("".join(json.dumps(outbox_event, default=str) + "\n" for outbox_event in events))
+            log.flush()
+            os.fsync(log.fileno())
+
+
+class BusSink:
+    """Hands the events to the handlers subscribed in this process, in order."""
+
+    def __init__(self):
+        self.handlers = []
+
+    def subscribe(self, handler):
+        self.handlers.append(handler)
+        return handler
+
+    def publish(self, events):
+        for outbox_event in events:
+            for handler in self.handlers:
+                handler(outbox_event)
+
+
+class QueueSink:
+    """Bounded local queue standing in for a message broker, consumers get() the events."""
+
+    def __init__(self, maxsize=10000, timeout=1):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.timeout = timeout
+
+    def publish(self, events):
+        for outbox_event in events:
+            # A full queue fails the batch, it is published again once consumers catch up
+            self.queue.put(outbox_event, timeout=self.timeout)
+
+
+class OutboxRelay:
+    """Publishes the outbox to the sinks in batches, in id order.
+
+    Only one relay runs at a time, elected with a MySQL named lock held by
+    its own connection for the whole drain, the other workers' relays skip
+    their turn. Batches are read and marked published in short transactions
+    of their own, no row lock is held while the sinks publish, so the
+    requests inserting outbox rows never wait for a slow sink. A batch is
+    marked published only when every sink took it, otherwise it is retried
+    whole by the next run: delivery is at least once and consumers skip the
+    event ids they have seen. The events of an aggregate are never published
+    out of order.
+    """
+
+    def __init__(self, bind, sinks, batch_size=500):
+        self.bind = bind
+        self.Session = sessionmaker(bind=bind)
+        self.sinks = sinks
+        self.batch_size = batch_size
+
+    def drain(self):
+        with self.bind.connect() as lock_connection:
+            if not self._acquire(lock_connection):
+                return 0
+            try:
+                total = 0
+                while True:
+                    published = self.relay_batch()
+                    total += published
+                    if published < self.batch_size:
+                        return total
+            finally:
+                self._release(lock_connection)
+
+    def _acquire(self, lock_connection):
+        if lock_connection.dialect.name != "mysql":
+            # SQLite has no named locks, its single writer only runs one relay
+            return True
+        # The lock belongs to the connection, not to a transaction, and is freed if this process dies
+        acquired = lock_connection.execute(text("SELECT GET_LOCK(:name, 0)"), {"name": RELAY_LOCK}).scalar()
+        lock_connection.commit()
+        return acquired == 1
+
+    def _release(self, lock_connection):
+        if lock_connection.dialect.name == "mysql":
+            lock_connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": RELAY_LOCK})
+            lock_connection.commit()
+
+    def relay_batch(self):
+        s = self.Session()
+        try:
+            batch = (
+                s.query(OutboxEventModel)
+                .filter(OutboxEventModel.published_at.is_(None))
+                .order_by(OutboxEventModel.id)
+                .limit(self.batch_size)
+                .all()
+            )
+            events = [outbox_event.to_dictionaries() for outbox_event in batch]
+            ids = [outbox_event.id for outbox_event in batch]
+            # Ends the read, nothing stays locked while the sinks publish
+            s.commit()
+            if not ids:
+                return 0
+
+            try:
+                for sink in self.sinks:
+                    sink.publish(events)
+            except Exception as e:
+                self._mark(s, ids, {"last_error": f"{type(e).__name__}: {str(e)}"})
+                raise
+
+            self._mark(s, ids, {"published_at": gmt_plus_7_now(), "last_error": None})
+            return len(ids)
+        except Exception:
+            s.rollback()
+            raise
+        finally:
+            s.close()
+
+    def _mark(self, s, ids, values):
+        s.query(OutboxEventModel).filter(OutboxEventModel.id.in_(ids)).update(
+            {**values, "attempts": OutboxEventModel.attempts + 1}, synchronize_session=False
+        )
+        s.commit()
+
+    def prune(self):
+        """Drop the published events older than the retention."""
+        s = self.Session()
+        try:
+            cutoff = gmt_plus_7_now() - timedelta(days=Config.OUTBOX_RETENTION_DAYS)
+            pruned = (
+                s.query(OutboxEventModel)
+                .filter(OutboxEventModel.published_at.is_not(None), OutboxEventModel.created_at < cutoff)
+                .delete(synchronize_session=False)
+            )
+            s.commit()
+            return pruned
+        except Exception:
+            s.rollback()
+            raise
+        finally:
+            s.close()
+
+
+def build_sinks(names):
+    available = {
+        "log": lambda: LogSink(Config.OUTBOX_LOG_PATH),
+        "bus": lambda: outbox_bus,
+        "queue": lambda: outbox_queue,
+    }
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(f"Unknown outbox sinks: {', '.join(unknown)}")
+    return [available[name]() for name in names]
+
+
+# Consumers in this process subscribe to the bus or read the queue
+outbox_bus = BusSink()
+outbox_queue = QueueSink(maxsize=Config.OUTBOX_QUEUE_SIZE)
+outbox_relay = OutboxRelay(
+    engine,
+    build_sinks([name.strip() for name in Config.OUTBOX_SINKS.split(",") if name.strip()]),
+    batch_size=Config.OUTBOX_BATCH_SIZE,
+)
@@ -0,0 +1,85 @@
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import sessionmaker
+from connector.mysql_connector import engine
+from models.cars import CarModel
+from models.users import UserModel
+from models.transactions import TransactionModel
+from models.overdue_rentals import OverdueRentalModel, gmt_plus_7_now
+from utils.cache import cache
+from utils.pricing import pricing, to_decimal
+
+
+class OverdueProjector:
+    """Rebuilds the overdue_rentals projection from the in progress rentals.
+
+    The overdue rentals are found with one query served by the
+    (rental_status, end_date) index, their running late fees are priced in
+    one vectorized pass and the projection is replaced in a single
+    transaction, readers see either the previous list or the new one.
+    """
+
+    def __init__(self, bind):
+        self.Session = sessionmaker(bind=bind)
+
+    def refresh(self):
+        s = self.Session()
+        try:
+            now = gmt_plus_7_now()
+            today = now.date()
+            rows = (
+                s.query(
+                    TransactionModel.id,
+                    TransactionModel.invoice,
+                    TransactionModel.user_id,
+                    TransactionModel.car_id,
+                    TransactionModel.driver_id,
+                    TransactionModel.end_date,
+                    UserModel.name.label("customer_name"),
+                    UserModel.phone_number.label("customer_phone_number"),
+                    CarModel.slug.label("car_slug"),
+                    CarModel.name.label("car_name"),
+                )
+                .join(UserModel, UserModel.id == TransactionModel.user_id)
+                .join(CarModel, CarModel.id == TransactionModel.car_id)
+                .filter(TransactionModel.rental_status == "In Progress", TransactionModel.end_date < today)
+                .all()
+            )
+
+            days_late = [(today - row.end_date).days for row in rows]
+            late_fees = pricing.late_fees(days_late)
+
+            s.execute(delete(OverdueRentalModel))
+            if rows:
+                s.execute(
+                    insert(OverdueRentalModel),
+                    [
+                        {
+                            "transaction_id": row.id,
+                            "invoice": row.invoice,
+                            "user_id": row.user_id,
+                            "customer_name": row.customer_name,
+                            "customer_phone_number": row.customer_phone_number,
+                            "car_id": row.car_id,
+                            "car_slug": row.car_slug,
+                            "car_name": row.car_name,
+                            "driver_id": row.driver_id,
+                            "end_date": row.end_date,
+                            "days_late": days,
+                            "accrued_late_fee": to_decimal(fee),
+                            "refreshed_at": now,
+                        }
+                        for row, days, fee in zip(rows, days_late, late_fees)
+                    ],
+                )
+            s.commit()
+        except Exception:
+            s.rollback()
+            raise
+        finally:
+            s.close()
+
+        cache.invalidate("transactions:overdue")
+        return {"overdue": len(rows), "accrued_late_fees": float(late_fees.sum()) if rows else 0.0}
+
+
+overdue_projector = OverdueProjector(engine)
@@ -0,0 +1,16 @@
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def after_commit(step, *args, **kwargs):
+    """Run a step following a commit, its failure is logged without failing the request.
+
+    The write is already in the database, so re-indexing or publishing going
+    wrong must not roll back & answer a 500, the next rebuild or change
+    catches the index up.
+    """
+    try:
+        step(*args, **kwargs)
+    except Exception:
+        logger.error("%s failed after the commit", getattr(step, "__qualname__", step), exc_info=True)
@@ -0,0 +1,130 @@
+import json
+from decimal import Decimal, ROUND_HALF_UP
+
+import numpy as np
+from config.config import Config
+
+CENT = Decimal("0.01")
+
+
+def to_decimal(value):
+    """Money as the Decimal the DECIMAL(10, 2) columns store, halves rounded up like MySQL."""
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def month_day(value):
+    """Parse a "MM-DD" date of the year to the MMDD number day_multipliers compares with."""
+    month, day = value.split("-")
+    return int(month) * 100 + int(day)
+
+
+class PricingEngine:
+    """Prices rentals from a car's daily price and the rates of the business.
+
+    A rental is charged for every day from its start date up to, but not
+    including, its end date. Each day costs the car's price times the day's
+    multiplier: the weekend multiplier on Saturdays & Sundays, times the one
+    of the season the day falls in. The car total then gets the discount of
+    the longest duration tier the rental reaches, a driver costs a flat daily
+    rate. The days of a date range are told apart with NumPy arrays, once per
+    range, and the money is computed in Decimal, rounded to the cent the same
+    way as the DECIMAL(10, 2) columns.
+    """
+
+    def __init__(self, driver_daily_rate, late_fee_daily_rate, weekend_multiplier=1.0, seasons=(), duration_discounts=None):
+        self.driver_daily_rate = Decimal(str(driver_daily_rate))
+        self.late_fee_daily_rate = Decimal(str(late_fee_daily_rate))
+        self.weekend_multiplier = Decimal(str(weekend_multiplier))
+        # (first MMDD, last MMDD, multiplier), a season may wrap the new year e.g. 12-20 to 01-05
+        self.seasons = [
+            (month_day(season["start"]), month_day(season["end"]), Decimal(str(season["multiplier"])))
+            for season in seasons
+        ]
+        # Longest tier first, {minimum days: discount rate}
+        self.duration_discounts = sorted(
+            ((int(days), Decimal(str(rate))) for days, rate in (duration_discounts or {}).items()), reverse=True
+        )
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            driver_daily_rate=config.PRICING_DRIVER_DAILY_RATE,
+            late_fee_daily_rate=config.PRICING_LATE_FEE_DAILY_RATE,
+            weekend_multiplier=config.PRICING_WEEKEND_MULTIPLIER,
+            seasons=json.loads(config.PRICING_SEASONS, parse_float=Decimal),
+            duration_discounts=json.loads(config.PRICING_DURATION_DISCOUNTS, parse_float=Decimal),
+        )
+
+    def day_kinds(self, start_date, end_date):
+        """Whether every charged day of the rental is a weekend day, and the index of its season (-1 for none)."""
+        days = np.arange(np.datetime64(start_date, "D"), np.datetime64(end_date, "D"))
+
+        # 1970-01-01 was a Thursday, so day 0 has weekday 3 (Monday is 0)
+        weekends = (days.astype(np.int64) + 3) % 7 >= 5
+
+        seasons = np.full(len(days), -1)
+        if self.seasons:
+            months = days.astype("datetime64[M]")
+            month_days = (months.astype(np.int64) % 12 + 1) * 100 + (days - months).astype(np.int64) + 1
+            # A later season overrides an earlier one on the days they share
+            for index, (first, last, _) in enumerate(self.seasons):
+                if first <= last:
+                    in_season = (month_days >= first) & (month_days <= last)
+                else:
+                    in_season = (month_days >= first) | (month_days <= last)
+                seasons[in_season] = index
+
+        return weekends, seasons
+
+    def multiplier_total(self, start_date, end_date):
+        """Number of charged days and the sum of their multipliers, as an exact Decimal."""
+        weekends, seasons = self.day_kinds(start_date, end_date)
+        if not len(weekends):
+            return 0, Decimal(0)
+
+        # Days of the same kind share a multiplier, each kind is multiplied once
+        kinds, counts = np.unique(np.stack([weekends.astype(np.int64), seasons]), axis=1, return_counts=True)
+        total = Decimal(0)
+        for (weekend, season), count in zip(kinds.T, counts):
+            multiplier = self.weekend_multiplier if weekend else Decimal(1)
+            if season >= 0:
+                multiplier *= self.seasons[season][2]
+            total += multiplier * int(count)
+        return len(weekends), total
+
+    def discount_rate(self, days):
+        for minimum_days, rate in self.duration_discounts:
+            if days >= minimum_days:
+                return rate
+        return Decimal(0)
+
+    def quote(self, prices, start_date, end_date, with_driver=False):
+        """Price many cars for the same dates.
+
+        Returns the rental days and lists, one Decimal per price, of the car
+        cost before discount, the discount, the driver cost and the total.
+        """
+        days, multiplier_total = self.multiplier_total(start_date, end_date)
+        discount_rate = self.discount_rate(days)
+        driver_cost = to_decimal(self.driver_daily_rate * days if with_driver else 0)
+
+        base = [to_decimal(Decimal(str(price)) * multiplier_total) for price in prices]
+        discount = [to_decimal(cost * discount_rate) for cost in base]
+        driver = [driver_cost] * len(base)
+        total = [cost - off + driver_cost for cost, off in zip(base, discount)]
+
+        return {"days": days, "base": base, "discount": discount, "driver": driver, "total": total}
+
+    def quote_one(self, price, start_date, end_date, with_driver=False):
+        """Price a single rental, as Decimals ready for a transaction."""
+        quote = self.quote([price], start_date, end_date, with_driver)
+        return {"days": quote["days"], **{field: quote[field][0] for field in ["base", "discount", "driver", "total"]}}
+
+    def late_fee(self, days_late):
+        return to_decimal(self.late_fee_daily_rate * max(days_late, 0))
+
+    def late_fees(self, days_late):
+        """Late fees of many rentals at once, one Decimal per number of days late."""
+        return [self.late_fee(days) for days in days_late]
+
+pricing = PricingEngine.from_config(Config)
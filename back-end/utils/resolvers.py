@@ -0,0 +1,57 @@
+from models.cars import CarModel
+from models.drivers import DriverModel
+
+
+class ResolveError(Exception):
+    """Raised when the car or driver a request refers to can't be picked."""
+
+    def __init__(self, message, status, candidates=None):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.candidates = candidates  # The matching rows when a name is ambiguous
+
+
+def resolve_car(s, car_id=None, car_slug=None, car_name=None):
+    """Find a car by id, slug or, for older clients, its name."""
+    if car_id is not None:
+        car = s.get(CarModel, car_id)
+    elif car_slug is not None:
+        car = s.query(CarModel).filter(CarModel.slug == car_slug).first()
+    elif car_name is not None:
+        car = find_by_name(s, CarModel, "car", car_name)
+    else:
+        raise ResolveError("car_id, car_slug or car_name is required", 400)
+
+    if not car:
+        raise ResolveError("Car not found!", 404)
+    return car
+
+
+def resolve_driver(s, driver_id=None, driver_name=None):
+    """Find a driver by id or, for older clients, their name."""
+    if driver_id is not None:
+        driver = s.get(DriverModel, driver_id)
+    elif driver_name is not None:
+        driver = find_by_name(s, DriverModel, "driver", driver_name)
+    else:
+        raise ResolveError("driver_id or driver_name is required", 400)
+
+    if not driver:
+        raise ResolveError("Driver not found!", 404)
+    return driver
+
+
+def find_by_name(s, model, kind, name):
+    # Looked up in the database every time, the name index makes it cheap, so a
+    # duplicate written by another worker is never missed and always gets a 409
+    rows = s.query(model).filter(model.name == name).all()
+
+    if len(rows) > 1:
+        candidates = [
+            {"id": row.id, "slug": row.slug} if kind == "car" else {"id": row.id, "phone_number": row.phone_number}
+            for row in rows
+        ]
+        hint = "car_id or car_slug" if kind == "car" else "driver_id"
+        raise ResolveError(f"Several {kind}s are named {name}, pick one by {hint}", 409, candidates)
+    return rows[0] if rows else None
@@ -0,0 +1,51 @@
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """Runs jobs every few seconds on daemon threads of the web process.
+
+    Jobs open their own database sessions and must be safe to run in several
+    processes at once, every worker of a multi-process deployment starts one.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._threads = []
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def add_job(self, name, interval, job):
+        self._jobs[name] = (interval, job)
+
+    def start(self):
+        if self._threads:
+            return
+        with self._lock:
+            if self._threads:
+                return
+            self._stop.clear()
+            for name, (interval, job) in self._jobs.items():
+                thread = threading.Thread(target=self._run, args=(name, interval, job), name=f"job-{name}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            for thread in self._threads:
+                thread.join()
+            self._threads = []
+
+    def _run(self, name, interval, job):
+        while not self._stop.wait(interval):
+            try:
+                job()
+            except Exception:
+                # A failing run must not kill the thread, the next one may succeed
+                logger.error("Background job %s failed", name, exc_info=True)
+
+
+scheduler = Scheduler()
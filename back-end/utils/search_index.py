@@ -0,0 +1,278 @@
+import math
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from config.config import Config
+from models.cars import CarModel
+from models.car_categories import CarCategoryModel
+from models.drivers import DriverModel
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+
+# How much a match in each field counts towards the score
+FIELD_WEIGHTS = {
+    "name": 3.0,
+    "plate_number": 3.0,
+    "car_brand": 2.0,
+    "type": 1.5,
+    "color": 1.0,
+}
+
+# Score multiplier when a query token only matches the start of an indexed token
+PREFIX_MATCH_WEIGHT = 0.6
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(str(text).lower()) if text else []
+
+
+class SearchIndex:
+    """In-process inverted index over cars, car categories and drivers.
+
+    Built lazily from the database on first use, kept current by the write
+    handlers and rebuilt after max_age seconds, so changes made by other
+    workers show up within that window.
+    """
+
+    def __init__(self, max_age=300):
+        self.max_age = max_age
+        self.built_at = None
+        self._documents = {}  # (kind, id) -> document
+        self._postings = {}  # token -> {(kind, id): weight}
+        self._sorted_tokens = []
+        self._tokens_dirty = False
+        self._categories = {}  # id -> (car_brand, type)
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+
+    def ensure_built(self):
+        if not self._is_stale():
+            return
+
+        # One thread rebuilds, the others keep searching the current index meanwhile
+        if not self._build_lock.acquire(blocking=self.built_at is None):
+            return
+        try:
+            if self._is_stale():
+                self.build()
+        finally:
+            self._build_lock.release()
+
+    def _is_stale(self):
+        return self.built_at is None or time.time() - self.built_at > self.max_age
+
+    def build(self):
+        cars = car_rows().all()
+        categories = CarCategoryModel.query.with_entities(
+            CarCategoryModel.id, CarCategoryModel.car_brand, CarCategoryModel.type
+        ).all()
+        drivers = DriverModel.query.with_entities(DriverModel.id, DriverModel.name).all()
+
+        with self._lock:
+            self._documents = {}
+            self._postings = {}
+            self._categories = {}
+            for car in cars:
+                self._add(car_document(car))
+            for category in categories:
+                self._add_category(category.id, category.car_brand, category.type)
+            for driver in drivers:
+                self._add(driver_document(driver))
+            self.built_at = time.time()
+
+    def index_car(self, car):
+        with self._lock:
+            if self.built_at is None:
+                return
+        # The car's category is read through the relationship backref
+        category = car.car_categories
+        if category.id not in self._categories:
+            self.index_category(category)
+        self._update(car_document(car, category.car_brand, category.type))
+
+    def index_cars(self, car_ids):
+        """Re-index a batch of cars with one query, after a bulk update."""
+        with self._lock:
+            if self.built_at is None:
+                return
+        for car in car_rows().filter(CarModel.id.in_(car_ids)):
+            self._update(car_document(car))
+
+    def index_category(self, category):
+        with self._lock:
+            if self.built_at is None:
+                return
+            self.remove("category", category.id)
+            self._add_category(category.id, category.car_brand, category.type)
+
+    def index_driver(self, driver):
+        with self._lock:
+            if self.built_at is None:
+                return
+        self._update(driver_document(driver))
+
+    def index_drivers(self, driver_ids):
+        with self._lock:
+            if self.built_at is None:
+                return
+        drivers = DriverModel.query.with_entities(DriverModel.id, DriverModel.name).filter(DriverModel.id.in_(driver_ids))
+        for driver in drivers:
+            self._update(driver_document(driver))
+
+    def remove(self, kind, id):
+        with self._lock:
+            document = self._documents.pop((kind, id), None)
+            if document is None:
+                return
+            for token in document["tokens"]:
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop((kind, id), None)
+                if not postings:
+                    del self._postings[token]
+                    self._tokens_dirty = True
+            if kind == "category":
+                self._categories.pop(id, None)
+
+    def search(self, query, kinds=None, limit=20):
+        self.ensure_built()
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            total = len(self._documents) or 1
+            scores = None
+            for query_token in query_tokens:
+                token_scores = {}
+                for token in self._expand(query_token):
+                    postings = self._postings[token]
+                    idf = math.log(1 + total / len(postings))
+                    boost = 1.0 if token == query_token else PREFIX_MATCH_WEIGHT
+                    for key, weight in postings.items():
+                        score = weight * boost * idf
+                        if score > token_scores.get(key, 0):
+                            token_scores[key] = score
+
+                # Every query token must match, documents missing one drop out
+                if scores is None:
+                    scores = token_scores
+                else:
+                    scores = {key: scores[key] + score for key, score in token_scores.items() if key in scores}
+                if not scores:
+                    return []
+
+            if kinds:
+                scores = {key: score for key, score in scores.items() if key[0] in kinds}
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [
+                {"kind": key[0], "score": round(score, 4), **self._documents[key]["data"]} for key, score in ranked
+            ]
+
+    def _update(self, document):
+        with self._lock:
+            # Nothing to keep current until the first search builds the index
+            if self.built_at is None:
+                return
+            self.remove(document["kind"], document["id"])
+            self._add(document)
+
+    def _add_category(self, id, car_brand, type):
+        self._categories[id] = (car_brand, type)
+        self._add(
+            {
+                "kind": "category",
+                "id": id,
+                "fields": {"car_brand": car_brand, "type": type},
+                "data": {"id": id, "car_brand": car_brand, "type": type},
+            }
+        )
+
+    def _add(self, document):
+        tokens = {}
+        for field, value in document["fields"].items():
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            field_tokens = tokenize(value)
+            # Plates are often typed without their spaces, e.g. "B1234XYZ"
+            if field == "plate_number" and len(field_tokens) > 1:
+                field_tokens.append("".join(field_tokens))
+            for token in field_tokens:
+                tokens[token] = max(tokens.get(token, 0), weight)
+
+        key = (document["kind"], document["id"])
+        document["tokens"] = list(tokens)
+        self._documents[key] = document
+        for token, weight in tokens.items():
+            if token not in self._postings:
+                self._postings[token] = {}
+                self._tokens_dirty = True
+            self._postings[token][key] = weight
+
+    def _expand(self, query_token):
+        if self._tokens_dirty:
+            self._sorted_tokens = sorted(self._postings)
+            self._tokens_dirty = False
+
+        # Indexed tokens sharing the query token as prefix sit next to each other
+        tokens = []
+        position = bisect_left(self._sorted_tokens, query_token)
+        while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(query_token):
+            tokens.append(self._sorted_tokens[position])
+            position += 1
+        return tokens
+
+
+def car_rows():
+    return CarModel.query.join(CarCategoryModel, CarModel.category_id == CarCategoryModel.id).with_entities(
+        CarModel.id,
+        CarModel.slug,
+        CarModel.name,
+        CarModel.color,
+        CarModel.plate_number,
+        CarModel.image,
+        CarModel.category_id,
+        CarCategoryModel.car_brand,
+        CarCategoryModel.type,
+    )
+
+
+def car_document(car, car_brand=None, car_type=None):
+    car_brand = car_brand if car_brand is not None else car.car_brand
+    car_type = car_type if car_type is not None else car.type
+    return {
+        "kind": "car",
+        "id": car.id,
+        "fields": {
+            "name": car.name,
+            "car_brand": car_brand,
+            "type": car_type,
+            "color": car.color,
+            "plate_number": car.plate_number,
+        },
+        "data": {
+            "id": car.id,
+            "slug": car.slug,
+            "name": car.name,
+            "car_brand": car_brand,
+            "type": car_type,
+            "color": car.color,
+            "plate_number": car.plate_number,
+            "image": car.image,
+        },
+    }
+
+
+def driver_document(driver):
+    return {
+        "kind": "driver",
+        "id": driver.id,
+        "fields": {"name": driver.name},
+        "data": {"id": driver.id, "name": driver.name},
+    }
+
+
+search_index = SearchIndex(max_age=Config.SEARCH_INDEX_MAX_AGE)
@@ -0,0 +1,74 @@
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
+from slugify import slugify
+from models.car_slug_sequences import CarSlugSequenceModel
+
+# Numbers start above the 100-999 suffixes of the old random slugs, so old and new slugs never meet
+FIRST_SLUG_NUMBER = 1000
+
+# Leaves room for the "-<number>" suffix in the 255 characters slug column
+MAX_BASE_LENGTH = 240
+
+
+def slug_base(name):
+    return slugify(name, max_length=MAX_BASE_LENGTH) or "car"
+
+
+def base_of(slug):
+    return slug.rsplit("-", 1)[0]
+
+
+def allocate_slugs(s, names):
+    """Reserve one slug per name, in the caller's transaction, returned in the same order.
+
+    A slug is "<base>-<number>", the number comes from a per base counter
+    that is bumped with a single upsert per distinct base. Two slugs can
+    only be equal with the same base and the same number, so they never
+    collide and nothing has to be retried. The counter row stays locked
+    until the caller commits, which only serializes cars sharing a base.
+    """
+    bases = [slug_base(name) for name in names]
+    counts = {}
+    for base in bases:
+        counts[base] = counts.get(base, 0) + 1
+
+    # Lock the counters in a fixed order, so two batches can't deadlock on each other
+    next_numbers = {}
+    for base in sorted(counts):
+        last_value = reserve(s, base, counts[base])
+        next_numbers[base] = last_value - counts[base] + 1
+
+    slugs = []
+    for base in bases:
+        slugs.append(f"{base}-{next_numbers[base]}")
+        next_numbers[base] += 1
+    return slugs
+
+
+def allocate_slug(s, name):
+    return allocate_slugs(s, [name])[0]
+
+
+def reserve(s, base, count):
+    """Bump the base's counter by count and return its new value."""
+    table = CarSlugSequenceModel.__table__
+    s.execute(counter_upsert(s.get_bind().dialect.name, base, count))
+
+    # The upsert holds the row lock, nobody can move the counter before we read it
+    return s.execute(select(table.c.last_value).where(table.c.base == base)).scalar_one()
+
+
+def counter_upsert(dialect_name, base, count):
+    """The INSERT creating the base's counter at count, or bumping it by count when it exists."""
+    table = CarSlugSequenceModel.__table__
+    values = {"base": base, "last_value": FIRST_SLUG_NUMBER + count - 1}
+
+    if dialect_name == "mysql":
+        statement = mysql.insert(table).values(**values)
+        return statement.on_duplicate_key_update(last_value=table.c.last_value + count)
+
+    # SQLite (and PostgreSQL) spell the same upsert ON CONFLICT
+    statement = sqlite.insert(table).values(**values)
+    return statement.on_conflict_do_update(
+        index_elements=[table.c.base], set_={"last_value": table.c.last_value + count}
+    )
@@ -0,0 +1,9 @@
+# Values of the status columns. They are stored as ENUMs, a byte per row
+# instead of a VARCHAR(255), and filtered with exact equality.
+CAR_STATUSES = ["Available", "Unavailable", "Rented", "Booked"]
+
+# A driver's status only says whether they're on duty, their bookings say when they're busy
+DRIVER_STATUSES = ["Available", "Unavailable"]
+
+RENTAL_STATUSES = ["Pending", "In Progress", "Success", "Canceled"]
+PAYMENT_STATUSES = ["Pending", "Success", "Invalid", "Expired"]
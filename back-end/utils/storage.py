@@ -0,0 +1,156 @@
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timezone
+
+import cloudinary
+import cloudinary.api
+import cloudinary.uploader
+from config.config import Config
+
+
+# Cloudinary's Admin API deletes at most 100 resources per call
+CLOUDINARY_DELETE_BATCH = 100
+
+
+class CloudinaryStorage:
+    """Stores images on Cloudinary."""
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        cloudinary.config(
+            cloud_name=os.getenv("CLOUDINARY_CLOUD_NAME"),
+            api_key=os.getenv("CLOUDINARY_API_KEY"),
+            api_secret=os.getenv("CLOUDINARY_API_SECRET"),
+        )
+
+    def upload(self, data, filename=None):
+        upload_result = cloudinary.uploader.upload(data, timeout=self.timeout)
+        return upload_result["secure_url"]
+
+    def delete(self, url):
+        cloudinary.uploader.destroy(self.public_id(url))
+
+    def delete_many(self, urls):
+        """Delete a batch of images, returns {url: error} for the ones that failed."""
+        public_ids = {self.public_id(url): url for url in urls}
+        ids = list(public_ids)
+        failed = {}
+        for start in range(0, len(ids), CLOUDINARY_DELETE_BATCH):
+            chunk = ids[start : start + CLOUDINARY_DELETE_BATCH]
+            try:
+                result = cloudinary.api.delete_resources(chunk, timeout=self.timeout)
+            except Exception as e:
+                failed.update({public_ids[public_id]: str(e) for public_id in chunk})
+                continue
+
+            # "not_found" means someone beat us to it, which is as good as deleted
+            deleted = result.get("deleted", {})
+            for public_id in chunk:
+                if deleted.get(public_id) not in ["deleted", "not_found"]:
+                    failed[public_ids[public_id]] = f"Cloudinary answered {deleted.get(public_id)!r}"
+        return failed
+
+    def list_blobs(self):
+        """Yield (url, created_at in UTC) for every stored image."""
+        next_cursor = None
+        while True:
+            options = {"type": "upload", "max_results": 500, "timeout": self.timeout}
+            if next_cursor:
+                options["next_cursor"] = next_cursor
+            result = cloudinary.api.resources(**options)
+
+            for resource in result.get("resources", []):
+                created_at = datetime.strptime(resource["created_at"], "%Y-%m-%dT%H:%M:%SZ")
+                yield resource["secure_url"], created_at.replace(tzinfo=timezone.utc)
+
+            next_cursor = result.get("next_cursor")
+            if not next_cursor:
+                return
+
+    @staticmethod
+    def public_id(url):
+        # Uploads go to the account root, so the public id is the file name without extension
+        return os.path.splitext(os.path.basename(url))[0]
+
+
+class LocalStorage:
+    """Content-addressed image store on the local filesystem.
+
+    Blobs are stored under their SHA-256, so identical uploads are written
+    once. Files are written to a temporary file and renamed into place, a
+    reader never sees a partially written blob.
+    """
+
+    def __init__(self, root, base_url):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def upload(self, data, filename=None):
+        digest = hashlib.sha256(data).hexdigest()
+        extension = os.path.splitext(filename or "")[1].lower()
+        relative_path = f"{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+        path = os.path.join(self.root, relative_path)
+
+        if not os.path.exists(path):
+            directory = os.path.dirname(path)
+            os.makedirs(directory, exist_ok=True)
+            # The temp file lives in the target directory, so the rename never crosses filesystems
+            with tempfile.NamedTemporaryFile(dir=directory, prefix=".upload-", delete=False) as temp_file:
+                temp_file.write(data)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            os.replace(temp_file.name, path)
+
+        return f"{self.base_url}/{relative_path}"
+
+    def delete(self, url):
+        path = self.path_for(url)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def delete_many(self, urls):
+        """Delete a batch of images, returns {url: error} for the ones that failed."""
+        failed = {}
+        for url in urls:
+            try:
+                self.delete(url)
+            except OSError as e:
+                failed[url] = str(e)
+        return failed
+
+    def list_blobs(self):
+        """Yield (url, modified_at in UTC) for every stored image."""
+        for directory, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                # Skip uploads that are still being written
+                if filename.startswith(".upload-"):
+                    continue
+
+                path = os.path.join(directory, filename)
+                try:
+                    modified_at = datetime.fromtimestamp(os.path.getmtime(path), tz=timezone.utc)
+                except OSError:
+                    continue
+                relative_path = os.path.relpath(path, self.root).replace(os.sep, "/")
+                yield f"{self.base_url}/{relative_path}", modified_at
+
+    def path_for(self, url):
+        """Filesystem path of a URL handed out by this store, None for foreign URLs."""
+        prefix = f"{self.base_url}/"
+        if not url or not url.startswith(prefix):
+            return None
+
+        path = os.path.normpath(os.path.join(self.root, url[len(prefix) :]))
+        if not path.startswith(self.root + os.sep):
+            return None
+        return path
+
+
+def build_storage():
+    if Config.STORAGE_BACKEND == "local":
+        return LocalStorage(Config.MEDIA_ROOT, Config.MEDIA_URL)
+    return CloudinaryStorage(timeout=Config.UPLOAD_TIMEOUT)
+
+
+storage = build_storage()
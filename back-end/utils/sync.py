@@ -0,0 +1,124 @@
+import base64
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, insert
+from sqlalchemy.orm import sessionmaker
+from config.config import Config
+from connector.mysql_connector import engine
+from models.deletion_log import DeletionLogModel, gmt_plus_7_now
+
+# Most rows a single sync page may carry
+SYNC_MAX_LIMIT = 1000
+
+
+class CursorError(Exception):
+    """Raised when a sync cursor can't be used, status 410 means sync again from scratch."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def encode_cursor(entity, updated_at, id, deletion_id, issued_at):
+    payload = [entity, updated_at.isoformat() if updated_at else None, id, deletion_id, issued_at.isoformat()]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+def decode_cursor(entity, cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_entity, updated_at, id, deletion_id, issued_at = json.loads(base64.urlsafe_b64decode(padded))
+        updated_at = datetime.fromisoformat(updated_at) if updated_at else None
+        issued_at = datetime.fromisoformat(issued_at)
+    except (ValueError, TypeError):
+        raise CursorError("Invalid sync cursor")
+
+    if cursor_entity != entity:
+        raise CursorError(f"The cursor belongs to the {cursor_entity} sync")
+    # Tombstones older than the retention are pruned, the client may have missed some
+    if issued_at < gmt_plus_7_now() - timedelta(days=Config.SYNC_TOMBSTONE_DAYS):
+        raise CursorError("The sync cursor expired, sync again without since", status=410)
+    return updated_at, id, deletion_id
+
+
+def log_deletions(s, entity, ids, user_id=None):
+    """Record tombstones for deleted rows, within the transaction deleting them."""
+    if ids:
+        s.execute(
+            insert(DeletionLogModel),
+            [{"entity": entity, "entity_id": id, "user_id": user_id, "deleted_at": gmt_plus_7_now()} for id in ids],
+        )
+
+
+def sync_page(s, query, model, entity, since=None, limit=500, deletion_filters=()):
+    """One page of the rows changed & deleted after the cursor.
+
+    Changes are read in (updated_at, id) order with a keyset condition, so
+    every page is an index range scan however far the client is behind.
+    Rows & tombstones younger than SYNC_SAFETY_LAG are left for the next
+    call, a write committing late with an earlier updated_at is still seen.
+    Without since, the page starts a full snapshot and older tombstones are
+    skipped.
+    """
+    watermark = gmt_plus_7_now() - timedelta(seconds=Config.SYNC_SAFETY_LAG)
+
+    if since:
+        updated_at, last_id, deletion_id = decode_cursor(entity, since)
+    else:
+        updated_at, last_id = None, 0
+        deletion_id = s.query(func.coalesce(func.max(DeletionLogModel.id), 0)).scalar()
+
+    changes_query = query.filter(model.updated_at <= watermark)
+    if updated_at is not None:
+        changes_query = changes_query.filter(
+            or_(model.updated_at > updated_at, and_(model.updated_at == updated_at, model.id > last_id))
+        )
+    changes = changes_query.order_by(model.updated_at, model.id).limit(limit + 1).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    deletions = []
+    if since:
+        deletions = (
+            s.query(DeletionLogModel)
+            .filter(
+                DeletionLogModel.entity == entity,
+                DeletionLogModel.id > deletion_id,
+                DeletionLogModel.deleted_at <= watermark,
+                *deletion_filters,
+            )
+            .order_by(DeletionLogModel.id)
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = has_more or len(deletions) > limit
+        deletions = deletions[:limit]
+
+    if changes:
+        updated_at, last_id = changes[-1].updated_at, changes[-1].id
+    if deletions:
+        deletion_id = deletions[-1].id
+
+    return {
+        "changes": [row.to_dictionaries() for row in changes],
+        "deletions": [deletion.to_dictionaries() for deletion in deletions],
+        "next_cursor": encode_cursor(entity, updated_at, last_id, deletion_id, watermark),
+        "has_more": has_more,
+    }
+
+
+def prune_deletion_log():
+    """Drop the tombstones older than the retention, cursors issued before then get a 410."""
+    Session = sessionmaker(bind=engine)
+    s = Session()
+    try:
+        cutoff = gmt_plus_7_now() - timedelta(days=Config.SYNC_TOMBSTONE_DAYS)
+        pruned = s.query(DeletionLogModel).filter(DeletionLogModel.deleted_at < cutoff).delete(synchronize_session=False)
+        s.commit()
+        return pruned
+    except Exception:
+        s.rollback()
+        raise
+    finally:
+        s.close()
@@ -0,0 +1,137 @@
+import logging
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models.cars import CarModel
+from models.transactions import gmt_plus_7_now
+
+logger = logging.getLogger(__name__)
+
+# Every change of a transaction's statuses goes through one of these events.
+# "from" lists the (rental_status, payment_status) pairs the event may leave,
+# None for a transaction that is being created.
+TRANSITIONS = {
+    "book": {
+        "from": [None],
+        "rental_status": "Pending",
+        "payment_status": "Pending",
+        "car_status": "Booked",
+    },
+    "approve_payment": {
+        "from": [("Pending", "Pending")],
+        "rental_status": "In Progress",
+        "payment_status": "Success",
+        "car_status": "Rented",
+    },
+    "reject_payment": {
+        "from": [("Pending", "Pending")],
+        "rental_status": "Canceled",
+        "payment_status": "Invalid",
+        "car_status": "Available",
+    },
+    "expire": {
+        "from": [("Pending", "Pending")],
+        "rental_status": "Canceled",
+        "payment_status": "Expired",
+        "car_status": "Available",
+    },
+    "return": {
+        "from": [("In Progress", "Success")],
+        "rental_status": "Success",
+        "payment_status": "Success",
+        "car_status": "Available",
+    },
+}
+
+_subscribers = []
+
+
+class TransitionError(Exception):
+    """Raised when an event isn't allowed from the transaction's current statuses."""
+
+    def __init__(self, message, status=409):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+def on_transition(handler):
+    """Register a handler called with every transition, once its transaction has committed."""
+    _subscribers.append(handler)
+    return handler
+
+
+def transition(s, transaction, name, car=None):
+    """Apply a transition to a transaction and its car, returns the event.
+
+    The event is handed to the subscribers after the session commits, a
+    rolled back transition is never announced.
+    """
+    rule = TRANSITIONS[name]
+    current = (transaction.rental_status, transaction.payment_status) if transaction.rental_status else None
+    if current not in rule["from"]:
+        raise TransitionError(
+            f"{name} isn't allowed for a transaction that is {transaction.rental_status} with a {transaction.payment_status} payment"
+        )
+
+    car = car or s.get(CarModel, transaction.car_id)
+    transaction.rental_status = rule["rental_status"]
+    transaction.payment_status = rule["payment_status"]
+    car.status = rule["car_status"]
+    # Only a booking waiting for its payment holds the car until its hold expires
+    if rule["rental_status"] != "Pending":
+        transaction.hold_expires_at = None
+
+    transition_event = make_event(
+        name, transaction.id, transaction.invoice, transaction.user_id, car.id, car.slug, transaction.driver_id, current
+    )
+    announce(s, transition_event, transaction)
+    return transition_event
+
+
+def make_event(name, transaction_id, invoice, user_id, car_id, car_slug, driver_id, current, car_status=None):
+    rule = TRANSITIONS[name]
+    return {
+        "event": name,
+        "transaction_id": transaction_id,
+        "invoice": invoice,
+        "user_id": int(user_id),
+        "car_id": car_id,
+        "car_slug": car_slug,
+        "car_status": car_status or rule["car_status"],
+        "driver_id": driver_id,
+        "from": {"rental_status": current[0], "payment_status": current[1]} if current else None,
+        "to": {"rental_status": rule["rental_status"], "payment_status": rule["payment_status"]},
+        "at": gmt_plus_7_now().isoformat(),
+    }
+
+
+def announce(s, transition_event, transaction=None):
+    """Queue an event for the subscribers, for transitions applied with a set-based UPDATE."""
+    s.info.setdefault("transition_events", []).append((transaction, transition_event))
+
+
+@event.listens_for(Session, "before_commit")
+def stamp_transitions(session):
+    # A transaction booked in this session only gets its id once flushed
+    pending = session.info.get("transition_events")
+    if pending:
+        session.flush()
+        for transaction, transition_event in pending:
+            if transaction is not None:
+                transition_event["transaction_id"] = transaction.id
+
+
+@event.listens_for(Session, "after_commit")
+def dispatch_transitions(session):
+    for _, transition_event in session.info.pop("transition_events", []):
+        for handler in _subscribers:
+            try:
+                handler(transition_event)
+            except Exception:
+                # The transaction is committed, a failing subscriber mustn't fail the request
+                logger.error("Transition handler %s failed", handler.__name__, exc_info=True)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_transitions(session):
+    session.info.pop("transition_events", None)
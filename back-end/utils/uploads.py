@@ -0,0 +1,65 @@
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from math import ceil
+import time
+
+from config.config import Config
+from utils.storage import storage
+
+
+class UploadError(Exception):
+    """Raised when one or more files of a batch could not be uploaded."""
+
+    def __init__(self, errors, urls):
+        super().__init__(f"{len(errors)} file(s) failed to upload")
+        self.errors = errors  # [{"file": filename, "error": message}]
+        self.urls = urls  # URLs of the files that did upload
+
+
+class UploadPipeline:
+    """Uploads a batch of files in parallel through a bounded thread pool.
+
+    The client only needs an upload(data, filename) method returning the
+    stored file's URL. It defaults to the configured storage backend, tests
+    can swap in a local fake.
+    """
+
+    def __init__(self, client, max_workers=4, timeout=30):
+        self.client = client
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="upload")
+
+    def upload_many(self, files):
+        """Upload (filename, data) pairs and return their URLs in the same order."""
+        futures = [(filename, self._executor.submit(self.client.upload, data, filename)) for filename, data in files]
+
+        urls = []
+        errors = []
+        # The client enforces the per-file timeout, the deadline only guards against a hung
+        # worker: every round of max_workers files gets one timeout to finish
+        rounds = ceil(len(futures) / self.max_workers)
+        deadline = time.monotonic() + self.timeout * rounds
+        for filename, future in futures:
+            try:
+                urls.append(future.result(timeout=max(deadline - time.monotonic(), 0)))
+            except TimeoutError:
+                future.cancel()
+                errors.append({"file": filename, "error": "Upload timed out"})
+            except Exception as e:
+                errors.append({"file": filename, "error": str(e)})
+
+        if errors:
+            raise UploadError(errors, urls)
+        return urls
+
+
+def read_files(files):
+    # Read the request files up front, FileStorage streams shouldn't be shared across threads
+    return [(file.filename, file.read()) for file in files]
+
+
+upload_pipeline = UploadPipeline(
+    storage,
+    max_workers=Config.UPLOAD_MAX_WORKERS,
+    timeout=Config.UPLOAD_TIMEOUT,
+)
@@ -20,7 +20,7 @@ type Driver = {
     name: string;
 };
 
-const CarDetailsCard: React.FC<CarCardDetailProps> = ({ image, additional_images, type, transmission, car_brand, car_name, capacity, fuel, color, price, status }) => {
+const CarDetailsCard: React.FC<CarCardDetailProps> = ({ image, additional_images, type, transmission, car_brand, car_name, car_slug, capacity, fuel, color, price, status }) => {
     const [isModalOpen, setIsModalOpen] = useState(false);
     const [startDate, setStartDate] = useState("");
     const [showDateInput, setShowDateInput] = useState(true);
@@ -38,10 +38,10 @@ const CarDetailsCard: React.FC<CarCardDetailProps> = ({ image, additional_images
     const token = getToken();
 
     // Use the hook to fetch available drivers
-    const { drivers, loading, error } = useFetchAvailableDrivers(token as string);
+    const { drivers, loading, error } = useFetchAvailableDrivers(token as string, startDate, endDate);
 
-    const handleDriverSelect = (driverName: string | null) => {
-        setSelectedDriver(driverName); // Set the selected driver's name or clear it
+    const handleDriverSelect = (driverId: string | null) => {
+        setSelectedDriver(driverId); // Set the selected driver's id or clear it
     };
 
     // Function to determine badge color based on status
@@ -62,13 +62,13 @@ const CarDetailsCard: React.FC<CarCardDetailProps> = ({ image, additional_images
         try {
             // Create a request payload
             const requestData: any = {
-                car_name: car_name,
+                car_slug: car_slug,
                 start_date: startDate,
                 end_date: endDate,
             };
-            // Only include driver_name if it's not null
+            // Only include driver_id if a driver is selected
             if (selectedDriver) {
-                requestData.driver_name = selectedDriver;
+                requestData.driver_id = Number(selectedDriver);
             }
             await onSubmit(requestData); // Pass the adjusted payload to the API call
             setAlertType("success");
@@ -300,11 +300,11 @@ const CarDetailsCard: React.FC<CarCardDetailProps> = ({ image, additional_images
                                                     drivers.map((driver) => (
                                                         <div key={driver.id} className="flex items-center space-x-2">
                                                             <Checkbox
-                                                                id={driver.id}
-                                                                onCheckedChange={(checked) => handleDriverSelect(checked ? driver.name : null)}
-                                                                checked={selectedDriver === driver.name}
+                                                                id={String(driver.id)}
+                                                                onCheckedChange={(checked) => handleDriverSelect(checked ? String(driver.id) : null)}
+                                                                checked={selectedDriver === String(driver.id)}
                                                             />
-                                                            <label htmlFor={driver.id} className="text-gray-700">
+                                                            <label htmlFor={String(driver.id)} className="text-gray-700">
                                                                 {driver.name}
                                                             </label>
                                                         </div>
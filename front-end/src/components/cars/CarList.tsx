@@ -92,7 +92,7 @@ const CarList = () => {
                             {cars.map((car: Car) => (
                                 <CarCard
                                     key={car.id}
-                                    image={car.image || "https://via.placeholder.com/300x200?text=No+Image"}
+                                    image={car.image_card || car.image || "https://via.placeholder.com/300x200?text=No+Image"}
                                     car_name={car.name}
                                     car_brand={car.car_brand}
                                     type={car.type}
@@ -1,6 +1,6 @@
 import { getToken } from "@/utils/tokenUtils";
 import axios from "axios";
-import { useState } from "react";
+import { useRef, useState } from "react";
 import { SubmitHandler } from "react-hook-form";
 
 type CreateTransactionForm = {
@@ -14,20 +14,28 @@ const useCreateTransaction = () => {
     const [loading, setLoading] = useState<boolean>(false);
     const [error, setError] = useState<string | null>(null);
     const [success, setSuccess] = useState<boolean>(false);
+    // Kept until the server answers, so retrying after a dropped connection can't book twice
+    const idempotencyKey = useRef<string | null>(null);
 
     const onSubmit: SubmitHandler<CreateTransactionForm> = async (data) => {
         setLoading(true);
         setError(null);
         setSuccess(false);
 
+        if (!idempotencyKey.current) {
+            idempotencyKey.current = crypto.randomUUID();
+        }
+
         try {
             const token = getToken();
             const response = await axios.post("http://localhost:5000/transactions", data, {
                 headers: {
                     Authorization: `Bearer ${token}`,
                     "Content-Type": "application/json",
+                    "Idempotency-Key": idempotencyKey.current,
                 },
             });
+            idempotencyKey.current = null;
 
             if (response.status === 201) {
                 setSuccess(true);
@@ -36,6 +44,9 @@ const useCreateTransaction = () => {
                 setError("Failed to create transaction");
             }
         } catch (err: any) {
+            if (err.response) {
+                idempotencyKey.current = null;
+            }
             const errorMessage = err.response?.data?.message || err.message || "Failed to create transaction";
             setError(errorMessage);
         } finally {
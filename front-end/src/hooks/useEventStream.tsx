@@ -0,0 +1,33 @@
+import { useEffect, useRef } from "react";
+import { getToken } from "@/utils/tokenUtils";
+
+type EventHandlers = {
+    [eventType: string]: (data: any) => void;
+};
+
+// Subscribes to the server's event stream, "transaction", "car", "driver" and "reset" events.
+// EventSource can't send an Authorization header, so the token goes in the query string,
+// the browser reconnects on its own and resumes from the last event it received.
+const useEventStream = (handlers: EventHandlers) => {
+    const handlersRef = useRef(handlers);
+    handlersRef.current = handlers;
+
+    useEffect(() => {
+        const token = getToken();
+        if (!token) return;
+
+        const source = new EventSource(`http://localhost:5000/events/stream?jwt=${encodeURIComponent(token)}`);
+        const listeners = Object.keys(handlersRef.current).map((eventType) => {
+            const listener = (event: MessageEvent) => handlersRef.current[eventType]?.(JSON.parse(event.data));
+            source.addEventListener(eventType, listener);
+            return [eventType, listener] as const;
+        });
+
+        return () => {
+            listeners.forEach(([eventType, listener]) => source.removeEventListener(eventType, listener));
+            source.close();
+        };
+    }, []);
+};
+
+export default useEventStream;
@@ -6,7 +6,8 @@ type Driver = {
     name: string;
 };
 
-const useFetchAvailableDrivers = (token: string) => {
+// Drivers free on the booking dates, today's free drivers until both dates are picked
+const useFetchAvailableDrivers = (token: string, startDate?: string, endDate?: string) => {
     const [drivers, setDrivers] = useState<Driver[] | null>([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<null | string>(null);
@@ -15,6 +16,7 @@ const useFetchAvailableDrivers = (token: string) => {
         const fetchDrivers = async () => {
             try {
                 const res = await axios.get("http://127.0.0.1:5000/drivers-available", {
+                    params: startDate && endDate ? { start: startDate, end: endDate } : {},
                     headers: {
                         Authorization: `Bearer ${token}`,
                     },
@@ -34,7 +36,7 @@ const useFetchAvailableDrivers = (token: string) => {
         if (token) {
             fetchDrivers();
         }
-    }, [token]);
+    }, [token, startDate, endDate]);
 
     return { drivers, loading, error };
 };
@@ -75,7 +75,7 @@ const useTransactionsCustomer = (params: FetchTransactionsParams) => {
     const url = buildUrl(debouncedParams);
 
     // Use SWR with the debounced URL and configured options
-    const { data, error } = useSWR(url, fetcher, {
+    const { data, error, mutate } = useSWR(url, fetcher, {
         revalidateOnFocus: false, // prevent refetching on window focus
         revalidateOnReconnect: false, // prevent refetching on reconnect
         refreshWhenHidden: false, // avoid refreshing in the background
@@ -92,6 +92,7 @@ const useTransactionsCustomer = (params: FetchTransactionsParams) => {
         pagination: (data?.data?.pagination as PaginationData) || {},
         isLoading: !error && !data,
         isError: error,
+        mutate,
     };
 };
 
@@ -1,4 +1,4 @@
-import { useState } from "react";
+import { useRef, useState } from "react";
 import { getToken } from "@/utils/tokenUtils";
 import axios, { AxiosError } from "axios";
 import { mutate } from "swr";
@@ -11,11 +11,17 @@ interface UploadPaymentResponse {
 export const useUploadPayment = () => {
     const [isUploading, setIsUploading] = useState(false);
     const [error, setError] = useState<string | null>(null);
+    // One key per transaction, kept until the server answers so a retried upload isn't stored twice
+    const idempotencyKeys = useRef<Record<number, string>>({});
 
     const uploadPayment = async (transactionId: number, paymentProofImage: File): Promise<boolean> => {
         setIsUploading(true);
         setError(null);
 
+        if (!idempotencyKeys.current[transactionId]) {
+            idempotencyKeys.current[transactionId] = crypto.randomUUID();
+        }
+
         try {
             const token = getToken();
 
@@ -26,14 +32,19 @@ export const useUploadPayment = () => {
                 headers: {
                     Authorization: `Bearer ${token}`,
                     "Content-Type": "multipart/form-data",
+                    "Idempotency-Key": idempotencyKeys.current[transactionId],
                 },
             });
+            delete idempotencyKeys.current[transactionId];
 
             // Trigger a revalidation of the transaction data
             await mutate((key) => typeof key === "string" && key.includes("/transactions/customer"));
 
             return response.data.success;
         } catch (err) {
+            if (axios.isAxiosError(err) && err.response) {
+                delete idempotencyKeys.current[transactionId];
+            }
             const errorMessage = axios.isAxiosError(err) ? err.response?.data?.message || "Failed to upload payment proof!" : "An unexpected error occurred";
 
             setError(errorMessage);
@@ -13,6 +13,7 @@ import ImageModal from "@/components/ImageModal";
 import axios from "axios";
 import { getToken } from "@/utils/tokenUtils";
 import GenerateReportModal from "@/components/transactions/GenerateReportModal";
+import useEventStream from "@/hooks/useEventStream";
 
 const PAYMENT_STATUSES = ["Pending", "Invalid", "Success"] as const;
 const RENTAL_STATUSES = ["Canceled", "In Progress", "Success"] as const;
@@ -55,6 +56,8 @@ const AdminPage: React.FC = () => {
     );
 
     const { transactions, pagination, isLoading, isError, mutate } = useFetchTransactions(params);
+    // New bookings, expired holds & returns show up without reloading the page
+    useEventStream({ transaction: () => mutate(), reset: () => mutate() });
 
     const handleActions = async (transactionId: number, confirm: string): Promise<void> => {
         const token = getToken(); // JWT token stored in localStorage (adjust as needed)
@@ -57,6 +57,7 @@ const CarDetails: React.FC<CarDetailsProps> = ({ car, error }) => {
                     transmission={car.transmission}
                     car_brand={car.car_brand}
                     car_name={car.name}
+                    car_slug={car.slug}
                     capacity={car.capacity}
                     fuel={car.fuel}
                     color={car.color}
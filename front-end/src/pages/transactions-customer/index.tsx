@@ -10,6 +10,7 @@ import Image from "next/image";
 import { useReturnCar } from "@/hooks/useReturnCar";
 import { format } from "date-fns-tz";
 import { useUploadPayment } from "@/hooks/useUploadPayment";
+import useEventStream from "@/hooks/useEventStream";
 
 const statusColorMap = new Map<string, string>([
     ["in progress", "bg-blue-300 text-blue-800 hover:bg-blue-400 hover:text-blue-900"],
@@ -25,7 +26,12 @@ const getStatusColor = (status: string): string => {
 
 const TransactionsPage: React.FC = () => {
     const [page, setPage] = useState(1);
-    const { transactions, pagination, isLoading, isError } = useFetchTransactions({ page, per_page: 10 });
+    const { transactions, pagination, isLoading, isError, mutate: refetchTransactions } = useFetchTransactions({
+        page,
+        per_page: 10,
+    });
+    // Payment validations & expired holds show up without reloading the page
+    useEventStream({ transaction: () => refetchTransactions(), reset: () => refetchTransactions() });
     const { returnCar, isReturning, error: returnError } = useReturnCar();
     const { uploadPayment, isUploading, error: uploadError } = useUploadPayment();
 
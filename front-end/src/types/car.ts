@@ -13,6 +13,7 @@ export interface CarCardDetailProps {
     type: string;
     car_brand: string;
     car_name: string;
+    car_slug: string;
     image: string;
     additional_images: CarImage[];
     status: string;
@@ -38,6 +39,8 @@ export interface Car {
     color: string;
     fuel: string;
     image: string;
+    image_thumbnail?: string | null;
+    image_card?: string | null;
     additional_images: CarImage[];
     plate_number: string;
     price: number;
@@ -51,6 +54,8 @@ export interface Car {
 export interface CarImage {
     id: number;
     url: string;
+    thumbnail_url?: string | null;
+    card_url?: string | null;
 }
 
 export interface CategoriesData {